@@ -5,14 +5,89 @@ Replaces the manual Claude Code conversation step. Takes a parsed report and cle
 transcript, sends them to Claude, and returns structured updates ready for report_generator.
 """
 
+import asyncio
+import atexit
+import itertools
 import json
+import queue
 import re
+import threading
+import time
 
 import anthropic
 
+try:
+    from .compact_output import (
+        COMPACT_OUTPUT_NOTE, COMPACT_UPDATES_SCHEMA, COMPACT_UPDATES_TOOL,
+        compact_error, compact_field_names, compact_path,
+    )
+    from .hedging import DEFAULT_POLICY, request_kind
+    from .json_stream import STREAMED_ARRAYS, IncrementalJSONParser, parse_tolerant
+    from .proposal_patch import PATCH_OPS
+    from .report_validator import apply_reference_check
+    from .token_estimator import chars_to_tokens, estimate_tokens, request_text
+    from .transcript_cleaner import split_formatted_transcript
+    from .transcript_compactor import compact_transcript
+except ImportError:  # imported as a flat module from src/
+    from compact_output import (
+        COMPACT_OUTPUT_NOTE, COMPACT_UPDATES_SCHEMA, COMPACT_UPDATES_TOOL,
+        compact_error, compact_field_names, compact_path,
+    )
+    from hedging import DEFAULT_POLICY, request_kind
+    from json_stream import STREAMED_ARRAYS, IncrementalJSONParser, parse_tolerant
+    from proposal_patch import PATCH_OPS
+    from report_validator import apply_reference_check
+    from token_estimator import chars_to_tokens, estimate_tokens, request_text
+    from transcript_cleaner import split_formatted_transcript
+    from transcript_compactor import compact_transcript
+
 
 MODEL = "claude-sonnet-4-20250514"
 MAX_TRANSCRIPT_CHARS = 100_000
+REPAIR_MAX_TOKENS = 1024
+FEEDBACK_MAX_TOKENS = 2048
+MAX_CONTINUATIONS = 2  # Follow-up calls when a response stops at max_tokens
+TRUNCATION_WARNING = "Response truncated at max_tokens: incomplete trailing elements were dropped"
+HISTORY_BLOCKS = 2  # Meeting blocks kept per point in the compact report encoding
+
+MEETING_HEADER_PATTERN = re.compile(
+    r"^(?:Meeting|R[ée]union|Vergadering)\b.{0,30}$", re.IGNORECASE
+)
+CLOSED_STATUSES = {"done", "closed", "clôturé", "cloturé", "terminé", "ok", "fait"}
+CHUNK_TOKEN_BUDGET = 15_000  # Transcript tokens per chunk in chunked mode
+SECTION_SHARD_TOKENS = 3_000  # Report tokens per group of sections in sharded mode
+
+# Adaptive routing (opt-in): the first rule whose limits fit the request is used.
+# max_tokens is the expected output times OUTPUT_HEADROOM, capped per rule.
+MODEL_FAST = "claude-3-5-haiku-20241022"
+ROUTING_RULES = [
+    {"name": "small", "model": MODEL_FAST, "max_input_tokens": 8_000,
+     "max_output_tokens": 1_500, "max_tokens_cap": 4096},
+    {"name": "standard", "model": MODEL, "max_input_tokens": 40_000,
+     "max_output_tokens": 3_500, "max_tokens_cap": 8192},
+    {"name": "large", "model": MODEL, "max_tokens_cap": 16_384},
+]
+OUTPUT_HEADROOM = 1.6
+MIN_MAX_TOKENS = 1024
+
+# Output limits per model: a tool call cut off at max_tokens cannot be continued, so
+# it is re-sent with a doubled max_tokens up to this limit
+MODEL_MAX_OUTPUT_TOKENS = {MODEL: 16_384, MODEL_FAST: 8192}
+
+# Preflight estimates (see preflight()): USD per million tokens (input, output) and
+# response speed (seconds before the first token, output tokens per second)
+MODEL_PRICING = {MODEL: (3.0, 15.0), MODEL_FAST: (0.8, 4.0)}
+MODEL_SPEED = {MODEL: (2.0, 55.0), MODEL_FAST: (0.8, 110.0)}
+TOOL_USE_SYSTEM_TOKENS = 313  # system prompt the API adds when a tool is forced
+
+# Output size model used by estimate_output_tokens()
+OUTPUT_BASE_TOKENS = 250
+TOKENS_PER_POINT_UPDATE = 90
+TOKENS_PER_NEW_POINT = 130
+TOKENS_PER_INFO_ITEM = 40
+TOKENS_PER_PLANNING_ITEM = 45
+TRANSCRIPT_TOKENS_PER_UPDATE = 600    # roughly one point discussed per 600 transcript tokens
+TRANSCRIPT_TOKENS_PER_NEW_POINT = 2_500
 
 SYSTEM_PROMPT_UPDATE = """\
 You are a construction meeting minute analyst. Your task is to compare a new meeting \
@@ -76,7 +151,7 @@ if English, write in English)
 - Preserve exact section names from the parsed report
 
 ## Output Format
-Return ONLY a valid JSON object (no markdown, no explanation) with this structure:
+Submit the result by calling the `record_updates` tool. Its input has this structure:
 {
   "meeting_number": <int>,
   "date": <str or null>,
@@ -146,7 +221,7 @@ structure the points but prioritize the actual discussion content
 - If the transcript is unclear or garbled in places, skip those parts
 
 ## Output Format
-Return ONLY a valid JSON object (no markdown, no explanation) with this structure:
+Submit the result by calling the `record_updates` tool. Its input has this structure:
 {
   "meeting_number": 1,
   "date": <str or null>,
@@ -159,6 +234,226 @@ Return ONLY a valid JSON object (no markdown, no explanation) with this structur
 }
 """
 
+CHUNK_PROMPT_NOTE = """
+
+## Partial Transcript
+The transcript is long and has been split into consecutive parts that are analyzed \
+separately and merged afterwards. You only receive ONE part. Report only what is \
+discussed in this part: do not repeat existing points that this part does not mention, \
+and leave metadata fields null unless this part states them. Always return the full \
+`info_exchange` and `planning` lists (existing items plus changes from this part).
+"""
+
+SECTION_SHARD_NOTE = """
+
+## Section Shard
+The report is large and is analyzed per section by separate requests. The report \
+below only contains these sections: {sections}. Return `point_updates` and `new_points` \
+for these sections only (new points must go in one of them). Return EMPTY \
+`info_exchange` and `planning` lists and leave `date` and `next_meeting` null: they are \
+handled by a separate request.
+"""
+
+LOCAL_FIELDS_NOTE = """
+
+## Fields Filled Locally
+These fields were extracted deterministically and are filled in automatically: \
+{fields}. Do not output them.
+"""
+
+GLOBAL_SHARD_NOTE = """
+
+## Metadata, Information Exchange and Planning Only
+The report is large and its sections are analyzed by separate requests; the report \
+below only lists point numbers and titles for reference. Return EMPTY `point_updates` \
+and `new_points` lists. Return the metadata and the full `info_exchange` and \
+`planning` lists as described above.
+"""
+
+SYSTEM_PROMPT_FEEDBACK = """\
+You are a construction meeting minute analyst. You previously proposed updates for \
+the next meeting report. The project manager has reviewed the proposal and gives \
+feedback. Apply the feedback by returning PATCH OPERATIONS against the current \
+proposal - never re-emit the whole proposal.
+
+## Input
+1. **Previous Report** (JSON) and **Meeting Transcript**, for reference.
+2. **Current Proposal** (JSON): the updates currently shown to the project manager.
+3. **Feedback** (text): what the project manager wants changed.
+
+## Operations
+- `{"op": "add", "target": <list>, "value": {...}}` - add an element (optional \
+`"index"` to insert before that position)
+- `{"op": "remove", "target": <list>, "number": "13.03"}` - remove a point
+- `{"op": "remove", "target": <list>, "index": 4}` - remove an info_exchange / planning item
+- `{"op": "replace", "target": <list>, "number": "13.02", "value": {...}}` - replace a \
+whole element
+- `{"op": "replace", "target": <list>, "number": "13.02", "field": "due", "value": "Done"}` \
+- replace one field
+- `{"op": "replace", "target": "meta", "field": "next_meeting", "value": "..."}` - \
+change meeting_number, date, distribution_date or next_meeting
+
+`<list>` is one of `point_updates`, `new_points` (addressed by `number`), \
+`info_exchange`, `planning` (addressed by 0-based `index` in the Current Proposal). \
+All references point to the Current Proposal as given, before any operation is \
+applied. Elements keep the same fields as in the Current Proposal. For example, \
+merging points 13.02 and 13.03 is a replace of 13.02 with the merged content plus a \
+remove of 13.03.
+
+## Rules
+- Change only what the feedback asks for
+- Use the SAME LANGUAGE as the report
+
+## Output Format
+Submit the operations by calling the `record_patch` tool:
+{"operations": [...]}
+"""
+
+SYSTEM_PROMPT_REPAIR = """\
+You repair fragments of a JSON document that failed schema validation.
+
+You will receive the JSON schema of each fragment, the fragment's current value \
+(null if it is missing) and the validation errors reported for it. Return a corrected \
+value for every fragment so that it satisfies its schema:
+- Keep all existing content; only add or fix what the errors point at
+- If a required text value cannot be inferred from the fragment, use an empty string \
+(or null where the schema allows it)
+- Do not add fragments that were not requested
+
+Submit the corrections by calling the `record_repairs` tool with this structure:
+{"fragments": [{"path": <str, as given>, "value": <corrected value>}, ...]}
+"""
+
+COMPACT_REPORT_LEGEND = """\
+The report below uses a compact encoding. Keys: m = metadata (n = meeting number, \
+d = date, loc = location), lang = language, nm = next meeting, ie = info exchange rows \
+[from_whom, status, content, due_date], pl = planning items, s = sections (n = section \
+name, p = points). Point keys: # = number, t = title, s = latest subject lines, \
+h = number of older history lines omitted, w = current for_whom, d = current due, \
+x = point is closed."""
+
+# Closing sentence of the legend, depending on the output schema asked for
+COMPACT_REPORT_FULL_OUTPUT = """ Your output must still use the full field names and \
+exact section names described in the instructions."""
+COMPACT_REPORT_COMPACT_OUTPUT = """ Your output uses the short keys and section indexes \
+of the Compact Output instructions, not these report keys."""
+
+NULLABLE_STRING = {"type": ["string", "null"]}
+
+POINT_UPDATE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "section": {"type": "string"},
+        "number": {"type": "string"},
+        "subject_lines": {"type": "array", "items": {"type": "string"}},
+        "for_whom": NULLABLE_STRING,
+        "due": NULLABLE_STRING,
+    },
+    "required": ["section", "number", "subject_lines"],
+}
+
+NEW_POINT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "section": {"type": "string"},
+        "number": {"type": "string"},
+        "title": {"type": "string"},
+        "subject_lines": {"type": "array", "items": {"type": "string"}},
+        "for_whom": NULLABLE_STRING,
+        "due": NULLABLE_STRING,
+    },
+    "required": ["section", "number", "title", "subject_lines", "for_whom", "due"],
+}
+
+INFO_EXCHANGE_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "from_whom": {"type": "string"},
+        "status": {"type": "string"},
+        "content": {"type": "string"},
+        "due_date": {"type": "string"},
+    },
+    "required": ["from_whom", "status", "content", "due_date"],
+}
+
+PLANNING_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "content": {"type": "string"},
+        "is_new": {"type": "boolean"},
+    },
+    "required": ["content", "is_new"],
+}
+
+UPDATES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "meeting_number": {"type": "integer"},
+        "date": NULLABLE_STRING,
+        "distribution_date": NULLABLE_STRING,
+        "next_meeting": NULLABLE_STRING,
+        "point_updates": {"type": "array", "items": POINT_UPDATE_SCHEMA},
+        "new_points": {"type": "array", "items": NEW_POINT_SCHEMA},
+        "info_exchange": {"type": "array", "items": INFO_EXCHANGE_SCHEMA},
+        "planning": {"type": "array", "items": PLANNING_SCHEMA},
+    },
+    "required": ["meeting_number", "point_updates", "new_points",
+                 "info_exchange", "planning"],
+}
+
+# Tools the model is forced to call (tool_choice), so the API returns the output as
+# parsed tool input instead of free text that has to be scanned for JSON
+UPDATES_TOOL = {
+    "name": "record_updates",
+    "description": "Record the proposed updates for the next meeting report.",
+    "input_schema": UPDATES_SCHEMA,
+}
+
+REPAIR_TOOL = {
+    "name": "record_repairs",
+    "description": "Record the corrected value of every requested fragment.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "fragments": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {"path": {"type": "string"}, "value": {}},
+                    "required": ["path", "value"],
+                },
+            },
+        },
+        "required": ["fragments"],
+    },
+}
+
+PATCH_TOOL = {
+    "name": "record_patch",
+    "description": "Record the patch operations that apply the feedback to the current proposal.",
+    "input_schema": {
+        "type": "object",
+        "properties": {
+            "operations": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "op": {"type": "string", "enum": list(PATCH_OPS)},
+                        "target": {"type": "string"},
+                        "number": {"type": "string"},
+                        "index": {"type": "integer"},
+                        "field": {"type": "string"},
+                        "value": {},
+                    },
+                    "required": ["op", "target"],
+                },
+            },
+        },
+        "required": ["operations"],
+    },
+}
+
 
 def _is_template_report(parsed_report):
     """Check if the report is a blank template (N0) with no existing points."""
@@ -169,11 +464,8 @@ def _is_template_report(parsed_report):
     return total_points == 0
 
 
-def _build_user_message(parsed_report, cleaned_text):
-    """Build the user message with report JSON and transcript text."""
-    is_template = _is_template_report(parsed_report)
-
-    # Summarize the report structure for the prompt
+def _summarize_report(parsed_report):
+    """Summarize the full report structure for the prompt."""
     report_summary = {
         "metadata": parsed_report.get("metadata", {}),
         "language": parsed_report.get("language", "EN"),
@@ -208,7 +500,140 @@ def _build_user_message(parsed_report, cleaned_text):
             section_summary["points"].append(point_summary)
         report_summary["sections"].append(section_summary)
 
-    report_json = json.dumps(report_summary, indent=2, ensure_ascii=False)
+    return report_summary
+
+
+def _split_meeting_blocks(paragraphs):
+    """Split a point's subject paragraphs into per-meeting blocks.
+
+    A block starts at each "Meeting dd/mm" / "Réunion du ..." header paragraph,
+    or at a bold paragraph following normal ones (latest meeting content whose
+    header was not written). Text before the first header is the opening block.
+    """
+    blocks = [[]]
+    previous_bold = False
+    for p in paragraphs:
+        text = p.get("text", "").strip()
+        if not text:
+            continue
+        is_header = bool(MEETING_HEADER_PATTERN.match(text))
+        starts_bold = p.get("has_bold") and not previous_bold
+        if (is_header or starts_bold) and blocks[-1]:
+            blocks.append([])
+        blocks[-1].append(text)
+        previous_bold = bool(p.get("has_bold"))
+    return [b for b in blocks if b]
+
+
+def _is_closed_point(point):
+    """A point is closed when its latest due value is a closing status and it
+    received no new (bold) content at the last meeting."""
+    if any(p.get("has_bold") for p in point.get("subject_paragraphs", [])):
+        return False
+    dues = [d.strip() for d in point.get("due_paragraphs", []) if d.strip()]
+    return bool(dues) and dues[-1].casefold() in CLOSED_STATUSES
+
+
+def _summarize_report_compact(parsed_report, history_blocks=HISTORY_BLOCKS):
+    """Summarize the report with short keys and pruned per-point history.
+
+    Only the most recent history_blocks meeting blocks of each point are kept
+    (the count of dropped paragraphs is given under "h"), for_whom / due are
+    reduced to their latest value, and closed points keep only number and title.
+    See COMPACT_REPORT_LEGEND for the key names.
+    """
+    metadata = parsed_report.get("metadata", {})
+    next_meeting = parsed_report.get("next_meeting") or {}
+    report_summary = {
+        "m": {
+            "n": metadata.get("meeting_number"),
+            "d": metadata.get("date"),
+            "loc": metadata.get("location"),
+        },
+        "lang": parsed_report.get("language", "EN"),
+        "nm": next_meeting.get("full_text"),
+        "ie": [
+            [ie["from_whom"], ie["status"], ie["content"], ie["due_date"]]
+            for ie in parsed_report.get("info_exchange", [])
+        ],
+        "pl": [pl["content"] for pl in parsed_report.get("planning", [])],
+        "s": [],
+    }
+
+    for section in parsed_report.get("sections", []):
+        points = []
+        for point in section.get("points", []):
+            entry = {"#": point["number"], "t": point["title"]}
+            if _is_closed_point(point):
+                entry["x"] = 1
+                points.append(entry)
+                continue
+
+            blocks = _split_meeting_blocks(point.get("subject_paragraphs", []))
+            kept = blocks[-history_blocks:] if history_blocks else blocks
+            dropped = sum(len(b) for b in blocks[:len(blocks) - len(kept)])
+            entry["s"] = [line for block in kept for line in block]
+            if dropped:
+                entry["h"] = dropped
+
+            for key, field in (("w", "for_whom_paragraphs"), ("d", "due_paragraphs")):
+                values = [v.strip() for v in point.get(field, []) if v.strip()]
+                if values:
+                    entry[key] = values[-1]
+            points.append(entry)
+
+        report_summary["s"].append({"n": section["section_name"], "p": points})
+
+    return report_summary
+
+
+def encode_report(parsed_report, compact=False, history_blocks=HISTORY_BLOCKS):
+    """Encode the parsed report as the JSON text embedded in the prompt.
+
+    The default encoding is the full, indented summary. The compact encoding
+    drops indentation, uses short keys and prunes per-point history, so its
+    size stays roughly flat as a project's report grows week after week.
+    """
+    if compact:
+        return json.dumps(
+            _summarize_report_compact(parsed_report, history_blocks),
+            separators=(",", ":"), ensure_ascii=False,
+        )
+    return json.dumps(_summarize_report(parsed_report), indent=2, ensure_ascii=False)
+
+
+def compact_report_savings(parsed_report, history_blocks=HISTORY_BLOCKS):
+    """Estimate the prompt tokens saved by the compact report encoding.
+
+    Returns:
+        dict: {"full_tokens", "compact_tokens", "saved_tokens"}
+    """
+    full_tokens = estimate_tokens(encode_report(parsed_report))
+    compact_tokens = estimate_tokens(
+        encode_report(parsed_report, compact=True, history_blocks=history_blocks)
+    )
+    return {
+        "full_tokens": full_tokens,
+        "compact_tokens": compact_tokens,
+        "saved_tokens": full_tokens - compact_tokens,
+    }
+
+
+def _build_user_message(parsed_report, cleaned_text, part=None, compact_report=False,
+                        compact_output=False):
+    """Build the user message with report JSON and transcript text.
+
+    Args:
+        part: optional (index, total) tuple when cleaned_text is one chunk of a
+              longer transcript (chunked mode)
+        compact_report: use the compact report encoding (see encode_report)
+        compact_output: the request asks for the compact output schema; the
+                        report legend then points to it instead of to the
+                        full field names
+    """
+    is_template = _is_template_report(parsed_report)
+
+    report_json = encode_report(parsed_report, compact=compact_report)
 
     # Truncate transcript if too long
     transcript = cleaned_text
@@ -217,6 +642,13 @@ def _build_user_message(parsed_report, cleaned_text):
         transcript += "\n\n[... TRANSCRIPT TRUNCATED due to length ...]"
 
     report_label = "Report Template (N°0 - blank)" if is_template else "Previous Meeting Report"
+    if compact_report:
+        report_label += "\n\n" + COMPACT_REPORT_LEGEND + (
+            COMPACT_REPORT_COMPACT_OUTPUT if compact_output else COMPACT_REPORT_FULL_OUTPUT
+        )
+    transcript_label = "Meeting Transcript"
+    if part:
+        transcript_label += f" (part {part[0] + 1} of {part[1]})"
 
     return f"""## {report_label}
 
@@ -224,7 +656,7 @@ def _build_user_message(parsed_report, cleaned_text):
 {report_json}
 ```
 
-## Meeting Transcript
+## {transcript_label}
 
 {transcript}
 """
@@ -296,99 +728,1076 @@ def validate_updates(updates):
     return len(errors) == 0, errors
 
 
+def _parse_response(text):
+    """Parse the updates JSON from an API response in a single tolerant pass.
+
+    Handles markdown wrapping, surrounding prose, trailing commas and output cut
+    off at max_tokens (see json_stream.parse_tolerant).
+
+    Returns:
+        tuple: (updates, truncated: bool)
+    """
+    return parse_tolerant(text)
+
+
 def _extract_json_from_response(text):
     """Extract JSON from API response, handling potential markdown wrapping."""
-    # Try direct parse first
-    text = text.strip()
-    try:
-        return json.loads(text)
-    except json.JSONDecodeError:
-        pass
+    return _parse_response(text)[0]
+
+
+def _with_tool(request, tool):
+    """Add a tool to request kwargs and force the model to answer through it."""
+    request["tools"] = [tool]
+    request["tool_choice"] = {"type": "tool", "name": tool["name"]}
+    return request
 
-    # Try extracting from markdown code block
-    match = re.search(r'```(?:json)?\s*\n?(.*?)\n?```', text, re.DOTALL)
+
+def _tool_input(response):
+    """Return the input of the first tool_use block of a response, or None."""
+    for block in response.content:
+        if block.type == "tool_use":
+            return block.input
+    return None
+
+
+def _response_text(response):
+    return "".join(block.text for block in response.content if block.type == "text")
+
+
+def _response_json(response):
+    """Return the structured output of a response.
+
+    The tool input is used as is; only a plain-text answer goes through the
+    tolerant JSON parser.
+
+    Raises:
+        ValueError: if a text answer contains no JSON object.
+    """
+    value = _tool_input(response)
+    if value is None:
+        value = _extract_json_from_response(_response_text(response))
+    return value
+
+
+def _tool_without(tool, fields):
+    """A copy of tool with some top-level fields removed from its input schema."""
+    schema = dict(tool["input_schema"])
+    schema["properties"] = {k: v for k, v in schema["properties"].items() if k not in fields}
+    schema["required"] = [k for k in schema["required"] if k not in fields]
+    return dict(tool, input_schema=schema)
+
+
+def apply_local_fields(updates, local_fields, usage=None):
+    """Fill locally extracted fields into updates (they override model output)."""
+    updates.update(local_fields)
+    if usage is not None:
+        usage["local_fields"] = sorted(local_fields)
+    return updates
+
+
+def _escalated_request(request):
+    """Return request with max_tokens doubled, or None if it is already at the model limit."""
+    limit = MODEL_MAX_OUTPUT_TOKENS.get(request["model"], request["max_tokens"])
+    if request["max_tokens"] >= limit:
+        return None
+    return {**request, "max_tokens": min(limit, request["max_tokens"] * 2)}
+
+
+def _continuation_request(request, partial_text):
+    """Build a request that continues a response cut off at max_tokens.
+
+    The partial output is sent back as an assistant turn, so the model resumes
+    generation exactly where it stopped instead of starting over.
+    """
+    continued = dict(request)
+    continued["messages"] = request["messages"] + [
+        {"role": "assistant", "content": partial_text.rstrip()},
+    ]
+    return continued
+
+
+def _error_path(error):
+    """Map a validate_updates() error message to the path of the invalid fragment."""
+    match = re.match(r"^(\w+)\[(\d+)\]", error)
     if match:
-        try:
-            return json.loads(match.group(1).strip())
-        except json.JSONDecodeError:
-            pass
+        return f"{match.group(1)}[{match.group(2)}]"
+    match = re.match(r"^Missing required key: (\w+)$", error)
+    if match:
+        return match.group(1)
+    match = re.match(r"^(\w+) must be", error)
+    if match:
+        return match.group(1)
+    return None
 
-    # Try finding the first { ... } block
-    brace_start = text.find('{')
-    brace_end = text.rfind('}')
-    if brace_start != -1 and brace_end != -1:
-        try:
-            return json.loads(text[brace_start:brace_end + 1])
-        except json.JSONDecodeError:
-            pass
 
-    raise ValueError(f"Could not extract valid JSON from API response")
+def _get_fragment(updates, path):
+    match = re.match(r"^(\w+)\[(\d+)\]$", path)
+    if match:
+        items = updates.get(match.group(1), [])
+        index = int(match.group(2))
+        return items[index] if index < len(items) else None
+    return updates.get(path)
+
+
+def _fragment_schema(path, schema=UPDATES_SCHEMA):
+    key = path.split("[", 1)[0]
+    schema = schema["properties"].get(key, {})
+    if "[" in path:
+        return schema.get("items", {})
+    return schema
+
+
+def _prepare_repair_request(updates, errors, compact=None):
+    """Build a small request that asks the model to fix only the invalid fragments.
+
+    Args:
+        updates: the (expanded) updates that failed validate_updates()
+        errors: the validation errors
+        compact: with compact output, the model's record_compact_updates input;
+                 its fragments are repaired instead, with the compact schema,
+                 paths and error wording (see compact_output.compact_error)
+
+    Returns:
+        tuple: (request kwargs, list of fragment paths), or (None, []) when some
+               error cannot be attributed to a fragment
+    """
+    by_path = {}
+    for error in errors:
+        path = _error_path(error)
+        if path is None:
+            return None, []
+        by_path.setdefault(path, []).append(error)
+
+    schema = UPDATES_SCHEMA
+    if compact is not None:
+        by_path = {
+            compact_path(path): [compact_error(e) for e in path_errors]
+            for path, path_errors in by_path.items()
+        }
+        updates, schema = compact, COMPACT_UPDATES_SCHEMA
+
+    fragments = [
+        {
+            "path": path,
+            "schema": _fragment_schema(path, schema),
+            "value": _get_fragment(updates, path),
+            "errors": path_errors,
+        }
+        for path, path_errors in by_path.items()
+    ]
+    fragments_json = json.dumps(fragments, indent=2, ensure_ascii=False)
+
+    request = _with_tool({
+        "model": MODEL,
+        "max_tokens": REPAIR_MAX_TOKENS,
+        "system": SYSTEM_PROMPT_REPAIR,
+        "messages": [{
+            "role": "user",
+            "content": f"## Invalid Fragments\n\n```json\n{fragments_json}\n```\n",
+        }],
+    }, REPAIR_TOOL)
+    return request, list(by_path)
+
+
+def apply_repairs(updates, repaired, paths):
+    """Splice corrected fragments from a repair response back into updates.
+
+    Only paths that were requested are applied; anything else is ignored.
+    """
+    for fragment in repaired.get("fragments", []):
+        path = fragment.get("path")
+        if path not in paths:
+            continue
+        match = re.match(r"^(\w+)\[(\d+)\]$", path)
+        if match:
+            items = updates.get(match.group(1))
+            index = int(match.group(2))
+            if isinstance(items, list) and index < len(items):
+                items[index] = fragment.get("value")
+        else:
+            updates[path] = fragment.get("value")
+    return updates
+
+
+def _prepare_feedback_request(parsed_report, cleaned_text, current_proposals,
+                              feedback, compact_report=False):
+    """Build the request asking for patch operations that apply the feedback."""
+    proposal = {
+        key: value for key, value in current_proposals.items()
+        if key not in ("usage", "validation_warnings", "reference_fixes",
+                       "raw_response")
+    }
+    proposal_json = json.dumps(proposal, indent=1, ensure_ascii=False)
+    user_message = _build_user_message(parsed_report, cleaned_text,
+                                       compact_report=compact_report)
+    user_message += f"""
+## Current Proposal
+
+```json
+{proposal_json}
+```
+
+## Feedback
+
+{feedback}
+"""
+    return _with_tool({
+        "model": MODEL,
+        "max_tokens": FEEDBACK_MAX_TOKENS,
+        "system": SYSTEM_PROMPT_FEEDBACK,
+        "messages": [{"role": "user", "content": user_message}],
+    }, PATCH_TOOL)
+
+
+def estimate_output_tokens(parsed_report, cleaned_text):
+    """Estimate the size of the updates JSON from point count and transcript length.
+
+    Updates mode: point updates grow with the transcript length, bounded by the
+    number of points; info exchange and planning are re-emitted in full.
+    First report mode: 8-20 new points depending on meeting length.
+    """
+    transcript_tokens = estimate_tokens(cleaned_text)
+    info_items = len(parsed_report.get("info_exchange", []))
+    planning_items = len(parsed_report.get("planning", []))
+    point_count = sum(len(s.get("points", [])) for s in parsed_report.get("sections", []))
+
+    if _is_template_report(parsed_report):
+        new_points = min(20, max(8, transcript_tokens // 1_000))
+        return (OUTPUT_BASE_TOKENS + new_points * TOKENS_PER_NEW_POINT
+                + max(info_items, new_points // 2) * TOKENS_PER_INFO_ITEM
+                + max(planning_items, 3) * TOKENS_PER_PLANNING_ITEM)
+
+    point_updates = min(point_count, transcript_tokens // TRANSCRIPT_TOKENS_PER_UPDATE)
+    new_points = transcript_tokens // TRANSCRIPT_TOKENS_PER_NEW_POINT
+    return (OUTPUT_BASE_TOKENS
+            + point_updates * TOKENS_PER_POINT_UPDATE
+            + new_points * TOKENS_PER_NEW_POINT
+            + (info_items + new_points) * TOKENS_PER_INFO_ITEM
+            + planning_items * TOKENS_PER_PLANNING_ITEM)
 
 
-def analyze_meeting(parsed_report, cleaned_text, api_key):
+def plan_route(parsed_report, cleaned_text, rules=ROUTING_RULES, compact_report=False):
+    """Choose model and max_tokens for an analysis from the measured input size.
+
+    Args:
+        rules: ordered list of {name, model, max_input_tokens, max_output_tokens,
+               max_tokens_cap}; missing limits are unbounded. The last rule
+               should have no limits so every request gets a route.
+
+    Returns:
+        dict: {"name", "model", "max_tokens", "input_tokens", "expected_output_tokens"}
+    """
+    is_template = _is_template_report(parsed_report)
+    system_prompt = SYSTEM_PROMPT_NEW_REPORT if is_template else SYSTEM_PROMPT_UPDATE
+    input_tokens = estimate_tokens(system_prompt) + estimate_tokens(
+        _build_user_message(parsed_report, cleaned_text, compact_report=compact_report)
+    )
+    expected_output = estimate_output_tokens(parsed_report, cleaned_text)
+
+    rule = rules[-1]
+    for candidate in rules:
+        if (input_tokens <= candidate.get("max_input_tokens", float("inf"))
+                and expected_output <= candidate.get("max_output_tokens", float("inf"))):
+            rule = candidate
+            break
+
+    max_tokens = max(MIN_MAX_TOKENS, round(expected_output * OUTPUT_HEADROOM))
+    if rule.get("max_tokens_cap"):
+        max_tokens = min(max_tokens, rule["max_tokens_cap"])
+
+    return {
+        "name": rule.get("name"),
+        "model": rule["model"],
+        "max_tokens": max_tokens,
+        "input_tokens": input_tokens,
+        "expected_output_tokens": expected_output,
+    }
+
+
+def _prepare_request(parsed_report, cleaned_text, part=None, compact_report=False,
+                     route=None, shard=None, local_fields=None, compact_output=False):
+    """Build the Messages API request kwargs for an analysis call.
+
+    Args:
+        route: optional dict from plan_route(); overrides model and max_tokens
+        shard: in sharded mode, "global" or the list of section names of a
+               section shard (see shard_report)
+        local_fields: fields filled locally (see local_extractors.accepted_fields);
+                      they are removed from the tool schema and the model is told
+                      not to output them
+        compact_output: ask for the short-key record_compact_updates output
+                        (see compact_output.expand_updates)
+    """
+    user_message = _build_user_message(parsed_report, cleaned_text, part, compact_report,
+                                       compact_output)
+
+    # Select prompt based on whether this is a first report or an update
+    is_template = _is_template_report(parsed_report)
+    system_prompt = SYSTEM_PROMPT_NEW_REPORT if is_template else SYSTEM_PROMPT_UPDATE
+    if part:
+        system_prompt += CHUNK_PROMPT_NOTE
+    if shard == "global":
+        system_prompt += GLOBAL_SHARD_NOTE
+    elif shard:
+        system_prompt += SECTION_SHARD_NOTE.format(
+            sections=", ".join(f'"{name}"' for name in shard)
+        )
+    tool = UPDATES_TOOL
+    if compact_output:
+        system_prompt += COMPACT_OUTPUT_NOTE
+        tool = COMPACT_UPDATES_TOOL
+    if local_fields:
+        skipped = [f for f in UPDATES_SCHEMA["properties"] if f in local_fields]
+        if compact_output:
+            skipped = compact_field_names(skipped)
+        system_prompt += LOCAL_FIELDS_NOTE.format(
+            fields=", ".join(f"`{f}`" for f in skipped)
+        )
+        tool = _tool_without(tool, skipped)
+    max_tokens = 8192 if is_template else 4096  # First reports need more tokens
+
+    return _with_tool({
+        "model": route["model"] if route else MODEL,
+        "max_tokens": route["max_tokens"] if route else max_tokens,
+        "system": system_prompt,
+        "messages": [{"role": "user", "content": user_message}],
+    }, tool)
+
+
+def shard_sections(parsed_report, max_tokens=SECTION_SHARD_TOKENS):
+    """Group consecutive report sections into shards of about max_tokens each.
+
+    A section larger than max_tokens is a shard on its own. A shard without any
+    point (only empty sections) is folded into its neighbour, so every shard is
+    analyzed in update mode.
+
+    Returns:
+        list[list[str]]: section names per shard, in report order
+    """
+    groups = []
+    group_tokens = 0
+    for section in parsed_report.get("sections", []):
+        tokens = estimate_tokens(json.dumps(section, ensure_ascii=False))
+        if not groups or group_tokens + tokens > max_tokens:
+            groups.append([])
+            group_tokens = 0
+        groups[-1].append(section)
+        group_tokens += tokens
+
+    shards = []
+    for group in groups:
+        has_points = any(section.get("points") for section in group)
+        if shards and (not has_points or not shards[-1][1]):
+            shards[-1] = (shards[-1][0] + group, shards[-1][1] or has_points)
+        else:
+            shards.append((group, has_points))
+    return [[section["section_name"] for section in group] for group, _ in shards]
+
+
+def shard_report(parsed_report, shard):
+    """Return the part of the report sent with one request of sharded mode.
+
+    A section shard keeps only its sections (no info exchange or planning);
+    the "global" shard keeps metadata, info exchange and planning, and only the
+    number and title of each point.
+    """
+    if shard == "global":
+        sections = [
+            {
+                "section_name": section["section_name"],
+                "points": [
+                    {"number": point["number"], "title": point["title"]}
+                    for point in section.get("points", [])
+                ],
+            }
+            for section in parsed_report.get("sections", [])
+        ]
+        return dict(parsed_report, sections=sections)
+
+    names = set(shard)
+    return dict(
+        parsed_report,
+        sections=[s for s in parsed_report.get("sections", []) if s["section_name"] in names],
+        info_exchange=[],
+        planning=[],
+    )
+
+
+def estimate_request_tokens(request):
+    """Estimate the input tokens of prepared request kwargs, tool definitions included."""
+    tokens = estimate_tokens(request_text(request))
+    if request.get("tools"):
+        tokens += TOOL_USE_SYSTEM_TOKENS
+    return tokens
+
+
+def expected_latency(request, first_event=False):
+    """Seconds a request takes at MODEL_SPEED when it writes max_tokens.
+
+    With first_event, only the time before the first streamed event.
+    """
+    first_token, tokens_per_second = MODEL_SPEED.get(request.get("model"), MODEL_SPEED[MODEL])
+    if first_event:
+        return first_token
+    return first_token + request.get("max_tokens", 0) / tokens_per_second
+
+
+def preflight(parsed_report, cleaned_text, compact_report=False, transcript_budget=None,
+              routing_rules=None):
+    """Estimate tokens, cost and latency of analyze_meeting() without calling the API.
+
+    Takes the same options as analyze_meeting() and builds the exact requests it
+    would send (after compaction, split into chunks if the transcript is still
+    longer than MAX_TRANSCRIPT_CHARS), so the caller can pick chunking or
+    compaction up front and show an estimate instantly. Runs locally in a few
+    milliseconds.
+
+    Returns:
+        dict: {
+            "mode": "single" | "chunked",
+            "requests": int,
+            "model": str (of the first request),
+            "input_tokens": int, "output_tokens": int (expected),
+            "max_output_tokens": int (worst case),
+            "cost_usd": float (expected), "max_cost_usd": float (worst case),
+            "latency_seconds": float (chunks run concurrently),
+            "transcript_compaction": dict (only with transcript_budget),
+            "suggested_transcript_budget": int (only in chunked mode: a budget
+                that would fit the transcript in a single request),
+        }
+    """
+    result = {}
+    if transcript_budget:
+        cleaned_text, result["transcript_compaction"] = compact_transcript(
+            cleaned_text, parsed_report, transcript_budget
+        )
+
+    parts = [cleaned_text]
+    if len(cleaned_text) > MAX_TRANSCRIPT_CHARS:
+        parts = split_transcript_chunks(cleaned_text, CHUNK_TOKEN_BUDGET)
+
+    estimates = []
+    for i, text in enumerate(parts):
+        route = None
+        if routing_rules:
+            route = plan_route(parsed_report, text, routing_rules, compact_report)
+        request = _prepare_request(
+            parsed_report, text, part=(i, len(parts)) if len(parts) > 1 else None,
+            compact_report=compact_report, route=route,
+        )
+        input_tokens = estimate_request_tokens(request)
+        output_tokens = min(request["max_tokens"], estimate_output_tokens(parsed_report, text))
+        input_price, output_price = MODEL_PRICING.get(request["model"], MODEL_PRICING[MODEL])
+        first_token, tokens_per_second = MODEL_SPEED.get(request["model"], MODEL_SPEED[MODEL])
+        estimates.append({
+            "model": request["model"],
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "max_output_tokens": request["max_tokens"],
+            "cost_usd": (input_tokens * input_price + output_tokens * output_price) / 1_000_000,
+            "max_cost_usd": (input_tokens * input_price
+                             + request["max_tokens"] * output_price) / 1_000_000,
+            "latency_seconds": first_token + output_tokens / tokens_per_second,
+        })
+
+    result.update({
+        "mode": "chunked" if len(parts) > 1 else "single",
+        "requests": len(parts),
+        "model": estimates[0]["model"],
+        "input_tokens": sum(e["input_tokens"] for e in estimates),
+        "output_tokens": sum(e["output_tokens"] for e in estimates),
+        "max_output_tokens": sum(e["max_output_tokens"] for e in estimates),
+        "cost_usd": round(sum(e["cost_usd"] for e in estimates), 4),
+        "max_cost_usd": round(sum(e["max_cost_usd"] for e in estimates), 4),
+        "latency_seconds": round(max(e["latency_seconds"] for e in estimates), 1),
+    })
+    if len(parts) > 1:
+        result["suggested_transcript_budget"] = chars_to_tokens(MAX_TRANSCRIPT_CHARS)
+    return result
+
+
+def analyze_meeting(parsed_report, cleaned_text, api_key, compact_report=False,
+                    transcript_budget=None, routing_rules=None, hedge=None,
+                    local_fields=None, compact_output=False):
     """Analyze a meeting transcript against the previous report using Claude API.
 
+    Transcripts longer than MAX_TRANSCRIPT_CHARS are analyzed in chunked mode
+    (see analyze_meeting_chunked) instead of being truncated.
+
+    This is a thin synchronous wrapper around AnalyzerService.analyze(). The
+    sync wrappers share one long-lived service per API key and hedge setting
+    (see _run_with_service), so the connection pool and the rate-limit backoff
+    carry over between calls. The call blocks until the analysis is done; async
+    code should hold its own AnalyzerService and await it instead.
+
     Args:
         parsed_report: dict from report_parser.parse_report()
         cleaned_text: formatted string from transcript_cleaner.format_clean_transcript()
         api_key: Anthropic API key
+        compact_report: send the compact report encoding with pruned history
+                        (see encode_report); usage then reports the tokens saved
+        transcript_budget: optional token budget; the transcript is first reduced
+                           to its most report-relevant turns (see
+                           transcript_compactor.compact_transcript)
+        routing_rules: optional rules (e.g. ROUTING_RULES) to pick the model and
+                       max_tokens from the measured input size (see plan_route);
+                       the chosen route is recorded in usage["route"]
+        hedge: True (process-wide hedging.DEFAULT_POLICY) or a HedgePolicy to send
+               a second identical request when a call is slower than the policy's
+               latency percentile; hedges are counted in usage["hedges"]
+        local_fields: fields extracted deterministically, e.g.
+                      local_extractors.accepted_fields(extract_fields(...)); they
+                      are filled in locally instead of being generated
+        compact_output: have the model answer with the short-key compact schema,
+                        expanded locally into the same structure (see
+                        compact_output); usage["output_encoding"] reports the
+                        output tokens saved
 
     Returns:
         dict: Updates structure ready for report_generator.generate_report(),
               or dict with "error" key on failure.
-              Also includes "usage" key with token counts.
+              Also includes "usage" key with token counts. Section and point
+              references are checked against the report (report_validator):
+              corrections are listed in "reference_fixes", unresolved ones in
+              "validation_warnings".
     """
-    client = anthropic.Anthropic(api_key=api_key)
-    user_message = _build_user_message(parsed_report, cleaned_text)
+    async def _analyze(service):
+        return await service.analyze(
+            parsed_report, cleaned_text, compact_report, transcript_budget, routing_rules,
+            local_fields, compact_output,
+        )
 
-    # Select prompt based on whether this is a first report or an update
-    is_template = _is_template_report(parsed_report)
-    system_prompt = SYSTEM_PROMPT_NEW_REPORT if is_template else SYSTEM_PROMPT_UPDATE
-    max_tokens = 8192 if is_template else 4096  # First reports need more tokens
+    return _run_with_service(api_key, _analyze, hedge)
+
+
+# Offline backend set by set_transport(); None means the live Anthropic API
+_transport = None
+
+# Long-lived AnalyzerService instances used by the sync wrappers, keyed by
+# (api_key, hedge). They all run on one background event loop thread, so sync
+# callers reuse the same connection pool and backoff state, and the wrappers
+# also work when called from code that already runs an event loop.
+_service_loop = None
+_services = {}
+_services_lock = threading.Lock()
+
+
+def set_transport(transport):
+    """Send every analysis call through a transport instead of the live API.
+
+    Args:
+        transport: a transport.RecordTransport, ReplayTransport or
+                   SyntheticTransport, or None to go back to the live API
+    """
+    global _transport
+    close_services()
+    _transport = transport
 
-    response_text = None
-    last_error = None
-    for attempt in range(2):
+
+def _get_service_loop():
+    """Event loop of the background thread the shared services run on."""
+    global _service_loop
+    with _services_lock:
+        if _service_loop is None:
+            _service_loop = asyncio.new_event_loop()
+            threading.Thread(target=_service_loop.run_forever,
+                             name="analyzer-service-loop", daemon=True).start()
+        return _service_loop
+
+
+def _shared_service(api_key, hedge):
+    """Shared AnalyzerService for (api_key, hedge), created on first use."""
+    try:
+        from .analyzer_service import AnalyzerService
+    except ImportError:  # imported as a flat module from src/
+        from analyzer_service import AnalyzerService
+
+    # HedgePolicy objects are keyed by identity: each policy keeps its own samples
+    key = (api_key, hedge if hedge is None or isinstance(hedge, bool) else id(hedge))
+    with _services_lock:
+        service = _services.get(key)
+        if service is None:
+            client = _transport.async_client() if _transport else None
+            service = AnalyzerService(api_key, client=client, hedge=hedge)
+            _services[key] = service
+        return service
+
+
+def close_services():
+    """Close the shared services of the sync wrappers (they are recreated on demand)."""
+    with _services_lock:
+        services = list(_services.values())
+        _services.clear()
+        loop = _service_loop
+    if loop is None:
+        return
+    for service in services:
         try:
-            response = client.messages.create(
-                model=MODEL,
-                max_tokens=max_tokens,
-                system=system_prompt,
-                messages=[{"role": "user", "content": user_message}],
-            )
-
-            response_text = response.content[0].text
-            updates = _extract_json_from_response(response_text)
-
-            is_valid, errors = validate_updates(updates)
-            if not is_valid and attempt == 0:
-                last_error = f"Validation errors: {'; '.join(errors)}"
-                continue
+            asyncio.run_coroutine_threadsafe(service.close(), loop).result()
+        except Exception:
+            pass
 
-            # Add usage info
-            updates["usage"] = {
-                "input_tokens": response.usage.input_tokens,
-                "output_tokens": response.usage.output_tokens,
-            }
 
-            if not is_valid:
-                updates["validation_warnings"] = errors
+atexit.register(close_services)
 
-            return updates
 
-        except anthropic.APIError as e:
-            last_error = f"API error: {str(e)}"
-            if attempt == 0:
-                continue
-        except ValueError as e:
-            last_error = str(e)
-            if attempt == 0:
+def _run_with_service(api_key, handler, hedge=None):
+    """Run handler(service) on the shared AnalyzerService from sync code.
+
+    The coroutine runs on the background service loop and this thread waits
+    for its result, so it is safe to call from inside a running event loop
+    (that loop is blocked for the duration of the call).
+    """
+    loop = _get_service_loop()
+    service = _shared_service(api_key, hedge)
+    return asyncio.run_coroutine_threadsafe(handler(service), loop).result()
+
+
+def split_transcript_chunks(cleaned_text, max_tokens=CHUNK_TOKEN_BUDGET):
+    """Split a cleaned transcript at turn boundaries into token-budgeted chunks.
+
+    Each chunk repeats the transcript header (duration, speakers) so the model
+    keeps the meeting context. A single turn larger than the budget becomes a
+    chunk on its own rather than being cut mid-sentence.
+
+    Returns:
+        list[str]: chunk texts in chronological order
+    """
+    header, blocks = split_formatted_transcript(cleaned_text)
+    # Each block is preceded by a blank line and the chunk ends with a newline
+    budget = max_tokens - estimate_tokens(header) - estimate_tokens("\n")
+
+    chunks = []
+    current = []
+    current_tokens = 0
+    for block in blocks:
+        block_tokens = estimate_tokens("\n\n") + estimate_tokens(block)
+        if current and current_tokens + block_tokens > budget:
+            chunks.append(current)
+            current = []
+            current_tokens = 0
+        current.append(block)
+        current_tokens += block_tokens
+    if current:
+        chunks.append(current)
+
+    return [header + "\n\n" + "\n\n".join(chunk) + "\n" for chunk in chunks]
+
+
+def analyze_meeting_chunked(parsed_report, cleaned_text, api_key,
+                            max_chunk_tokens=CHUNK_TOKEN_BUDGET, compact_report=False,
+                            routing_rules=None, hedge=None, local_fields=None,
+                            compact_output=False):
+    """Analyze a long transcript as concurrent chunks, then merge the results.
+
+    Every chunk is analyzed against the same report context; the partial updates
+    are combined by merge_chunk_updates(). Wall-clock latency is bounded by the
+    slowest chunk rather than by the total transcript length.
+
+    Returns:
+        dict: same structure as analyze_meeting(). "usage" sums all chunk calls
+              and records the chunk count; chunks that failed are listed in
+              "chunk_errors".
+    """
+    async def _analyze(service):
+        return await service.analyze_chunked(
+            parsed_report, cleaned_text, max_chunk_tokens, compact_report, routing_rules,
+            local_fields, compact_output,
+        )
+
+    return _run_with_service(api_key, _analyze, hedge)
+
+
+def analyze_meeting_sharded(parsed_report, cleaned_text, api_key,
+                            max_shard_tokens=SECTION_SHARD_TOKENS, compact_report=False,
+                            routing_rules=None, hedge=None, local_fields=None,
+                            compact_output=False):
+    """Analyze a large report as concurrent per-section requests, then merge them.
+
+    Each request carries the full transcript and one group of sections (see
+    shard_sections) and only returns point updates and new points for those
+    sections; one small extra request returns metadata, info exchange and
+    planning. Latency is bounded by the largest shard and no single response
+    has to hold the whole report's output. Template reports, reports that fit
+    in one shard and transcripts longer than MAX_TRANSCRIPT_CHARS fall back to
+    analyze_meeting().
+
+    Returns:
+        dict: same structure as analyze_meeting(). "usage" sums all calls and
+              records the shard count; shards that failed are listed in
+              "shard_errors".
+    """
+    async def _analyze(service):
+        return await service.analyze_sharded(
+            parsed_report, cleaned_text, max_shard_tokens, compact_report, routing_rules,
+            local_fields, compact_output,
+        )
+
+    return _run_with_service(api_key, _analyze, hedge)
+
+
+def analyze_feedback(parsed_report, cleaned_text, current_proposals, feedback,
+                     api_key, compact_report=False, hedge=None):
+    """Apply natural-language feedback to the current proposal (analyze-feedback).
+
+    The model returns patch operations (see proposal_patch) that are validated
+    and applied locally, so each feedback round only generates the change.
+
+    Args:
+        parsed_report: dict from report_parser.parse_report()
+        cleaned_text: formatted string from transcript_cleaner.format_clean_transcript()
+        current_proposals: updates dict currently shown in the review UI
+        feedback: the project manager's feedback text
+        api_key: Anthropic API key
+
+    Returns:
+        dict: the updated proposal (same structure as analyze_meeting()) with
+              "patch" (applied operations) and "usage"; operations that could
+              not be applied are listed in "patch_warnings". Dict with "error"
+              key on failure.
+    """
+    async def _analyze(service):
+        return await service.analyze_feedback(
+            parsed_report, cleaned_text, current_proposals, feedback, compact_report
+        )
+
+    return _run_with_service(api_key, _analyze, hedge)
+
+
+def _normalize_key(text):
+    """Normalize free text for duplicate detection."""
+    return re.sub(r"[\W_]+", " ", str(text or "")).strip().casefold()
+
+
+def merge_chunk_updates(results):
+    """Reduce the updates of consecutive transcript chunks into one updates dict.
+
+    - Metadata: first non-null value, except next_meeting where the last mention wins
+    - point_updates: merged per point number, subject lines concatenated in order;
+      the latest for_whom / due wins
+    - new_points: deduplicated by section + title; colliding numbers are renumbered
+    - info_exchange / planning: reconciled by content, later chunks update status
+
+    Args:
+        results: list of updates dicts, in transcript order
+
+    Returns:
+        dict: merged updates with summed "usage"
+    """
+    merged = {
+        "meeting_number": None,
+        "date": None,
+        "distribution_date": None,
+        "next_meeting": None,
+        "point_updates": [],
+        "new_points": [],
+        "info_exchange": [],
+        "planning": [],
+    }
+
+    for result in results:
+        for key in ("meeting_number", "date"):
+            if merged[key] is None and result.get(key) is not None:
+                merged[key] = result[key]
+        if result.get("next_meeting"):
+            merged["next_meeting"] = result["next_meeting"]
+
+    # Point updates: one entry per point number
+    by_number = {}
+    for result in results:
+        for pu in result.get("point_updates", []):
+            existing = by_number.get(pu.get("number"))
+            if existing is None:
+                existing = dict(pu, subject_lines=[])
+                by_number[pu.get("number")] = existing
+                merged["point_updates"].append(existing)
+            for line in pu.get("subject_lines", []):
+                if line not in existing["subject_lines"]:
+                    existing["subject_lines"].append(line)
+            for field in ("for_whom", "due"):
+                if pu.get(field):
+                    existing[field] = pu[field]
+
+    # New points: dedupe by section + title, keep numbers unique
+    by_title = {}
+    used_numbers = set()
+    for result in results:
+        for np in result.get("new_points", []):
+            key = (_normalize_key(np.get("section")), _normalize_key(np.get("title")))
+            existing = by_title.get(key)
+            if existing is not None:
+                for line in np.get("subject_lines", []):
+                    if line not in existing["subject_lines"]:
+                        existing["subject_lines"].append(line)
+                for field in ("for_whom", "due"):
+                    if np.get(field):
+                        existing[field] = np[field]
                 continue
-        except Exception as e:
-            last_error = f"Unexpected error: {str(e)}"
+            point = dict(np, subject_lines=list(np.get("subject_lines", [])))
+            point["number"] = _unique_point_number(point.get("number"), used_numbers)
+            used_numbers.add(point["number"])
+            by_title[key] = point
+            merged["new_points"].append(point)
+
+    # Info exchange / planning: reconcile by content, later chunks win
+    by_content = {}
+    for result in results:
+        for ie in result.get("info_exchange", []):
+            key = _normalize_key(ie.get("content"))
+            if key in by_content:
+                by_content[key].update({k: v for k, v in ie.items() if v})
+            else:
+                by_content[key] = dict(ie)
+                merged["info_exchange"].append(by_content[key])
+
+    by_content = {}
+    for result in results:
+        for pl in result.get("planning", []):
+            key = _normalize_key(pl.get("content"))
+            if key in by_content:
+                by_content[key]["is_new"] = by_content[key].get("is_new") or pl.get("is_new", False)
+            else:
+                by_content[key] = dict(pl)
+                merged["planning"].append(by_content[key])
+
+    merged["usage"] = {
+        "input_tokens": sum(r.get("usage", {}).get("input_tokens", 0) for r in results),
+        "output_tokens": sum(r.get("usage", {}).get("output_tokens", 0) for r in results),
+        "chunks": len(results),
+    }
+    for key in ("hedges", "hedge_wins"):
+        total = sum(r.get("usage", {}).get(key, 0) for r in results)
+        if total:
+            merged["usage"][key] = total
+    routes = [r["usage"]["route"] for r in results if r.get("usage", {}).get("route")]
+    if routes:
+        merged["usage"]["routes"] = routes
+    encodings = [r["usage"]["output_encoding"] for r in results
+                 if r.get("usage", {}).get("output_encoding")]
+    if encodings:
+        merged["usage"]["output_encoding"] = {
+            key: sum(e[key] for e in encodings) for key in encodings[0]
+        }
+    for result in results:
+        if result.get("usage", {}).get("local_fields"):
+            merged["usage"]["local_fields"] = result["usage"]["local_fields"]
             break
+    warnings = [w for r in results for w in r.get("validation_warnings", [])]
+    if warnings:
+        merged["validation_warnings"] = warnings
 
-    return {
-        "error": last_error,
-        "raw_response": response_text,
+    return merged
+
+
+def _unique_point_number(number, used_numbers):
+    """Return number, or the next free "MM.NN" number with the same prefix."""
+    if number not in used_numbers:
+        return number
+    match = re.match(r"^(\d+)\.(\d+)$", str(number))
+    if not match:
+        return number
+    prefix, seq = match.group(1), int(match.group(2))
+    width = len(match.group(2))
+    while f"{prefix}.{seq:0{width}d}" in used_numbers:
+        seq += 1
+    return f"{prefix}.{seq:0{width}d}"
+
+
+def _start_stream(client, request, tag, results):
+    """Open a stream and wait for its first event; report the outcome on results."""
+    try:
+        manager = client.messages.stream(**request)
+        stream = manager.__enter__()
+        events = iter(stream)
+        first = next(events, None)
+        results.put((tag, manager, stream, events, first, None))
+    except Exception as e:
+        results.put((tag, None, None, None, None, e))
+
+
+def _close_streams(results, count):
+    """Close the streams of the next count entries of results (hedge losers)."""
+    for _ in range(count):
+        manager = results.get()[1]
+        if manager is not None:
+            manager.__exit__(None, None, None)
+
+
+def _open_stream(client, request, hedge=None):
+    """Open a streaming call, hedged on time to first event when a policy is given.
+
+    With a hedge policy, a second identical stream is opened when the first has
+    not produced an event by the policy deadline; the first stream to produce
+    one wins and the other is closed in the background.
+
+    Returns:
+        tuple: (stream manager to __exit__, stream, iterator over all events,
+                usage counters dict)
+
+    Raises:
+        anthropic.APIError: if every opened stream failed.
+    """
+    results = queue.Queue()
+    if hedge is None:
+        _start_stream(client, request, 0, results)
+        entries = [results.get()]
+        launched = 1
+    else:
+        kind = ("stream",) + request_kind(request)
+        deadline = hedge.deadline(kind, expected_latency(request, first_event=True))
+        started = time.monotonic()
+        threading.Thread(target=_start_stream, args=(client, request, 0, results),
+                         daemon=True).start()
+        launched = 1
+        try:
+            entries = [results.get(timeout=deadline)]
+        except queue.Empty:
+            hedge.record_hedge()
+            threading.Thread(target=_start_stream, args=(client, request, 1, results),
+                             daemon=True).start()
+            launched = 2
+            entries = [results.get()]
+
+    while entries[-1][5] is not None and len(entries) < launched:
+        entries.append(results.get())
+    tag, manager, stream, events, first, error = entries[-1]
+    if launched > len(entries):
+        threading.Thread(target=_close_streams, args=(results, launched - len(entries)),
+                         daemon=True).start()
+    if error is not None:
+        raise error
+
+    counters = {}
+    if hedge is not None:
+        hedge.record(kind, time.monotonic() - started)
+        if launched > 1:
+            counters["hedges"] = 1
+            counters["hedge_wins"] = tag
+    first_events = [first] if first is not None else []
+    return manager, stream, itertools.chain(first_events, events), counters
+
+
+def analyze_meeting_stream(parsed_report, cleaned_text, api_key, compact_report=False,
+                           routing_rules=None, hedge=None, local_fields=None):
+    """Stream the analysis, yielding each proposal as soon as the model closes it.
+
+    Same inputs as analyze_meeting(), except compact_output (proposals are
+    streamed in the standard structure). The response is consumed through the
+    Messages streaming API and the tool input JSON (input_json_delta events) is
+    parsed incrementally, so the document preview can fill in while the rest of
+    the JSON is still being generated. There is no retry: proposals already
+    yielded cannot be taken back. With hedge (see analyze_meeting), a slow time
+    to first event opens a second stream and the faster one is used.
+
+    Transcripts longer than MAX_TRANSCRIPT_CHARS are not truncated: they go
+    through analyze_meeting_chunked() and the merged proposals are yielded
+    once all chunks are done.
+
+    Yields dicts:
+        {"event": "item", "key": "point_updates" | "new_points" | "info_exchange"
+                  | "planning", "index": int, "item": dict}
+        {"event": "complete", "updates": dict}   # same structure as analyze_meeting()
+        {"event": "error", "error": str, "raw_response": str or None}
+    """
+    if len(cleaned_text) > MAX_TRANSCRIPT_CHARS:
+        yield from _stream_chunked(
+            parsed_report, cleaned_text, api_key, compact_report, routing_rules, hedge,
+            local_fields,
+        )
+        return
+
+    client = _transport.client() if _transport else anthropic.Anthropic(api_key=api_key)
+    route = None
+    if routing_rules:
+        route = plan_route(parsed_report, cleaned_text, routing_rules, compact_report)
+    request = _prepare_request(
+        parsed_report, cleaned_text, compact_report=compact_report, route=route,
+        local_fields=local_fields,
+    )
+    parser = IncrementalJSONParser()
+
+    if hedge is True:
+        hedge = DEFAULT_POLICY
+
+    started = time.monotonic()
+    first_item_seconds = None
+    try:
+        manager, stream, events, hedge_usage = _open_stream(client, request, hedge)
+        try:
+            for event in events:
+                if event.type != "content_block_delta":
+                    continue
+                if event.delta.type == "input_json_delta":
+                    chunk = event.delta.partial_json
+                elif event.delta.type == "text_delta":
+                    chunk = event.delta.text
+                else:
+                    continue
+                for key, index, item in parser.feed(chunk):
+                    if first_item_seconds is None:
+                        first_item_seconds = round(time.monotonic() - started, 2)
+                    yield {"event": "item", "key": key, "index": index, "item": item}
+            response = stream.get_final_message()
+        finally:
+            manager.__exit__(None, None, None)
+    except anthropic.APIError as e:
+        yield {"event": "error", "error": f"API error: {str(e)}",
+               "raw_response": parser.buffer or None}
+        return
+    except ValueError as e:  # malformed JSON in the stream (IncrementalJSONParser)
+        yield {"event": "error", "error": str(e), "raw_response": parser.buffer or None}
+        return
+    except Exception as e:  # e.g. LookupError from a ReplayTransport without fixture
+        yield {"event": "error", "error": f"Unexpected error: {str(e)}",
+               "raw_response": parser.buffer or None}
+        return
+
+    try:
+        updates, truncated = (parser.result(), False) if parser.done else _parse_response(parser.buffer)
+    except ValueError as e:
+        yield {"event": "error", "error": str(e), "raw_response": parser.buffer}
+        return
+
+    if local_fields:
+        apply_local_fields(updates, local_fields)
+    is_valid, errors = validate_updates(updates)
+    if truncated:
+        updates["truncated"] = True
+        errors.append(TRUNCATION_WARNING)
+        is_valid = False
+    updates["usage"] = {
+        "input_tokens": response.usage.input_tokens,
+        "output_tokens": response.usage.output_tokens,
+        "first_item_seconds": first_item_seconds,
+        "total_seconds": round(time.monotonic() - started, 2),
+        **hedge_usage,
     }
+    if local_fields:
+        updates["usage"]["local_fields"] = sorted(local_fields)
+    if compact_report:
+        updates["usage"]["report_encoding"] = compact_report_savings(parsed_report)
+    if route:
+        updates["usage"]["route"] = route
+    if not is_valid:
+        updates["validation_warnings"] = errors
+    apply_reference_check(updates, parsed_report)
+
+    yield {"event": "complete", "updates": updates}
+
+
+def _stream_chunked(parsed_report, cleaned_text, api_key, compact_report, routing_rules,
+                    hedge, local_fields):
+    """analyze_meeting_stream() events for a transcript analyzed in chunked mode."""
+    updates = analyze_meeting_chunked(
+        parsed_report, cleaned_text, api_key, compact_report=compact_report,
+        routing_rules=routing_rules, hedge=hedge, local_fields=local_fields,
+    )
+    if "error" in updates:
+        yield {"event": "error", "error": updates["error"],
+               "raw_response": updates.get("raw_response")}
+        return
+    for key in STREAMED_ARRAYS:
+        for index, item in enumerate(updates.get(key) or []):
+            yield {"event": "item", "key": key, "index": index, "item": item}
+    yield {"event": "complete", "updates": updates}
+
@@ -0,0 +1,563 @@
+"""
+Analyzer Service - Pooled async front-end to the Anthropic API for meeting analysis.
+
+One AnalyzerService per worker process holds a single AsyncAnthropic client (shared
+HTTP connection pool, no TLS handshake per analysis) and bounds the number of
+in-flight model calls with a semaphore. 429 (rate limited) and 529 (overloaded)
+responses put the whole service into a shared cool-down with adaptive exponential
+backoff, so concurrent analyses slow down together instead of hammering the API.
+
+The synchronous ai_analyzer.analyze_meeting() is a thin wrapper around this service.
+"""
+
+import asyncio
+import functools
+import random
+import time
+
+import anthropic
+
+try:
+    from .ai_analyzer import (
+        MAX_TRANSCRIPT_CHARS, CHUNK_TOKEN_BUDGET, SECTION_SHARD_TOKENS, _prepare_request,
+        MAX_CONTINUATIONS, TRUNCATION_WARNING, _prepare_feedback_request,
+        _prepare_repair_request,
+        _continuation_request, _escalated_request, _parse_response, _response_json,
+        _response_text, _tool_input, apply_local_fields, apply_repairs,
+        compact_report_savings, plan_route, validate_updates, split_transcript_chunks,
+        merge_chunk_updates, _is_template_report, shard_report, shard_sections,
+        expected_latency,
+    )
+    from .compact_output import compact_output_savings, expand_updates
+    from .hedging import DEFAULT_POLICY, request_kind
+    from .proposal_patch import apply_patch, validate_patch
+    from .report_validator import apply_reference_check
+    from .transcript_compactor import compact_transcript
+except ImportError:  # imported as a flat module from src/
+    from ai_analyzer import (
+        MAX_TRANSCRIPT_CHARS, CHUNK_TOKEN_BUDGET, SECTION_SHARD_TOKENS, _prepare_request,
+        MAX_CONTINUATIONS, TRUNCATION_WARNING, _prepare_feedback_request,
+        _prepare_repair_request,
+        _continuation_request, _escalated_request, _parse_response, _response_json,
+        _response_text, _tool_input, apply_local_fields, apply_repairs,
+        compact_report_savings, plan_route, validate_updates, split_transcript_chunks,
+        merge_chunk_updates, _is_template_report, shard_report, shard_sections,
+        expected_latency,
+    )
+    from compact_output import compact_output_savings, expand_updates
+    from hedging import DEFAULT_POLICY, request_kind
+    from proposal_patch import apply_patch, validate_patch
+    from report_validator import apply_reference_check
+    from transcript_compactor import compact_transcript
+
+
+DEFAULT_MAX_CONCURRENCY = 4
+RATE_LIMIT_STATUSES = (429, 529)
+MAX_RATE_LIMIT_RETRIES = 5
+BACKOFF_INITIAL = 1.0    # seconds, first cool-down after a 429/529
+BACKOFF_MAX = 60.0       # seconds, cap for the adaptive cool-down
+
+
+class AnalyzerService:
+    """Shared async client with bounded concurrency and rate-limit backoff.
+
+    Usage:
+        async with AnalyzerService(api_key) as service:
+            updates = await service.analyze(parsed_report, cleaned_text)
+    """
+
+    def __init__(self, api_key, max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 client=None, hedge=None):
+        # SDK retries are disabled: backoff is coordinated across requests here
+        self.client = client or anthropic.AsyncAnthropic(api_key=api_key, max_retries=0)
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._backoff = 0.0
+        self._cooldown_until = 0.0
+        # Opt-in request hedging: True uses the process-wide hedging.DEFAULT_POLICY
+        self.hedge = DEFAULT_POLICY if hedge is True else hedge or None
+        self.stats = {
+            "requests": 0,
+            "rate_limited": 0,
+            "overloaded": 0,
+            "in_flight": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+        }
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """Close the underlying HTTP connection pool."""
+        await self.client.close()
+
+    async def analyze(self, parsed_report, cleaned_text, compact_report=False,
+                      transcript_budget=None, routing_rules=None, local_fields=None,
+                      compact_output=False):
+        """Analyze a meeting transcript against the previous report.
+
+        Same contract as ai_analyzer.analyze_meeting(): when transcript_budget
+        is given the transcript is first compacted to that many tokens; what is
+        still longer than MAX_TRANSCRIPT_CHARS goes through chunked mode. With
+        routing_rules, model and max_tokens are chosen per request by plan_route().
+        local_fields are filled in locally and left out of the model output;
+        compact_output selects the short-key response schema.
+        """
+        compaction = None
+        if transcript_budget:
+            cleaned_text, compaction = compact_transcript(
+                cleaned_text, parsed_report, transcript_budget
+            )
+
+        if len(cleaned_text) > MAX_TRANSCRIPT_CHARS:
+            updates = await self.analyze_chunked(
+                parsed_report, cleaned_text, compact_report=compact_report,
+                routing_rules=routing_rules, local_fields=local_fields,
+                compact_output=compact_output,
+            )
+        else:
+            updates = await self._run_routed(
+                parsed_report, cleaned_text, compact_report, routing_rules,
+                local_fields=local_fields, compact_output=compact_output,
+            )
+            updates = self._finalize(updates, parsed_report, compact_report)
+
+        if compaction and "usage" in updates:
+            updates["usage"]["transcript_compaction"] = compaction
+        return updates
+
+    async def analyze_chunked(self, parsed_report, cleaned_text,
+                              max_chunk_tokens=CHUNK_TOKEN_BUDGET, compact_report=False,
+                              routing_rules=None, local_fields=None, compact_output=False):
+        """Analyze a long transcript as concurrent chunks and merge the results.
+
+        See ai_analyzer.analyze_meeting_chunked() for the merge semantics.
+        """
+        chunks = split_transcript_chunks(cleaned_text, max_chunk_tokens)
+        if len(chunks) == 1:
+            updates = await self._run_routed(
+                parsed_report, chunks[0], compact_report, routing_rules,
+                local_fields=local_fields, compact_output=compact_output,
+            )
+            return self._finalize(updates, parsed_report, compact_report)
+
+        results = await asyncio.gather(*(
+            self._run_routed(
+                parsed_report, chunk, compact_report, routing_rules, part=(i, len(chunks)),
+                local_fields=local_fields, compact_output=compact_output,
+            )
+            for i, chunk in enumerate(chunks)
+        ))
+
+        succeeded = [r for r in results if "error" not in r]
+        if not succeeded:
+            return results[0]
+
+        updates = merge_chunk_updates(succeeded)
+        chunk_errors = [
+            f"part {i + 1}: {r['error']}" for i, r in enumerate(results) if "error" in r
+        ]
+        if chunk_errors:
+            updates["chunk_errors"] = chunk_errors
+        return self._finalize(updates, parsed_report, compact_report)
+
+    async def analyze_sharded(self, parsed_report, cleaned_text,
+                              max_shard_tokens=SECTION_SHARD_TOKENS, compact_report=False,
+                              routing_rules=None, local_fields=None, compact_output=False):
+        """Analyze the report per group of sections concurrently and merge the results.
+
+        See ai_analyzer.analyze_meeting_sharded().
+        """
+        shards = shard_sections(parsed_report, max_shard_tokens)
+        if (_is_template_report(parsed_report) or len(shards) < 2
+                or len(cleaned_text) > MAX_TRANSCRIPT_CHARS):
+            return await self.analyze(
+                parsed_report, cleaned_text, compact_report, routing_rules=routing_rules,
+                local_fields=local_fields, compact_output=compact_output,
+            )
+
+        shards = ["global"] + shards
+        results = await asyncio.gather(*(
+            self._run_routed(
+                shard_report(parsed_report, shard), cleaned_text, compact_report,
+                routing_rules, shard=shard, local_fields=local_fields,
+                compact_output=compact_output,
+            )
+            for shard in shards
+        ))
+
+        succeeded = [r for r in results if "error" not in r]
+        if not succeeded:
+            return results[0]
+
+        # The global shard comes first, so its metadata wins the merge
+        updates = merge_chunk_updates(succeeded)
+        updates["usage"]["shards"] = updates["usage"].pop("chunks")
+        shard_errors = [
+            f"{'metadata' if shard == 'global' else ', '.join(shard)}: {r['error']}"
+            for shard, r in zip(shards, results) if "error" in r
+        ]
+        if shard_errors:
+            updates["shard_errors"] = shard_errors
+        return self._finalize(updates, parsed_report, compact_report)
+
+    async def analyze_feedback(self, parsed_report, cleaned_text, current_proposals,
+                               feedback, compact_report=False):
+        """Apply feedback to the current proposal through patch operations.
+
+        See ai_analyzer.analyze_feedback().
+        """
+        request = _prepare_feedback_request(
+            parsed_report, cleaned_text, current_proposals, feedback, compact_report
+        )
+
+        response_text = None
+        last_error = None
+        for attempt in range(2):
+            usage = {}
+            try:
+                response = await self.create_message(request, usage)
+                response_text = _response_text(response) or None
+                patch = _response_json(response)
+                if not isinstance(patch, dict):
+                    raise ValueError("Patch must be a dictionary")
+            except anthropic.APIError as e:
+                last_error = f"API error: {str(e)}"
+                continue
+            except ValueError as e:
+                last_error = str(e)
+                continue
+            except Exception as e:
+                last_error = f"Unexpected error: {str(e)}"
+                break
+
+            operations, patch_errors = validate_patch(
+                current_proposals, patch.get("operations", [])
+            )
+            updates = apply_patch(current_proposals, operations)
+            updates.pop("patch_warnings", None)  # from a previous feedback round
+            updates["patch"] = operations
+            updates["usage"] = {
+                "input_tokens": response.usage.input_tokens,
+                "output_tokens": response.usage.output_tokens,
+                **usage,
+            }
+            if patch_errors:
+                updates["patch_warnings"] = patch_errors
+
+            is_valid, errors = validate_updates(updates)
+            if is_valid:
+                updates.pop("validation_warnings", None)
+            else:
+                updates["validation_warnings"] = errors
+            updates.pop("reference_fixes", None)
+            return apply_reference_check(updates, parsed_report)
+
+        return {
+            "error": last_error,
+            "raw_response": response_text,
+        }
+
+    @staticmethod
+    def _finalize(updates, parsed_report, compact_report):
+        """Check references against the report and record the encoding savings.
+
+        Section names and point numbers are resolved and corrected by
+        report_validator.apply_reference_check().
+        """
+        apply_reference_check(updates, parsed_report)
+        if compact_report and "usage" in updates:
+            updates["usage"]["report_encoding"] = compact_report_savings(parsed_report)
+        return updates
+
+    async def _run_routed(self, parsed_report, cleaned_text, compact_report=False,
+                          routing_rules=None, part=None, shard=None, local_fields=None,
+                          compact_output=False):
+        """Prepare (and route, if rules are given) one analysis request and run it."""
+        route = None
+        if routing_rules:
+            route = plan_route(parsed_report, cleaned_text, routing_rules, compact_report)
+        updates = await self._run_analysis(_prepare_request(
+            parsed_report, cleaned_text, part=part, compact_report=compact_report,
+            route=route, shard=shard, local_fields=local_fields,
+            compact_output=compact_output,
+        ), local_fields, functools.partial(_expand, parsed_report) if compact_output else None)
+        if route and "usage" in updates:
+            updates["usage"]["route"] = route
+        return updates
+
+    async def _run_analysis(self, request, local_fields=None, decode=None):
+        """Send an analysis request and make sure the result validates.
+
+        The updates normally arrive as the input of the forced record_updates
+        tool call and are used without any text parsing. A tool call cut off at
+        max_tokens is re-sent with a larger max_tokens (see _complete_tool); a
+        plain-text answer cut off at max_tokens is continued from the cut-off
+        point (see _complete_text). If the output is still incomplete, every
+        complete element is kept and the result is flagged "truncated".
+        decode turns the model output into the updates structure (compact
+        output schema). Locally extracted fields are merged in before
+        validation. Validation errors are fixed with a targeted repair call
+        (see _repair).
+        The full request is only repeated when the response carries no usable
+        JSON at all, or on API errors.
+        """
+        response_text = None
+        last_error = None
+        for attempt in range(2):
+            try:
+                usage = {"input_tokens": 0, "output_tokens": 0}
+                response = await self.create_message(request, usage)
+                usage["input_tokens"] += response.usage.input_tokens
+                usage["output_tokens"] += response.usage.output_tokens
+
+                if _tool_input(response) is not None:
+                    updates, truncated = await self._complete_tool(request, response, usage)
+                else:
+                    response_text = await self._complete_text(request, response, usage)
+                    updates, truncated = _parse_response(response_text)
+                if not isinstance(updates, dict):
+                    raise ValueError("Updates must be a dictionary")
+
+                def prepare(output):
+                    if decode:
+                        output, usage["output_encoding"] = decode(output)
+                    if truncated:
+                        # Lists the model never reached are left empty (= unchanged)
+                        for key in ("point_updates", "new_points", "info_exchange",
+                                    "planning"):
+                            output.setdefault(key, [])
+                    if local_fields:
+                        apply_local_fields(output, local_fields, usage)
+                    return output
+
+                compact = updates if decode else None
+                updates = prepare(updates)
+                is_valid, errors = validate_updates(updates)
+                if not is_valid:
+                    errors = await self._repair(updates, errors, usage, compact, prepare)
+
+                updates["usage"] = usage
+                if truncated:
+                    updates["truncated"] = True
+                    errors.append(TRUNCATION_WARNING)
+                if errors:
+                    updates["validation_warnings"] = errors
+
+                return updates
+
+            except anthropic.APIError as e:
+                last_error = f"API error: {str(e)}"
+                if attempt == 0:
+                    continue
+            except ValueError as e:
+                last_error = str(e)
+                if attempt == 0:
+                    continue
+            except Exception as e:
+                last_error = f"Unexpected error: {str(e)}"
+                break
+
+        return {
+            "error": last_error,
+            "raw_response": response_text,
+        }
+
+    async def _complete_tool(self, request, response, usage):
+        """Return (tool input, truncated) for a forced tool call.
+
+        A tool call cannot be resumed from an assistant prefill, so a call cut
+        off at max_tokens is re-sent with a doubled max_tokens (up to
+        MAX_CONTINUATIONS times, within the model's output limit).
+        """
+        escalations = 0
+        while response.stop_reason == "max_tokens" and escalations < MAX_CONTINUATIONS:
+            request = _escalated_request(request)
+            if request is None:
+                break
+            response = await self.create_message(request, usage)
+            usage["input_tokens"] += response.usage.input_tokens
+            usage["output_tokens"] += response.usage.output_tokens
+            escalations += 1
+        if escalations:
+            usage["max_tokens_escalations"] = escalations
+
+        updates = _tool_input(response)
+        if updates is None:
+            raise ValueError("Response contains no record_updates tool call")
+        return updates, response.stop_reason == "max_tokens"
+
+    async def _complete_text(self, request, response, usage):
+        """Return the full text of a plain-text answer, continuing it at max_tokens."""
+        response_text = _response_text(response)
+        continuations = 0
+        while (response.stop_reason == "max_tokens"
+               and continuations < MAX_CONTINUATIONS):
+            response_text = response_text.rstrip()
+            response = await self.create_message(
+                _continuation_request(request, response_text), usage
+            )
+            response_text += _response_text(response)
+            usage["input_tokens"] += response.usage.input_tokens
+            usage["output_tokens"] += response.usage.output_tokens
+            continuations += 1
+        if continuations:
+            usage["continuations"] = continuations
+        return response_text
+
+    async def _repair(self, updates, errors, usage, compact=None, rebuild=None):
+        """Fix invalid fragments of updates in place with one small model call.
+
+        Only the invalid fragments, their validation errors and their schema are
+        sent. Repair tokens are added to usage. With compact output, the
+        fragments of the model's compact output are repaired against the
+        compact schema and updates is rebuilt from it with rebuild(compact).
+
+        Returns:
+            list[str]: validation errors remaining after the repair
+        """
+        request, paths = _prepare_repair_request(updates, errors, compact)
+        if request is None:
+            return errors
+
+        try:
+            response = await self.create_message(request, usage)
+            repaired = _response_json(response)
+        except (anthropic.APIError, ValueError):
+            return errors
+
+        usage["input_tokens"] += response.usage.input_tokens
+        usage["output_tokens"] += response.usage.output_tokens
+        usage["repair_calls"] = usage.get("repair_calls", 0) + 1
+
+        if isinstance(repaired, dict):
+            if compact is None:
+                apply_repairs(updates, repaired, paths)
+            else:
+                apply_repairs(compact, repaired, paths)
+                updates.clear()
+                updates.update(rebuild(compact))
+        return validate_updates(updates)[1]
+
+    async def create_message(self, request, usage=None):
+        """Call messages.create, hedging slow calls when a hedge policy is set.
+
+        With hedging, a second identical request is sent when the first has not
+        completed by the policy deadline (a latency percentile for this kind of
+        call); the first successful response wins and the other request is
+        cancelled. Hedges and hedge wins are counted in usage (when given) and in
+        stats. Tokens of a cancelled request are not reported by the API.
+
+        Raises:
+            anthropic.APIError: see _create_message()
+        """
+        if self.hedge is None:
+            return await self._create_message(request)
+
+        kind = request_kind(request)
+        deadline = self.hedge.deadline(kind, expected_latency(request))
+        started = time.monotonic()
+        primary = asyncio.create_task(self._create_message(request))
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=deadline)
+            if not done:
+                self.hedge.record_hedge()
+                self.stats["hedges"] += 1
+                if usage is not None:
+                    usage["hedges"] = usage.get("hedges", 0) + 1
+                tasks.add(asyncio.create_task(self._create_message(request)))
+
+            winner = await self._first_success(tasks)
+            if winner is not primary:
+                self.stats["hedge_wins"] += 1
+                if usage is not None:
+                    usage["hedge_wins"] = usage.get("hedge_wins", 0) + 1
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+        self.hedge.record(kind, time.monotonic() - started)
+        return winner.result()
+
+    @staticmethod
+    async def _first_success(tasks):
+        """Wait for the first task that succeeds; raise the first error if all fail."""
+        pending = set(tasks)
+        error = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task
+                error = error or task.exception()
+        raise error
+
+    async def _create_message(self, request):
+        """Call messages.create within the concurrency limit, backing off on 429/529.
+
+        Raises:
+            anthropic.APIError: when the call fails for another reason, or is
+                still rate limited after MAX_RATE_LIMIT_RETRIES retries.
+        """
+        for retry in range(MAX_RATE_LIMIT_RETRIES + 1):
+            await self._wait_for_cooldown()
+            async with self._semaphore:
+                self.stats["requests"] += 1
+                self.stats["in_flight"] += 1
+                try:
+                    response = await self.client.messages.create(**request)
+                except anthropic.APIStatusError as e:
+                    if e.status_code not in RATE_LIMIT_STATUSES or retry == MAX_RATE_LIMIT_RETRIES:
+                        raise
+                    self._register_rate_limit(e)
+                    continue
+                finally:
+                    self.stats["in_flight"] -= 1
+
+            self._register_success()
+            return response
+
+    async def _wait_for_cooldown(self):
+        delay = self._cooldown_until - time.monotonic()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            delay = self._cooldown_until - time.monotonic()
+
+    def _register_rate_limit(self, error):
+        """Grow the shared cool-down after a 429/529, honoring Retry-After."""
+        if error.status_code == 429:
+            self.stats["rate_limited"] += 1
+        else:
+            self.stats["overloaded"] += 1
+
+        self._backoff = min(BACKOFF_MAX, max(BACKOFF_INITIAL, self._backoff * 2))
+        delay = self._backoff * random.uniform(0.8, 1.2)  # jitter
+
+        retry_after = None
+        if error.response is not None:
+            retry_after = error.response.headers.get("retry-after")
+        if retry_after:
+            try:
+                delay = max(delay, float(retry_after))
+            except ValueError:
+                pass
+
+        self._cooldown_until = max(self._cooldown_until, time.monotonic() + delay)
+
+    def _register_success(self):
+        """Shrink the cool-down gradually once calls go through again."""
+        self._backoff /= 2
+        if self._backoff < BACKOFF_INITIAL / 4:
+            self._backoff = 0.0
+
+
+def _expand(parsed_report, compact):
+    """Expand compact model output; returns (updates, output token savings)."""
+    updates = expand_updates(compact, parsed_report)
+    return updates, compact_output_savings(compact, updates)
@@ -0,0 +1,349 @@
+"""
+Batch Analyzer - Offline analysis of many meetings through the Message Batches API.
+
+Reports prepared overnight do not need interactive latency. A batch takes many
+(parsed_report, cleaned_transcript) jobs, submits one analysis request per job (or
+per part, for transcripts longer than MAX_TRANSCRIPT_CHARS) in a single Message
+Batches call, and returns immediately. Batches are processed at a lower price and
+do not occupy request workers.
+
+The batch id and the mapping of request ids to jobs are persisted in a state file
+under the work directory, so results can be collected by a later process:
+
+    work_dir/batches/<batch_id>.json     # submitted batch, one per submit()
+    work_dir/results/<job_id>.updates.json
+
+Each updates file has the same structure as ai_analyzer.analyze_meeting() and can be
+passed to report_generator. Results are validated but not repaired: a batch job
+never makes follow-up calls, and remaining errors are listed in validation_warnings.
+Section and point references are checked like in AnalyzerService (see
+report_validator), against the section names and point numbers saved at submit time.
+
+Pass base_url to run against a local stub server instead of the Anthropic API.
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import anthropic
+
+try:
+    from .ai_analyzer import (
+        MAX_TRANSCRIPT_CHARS, CHUNK_TOKEN_BUDGET, TRUNCATION_WARNING, _prepare_request,
+        _response_json, compact_report_savings, merge_chunk_updates, plan_route,
+        split_transcript_chunks, validate_updates,
+    )
+    from .report_parser import parse_report
+    from .report_validator import apply_reference_check
+    from .transcript_cleaner import clean_transcript, format_clean_transcript
+    from .transcript_compactor import compact_transcript
+except ImportError:  # imported as a flat module from src/
+    from ai_analyzer import (
+        MAX_TRANSCRIPT_CHARS, CHUNK_TOKEN_BUDGET, TRUNCATION_WARNING, _prepare_request,
+        _response_json, compact_report_savings, merge_chunk_updates, plan_route,
+        split_transcript_chunks, validate_updates,
+    )
+    from report_parser import parse_report
+    from report_validator import apply_reference_check
+    from transcript_cleaner import clean_transcript, format_clean_transcript
+    from transcript_compactor import compact_transcript
+
+
+POLL_INTERVAL = 60.0    # seconds between status checks while waiting
+JOB_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,56}$")  # custom_id limit is 64 chars
+
+
+class BatchAnalyzer:
+    """Submit analysis jobs as a Message Batch and collect per-job updates files.
+
+    Usage:
+        batches = BatchAnalyzer(api_key, "overnight/")
+        batch_id = batches.submit([
+            {"job_id": "penta-13", "parsed_report": report, "cleaned_text": text},
+        ])
+        ...
+        paths = batches.collect(batch_id, wait=True)
+    """
+
+    def __init__(self, api_key, work_dir, base_url=None, client=None):
+        self.client = client or anthropic.Anthropic(api_key=api_key, base_url=base_url)
+        self.work_dir = Path(work_dir)
+        self.batch_dir = self.work_dir / "batches"
+        self.result_dir = self.work_dir / "results"
+
+    def submit(self, jobs, compact_report=False, transcript_budget=None,
+               routing_rules=None):
+        """Submit a batch of analysis jobs.
+
+        Args:
+            jobs: list of {"job_id": str, "parsed_report": dict, "cleaned_text": str};
+                  job ids must be unique and match JOB_ID_PATTERN
+            compact_report, transcript_budget, routing_rules: as in
+                  ai_analyzer.analyze_meeting(), applied to every job
+
+        Returns:
+            str: the batch id (its state file is written before returning)
+        """
+        requests = []
+        state = {"requests": {}, "jobs": {}}
+        for job in jobs:
+            job_id = job["job_id"]
+            if not JOB_ID_PATTERN.match(job_id):
+                raise ValueError(f"Invalid job id '{job_id}': use 1-56 letters, digits, '_' or '-'")
+            if job_id in state["jobs"]:
+                raise ValueError(f"Duplicate job id '{job_id}'")
+
+            parsed_report = job["parsed_report"]
+            cleaned_text = job["cleaned_text"]
+            job_state = {}
+            if transcript_budget:
+                cleaned_text, job_state["transcript_compaction"] = compact_transcript(
+                    cleaned_text, parsed_report, transcript_budget
+                )
+            if compact_report:
+                job_state["report_encoding"] = compact_report_savings(parsed_report)
+            job_state["report_references"] = _report_references(parsed_report)
+
+            parts = [cleaned_text]
+            if len(cleaned_text) > MAX_TRANSCRIPT_CHARS:
+                parts = split_transcript_chunks(cleaned_text, CHUNK_TOKEN_BUDGET)
+            job_state["parts"] = len(parts)
+            state["jobs"][job_id] = job_state
+
+            for i, text in enumerate(parts):
+                custom_id = f"{job_id}-p{i}"
+                route = None
+                if routing_rules:
+                    route = plan_route(parsed_report, text, routing_rules, compact_report)
+                requests.append({
+                    "custom_id": custom_id,
+                    "params": _prepare_request(
+                        parsed_report, text,
+                        part=(i, len(parts)) if len(parts) > 1 else None,
+                        compact_report=compact_report, route=route,
+                    ),
+                })
+                state["requests"][custom_id] = {"job_id": job_id, "part": i, "route": route}
+
+        if not requests:
+            raise ValueError("No jobs to submit")
+
+        batch = self.client.messages.batches.create(requests=requests)
+        state["batch_id"] = batch.id
+        state["submitted_at"] = datetime.now().isoformat(timespec="seconds")
+        state["collected_at"] = None
+        self._write_state(batch.id, state)
+        return batch.id
+
+    def pending(self):
+        """Return the ids of submitted batches whose results were not collected yet."""
+        if not self.batch_dir.exists():
+            return []
+        return sorted(
+            state["batch_id"]
+            for state in (self._read_state(path.stem) for path in self.batch_dir.glob("*.json"))
+            if not state.get("collected_at")
+        )
+
+    def status(self, batch_id):
+        """Return the processing status and request counts of a batch.
+
+        Returns:
+            dict: {"processing_status": str, "request_counts": dict}
+        """
+        batch = self.client.messages.batches.retrieve(batch_id)
+        counts = batch.request_counts
+        return {
+            "processing_status": batch.processing_status,
+            "request_counts": {
+                "processing": counts.processing,
+                "succeeded": counts.succeeded,
+                "errored": counts.errored,
+                "canceled": counts.canceled,
+                "expired": counts.expired,
+            },
+        }
+
+    def collect(self, batch_id, wait=False, poll_interval=POLL_INTERVAL, timeout=None):
+        """Write one updates file per job once the batch has ended.
+
+        Args:
+            wait: poll until the batch ends instead of returning None while it runs
+            timeout: maximum seconds to wait (None = no limit)
+
+        Returns:
+            dict: {job_id: Path of the updates file}, or None if the batch is
+                  still processing
+        """
+        state = self._read_state(batch_id)
+        started = time.monotonic()
+        while self.status(batch_id)["processing_status"] != "ended":
+            if not wait or (timeout is not None and time.monotonic() - started >= timeout):
+                return None
+            time.sleep(poll_interval)
+
+        results = {job_id: {} for job_id in state["jobs"]}
+        for entry in self.client.messages.batches.results(batch_id):
+            request = state["requests"].get(entry.custom_id)
+            if request is None:
+                continue
+            updates = _read_result(entry.result)
+            if request.get("route") and "usage" in updates:
+                updates["usage"]["route"] = request["route"]
+            results[request["job_id"]][request["part"]] = updates
+
+        self.result_dir.mkdir(parents=True, exist_ok=True)
+        paths = {}
+        for job_id, parts in results.items():
+            updates = _merge_job(state["jobs"][job_id], parts)
+            path = self.result_dir / f"{job_id}.updates.json"
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(updates, f, indent=2, ensure_ascii=False)
+            paths[job_id] = path
+
+        state["collected_at"] = datetime.now().isoformat(timespec="seconds")
+        self._write_state(batch_id, state)
+        return paths
+
+    def _state_path(self, batch_id):
+        return self.batch_dir / f"{batch_id}.json"
+
+    def _read_state(self, batch_id):
+        with open(self._state_path(batch_id), 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def _write_state(self, batch_id, state):
+        self.batch_dir.mkdir(parents=True, exist_ok=True)
+        with open(self._state_path(batch_id), 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2, ensure_ascii=False)
+
+
+def _read_result(result):
+    """Turn one batch result entry into an updates dict (or an error dict)."""
+    if result.type != "succeeded":
+        error = getattr(result, "error", None)
+        detail = getattr(getattr(error, "error", None), "message", None)
+        return {"error": f"Batch request {result.type}" + (f": {detail}" if detail else "")}
+
+    message = result.message
+    try:
+        updates = _response_json(message)
+    except ValueError as e:
+        return {"error": str(e)}
+    if not isinstance(updates, dict):
+        return {"error": "Updates must be a dictionary"}
+
+    truncated = message.stop_reason == "max_tokens"
+    if truncated:
+        for key in ("point_updates", "new_points", "info_exchange", "planning"):
+            updates.setdefault(key, [])
+
+    updates["usage"] = {
+        "input_tokens": message.usage.input_tokens,
+        "output_tokens": message.usage.output_tokens,
+    }
+    _, errors = validate_updates(updates)
+    if truncated:
+        updates["truncated"] = True
+        errors.append(TRUNCATION_WARNING)
+    if errors:
+        updates["validation_warnings"] = errors
+    return updates
+
+
+def _merge_job(job_state, parts):
+    """Combine the part results of one job into its final updates dict."""
+    results = [parts.get(i, {"error": "Missing from batch results"})
+               for i in range(job_state["parts"])]
+    succeeded = [r for r in results if "error" not in r]
+    if not succeeded:
+        return results[0]
+
+    if len(results) == 1:
+        updates = succeeded[0]
+    else:
+        updates = merge_chunk_updates(succeeded)
+        chunk_errors = [
+            f"part {i + 1}: {r['error']}" for i, r in enumerate(results) if "error" in r
+        ]
+        if chunk_errors:
+            updates["chunk_errors"] = chunk_errors
+
+    for key in ("report_encoding", "transcript_compaction"):
+        if key in job_state:
+            updates["usage"][key] = job_state[key]
+    if "report_references" in job_state:  # not in state files of older versions
+        apply_reference_check(updates, job_state["report_references"])
+    return updates
+
+
+def _report_references(parsed_report):
+    """Section names and point numbers of a report, as check_references() reads them."""
+    return {"sections": [
+        {"section_name": section["section_name"],
+         "points": [{"number": point.get("number")} for point in section.get("points", [])]}
+        for section in parsed_report.get("sections", [])
+    ]}
+
+
+def load_jobs(jobs_path):
+    """Read a jobs file and prepare the analysis inputs.
+
+    The jobs file is a JSON list of {"job_id", "report": <.docx path>,
+    "transcript": <.txt path>}; relative paths are resolved against the file.
+    """
+    jobs_path = Path(jobs_path)
+    with open(jobs_path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
+
+    jobs = []
+    for entry in entries:
+        report_path = jobs_path.parent / entry["report"]
+        transcript_path = jobs_path.parent / entry["transcript"]
+        transcript = clean_transcript(transcript_path.read_text(encoding='utf-8'))
+        jobs.append({
+            "job_id": entry["job_id"],
+            "parsed_report": parse_report(str(report_path)),
+            "cleaned_text": format_clean_transcript(transcript),
+        })
+    return jobs
+
+
+def main():
+    """CLI entry point."""
+    usage = ("Usage: python batch_analyzer.py submit <jobs.json> <work_dir>\n"
+             "       python batch_analyzer.py collect <work_dir> [--wait]")
+    if len(sys.argv) < 3 or sys.argv[1] not in ("submit", "collect"):
+        print(usage)
+        sys.exit(1)
+
+    api_key = os.environ.get("ANTHROPIC_API_KEY")
+    base_url = os.environ.get("ANTHROPIC_BASE_URL")
+
+    if sys.argv[1] == "submit":
+        if len(sys.argv) < 4:
+            print(usage)
+            sys.exit(1)
+        batches = BatchAnalyzer(api_key, sys.argv[3], base_url=base_url)
+        batch_id = batches.submit(load_jobs(sys.argv[2]))
+        print(f"Submitted batch: {batch_id}")
+        return
+
+    batches = BatchAnalyzer(api_key, sys.argv[2], base_url=base_url)
+    wait = "--wait" in sys.argv[3:]
+    for batch_id in batches.pending():
+        paths = batches.collect(batch_id, wait=wait)
+        if paths is None:
+            print(f"{batch_id}: still processing")
+            continue
+        for job_id, path in paths.items():
+            print(f"{batch_id}: {job_id} -> {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,233 @@
+"""
+Compact Output - Short-key response schema for the analysis call.
+
+Output tokens are the slowest and most expensive part of an analysis call, and
+the standard updates structure repeats long keys (subject_lines, for_whom,
+from_whom, due_date) and full section names on every element. In compact mode
+the model calls record_compact_updates instead of record_updates:
+
+- short keys ("l" for subject_lines, "w" for for_whom, ...)
+- sections referenced by their index in the report's sections list
+- info exchange rows and planning items kept unchanged referenced by their
+  index in the report, instead of being written out again
+
+expand_updates() turns that output back into the standard updates structure
+before validation, so validate_updates() and report_generator see no difference.
+"""
+
+import json
+import re
+
+try:
+    from .token_estimator import estimate_tokens
+except ImportError:  # imported as a flat module from src/
+    from token_estimator import estimate_tokens
+
+
+META_KEYS = {
+    "meeting_number": "n",
+    "date": "d",
+    "distribution_date": "dd",
+    "next_meeting": "nm",
+}
+POINT_KEYS = {
+    "section": "s",
+    "number": "no",
+    "title": "t",
+    "subject_lines": "l",
+    "for_whom": "w",
+    "due": "du",
+}
+LIST_KEYS = {
+    "point_updates": "pu",
+    "new_points": "np",
+    "info_exchange": "ie",
+    "planning": "pl",
+}
+INFO_EXCHANGE_FIELDS = ("from_whom", "status", "content", "due_date")
+
+NULLABLE_STRING = {"type": ["string", "null"]}
+LINES = {"type": "array", "items": {"type": "string"}}
+
+COMPACT_UPDATES_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "n": {"type": "integer"},
+        "d": NULLABLE_STRING,
+        "dd": NULLABLE_STRING,
+        "nm": NULLABLE_STRING,
+        "pu": {"type": "array", "items": {
+            "type": "object",
+            "properties": {
+                "s": {"type": "integer"}, "no": {"type": "string"}, "l": LINES,
+                "w": NULLABLE_STRING, "du": NULLABLE_STRING,
+            },
+            "required": ["s", "no", "l"],
+        }},
+        "np": {"type": "array", "items": {
+            "type": "object",
+            "properties": {
+                "s": {"type": "integer"}, "no": {"type": "string"},
+                "t": {"type": "string"}, "l": LINES,
+                "w": NULLABLE_STRING, "du": NULLABLE_STRING,
+            },
+            "required": ["s", "no", "t", "l", "w", "du"],
+        }},
+        "ie": {"type": "array", "items": {"anyOf": [
+            {"type": "integer"},
+            {"type": "array", "items": {"type": "string"}, "minItems": 4, "maxItems": 4},
+        ]}},
+        "pl": {"type": "array", "items": {"anyOf": [
+            {"type": "integer"},
+            {"type": "string"},
+        ]}},
+    },
+    "required": ["n", "pu", "np", "ie", "pl"],
+}
+
+COMPACT_UPDATES_TOOL = {
+    "name": "record_compact_updates",
+    "description": "Record the proposed updates for the next meeting report, in compact form.",
+    "input_schema": COMPACT_UPDATES_SCHEMA,
+}
+
+COMPACT_OUTPUT_NOTE = """
+
+## Compact Output
+To keep the output short, submit the result by calling the `record_compact_updates` \
+tool instead of `record_updates`, with these short keys:
+- `n`: meeting_number, `d`: date, `dd`: distribution_date, `nm`: next_meeting
+- `pu`: point_updates and `np`: new_points. Each point is \
+`{"s": <section index>, "no": number, "t": title (new points only), "l": subject_lines, \
+"w": for_whom, "du": due}`. The section index is the 0-based position of the section \
+in the report's sections list.
+- `ie`: info_exchange. An existing row kept unchanged is written as its 0-based index \
+in the report's info exchange list; a new or modified row as \
+`[from_whom, status, content, due_date]`.
+- `pl`: planning. An existing item kept unchanged is written as its 0-based index in \
+the report's planning list; a new or modified item as its text.
+"""
+
+
+def compact_field_names(fields):
+    """Short keys of the given top-level updates fields (unknown fields are skipped)."""
+    return [META_KEYS[f] for f in fields if f in META_KEYS]
+
+
+def compact_path(path):
+    """Path of a fragment of the updates ("point_updates[2]") in the compact output ("pu[2]")."""
+    key, _, rest = path.partition("[")
+    short = LIST_KEYS.get(key) or META_KEYS.get(key, key)
+    return short + ("[" + rest if rest else "")
+
+
+def compact_error(error):
+    """Restate a validate_updates() error in terms of the compact output keys."""
+    match = re.match(r"^(\w+)(\[\d+\])?(.*)$", error)
+    key, index, rest = match.groups()
+    if key == "Missing":
+        return re.sub(r"\w+$", lambda m: compact_path(m.group(0)), error)
+    if key not in LIST_KEYS or not index:
+        return compact_path(key) + (index or "") + rest
+    path = LIST_KEYS[key] + index
+    if key == "info_exchange":
+        return (f"{path} must be the index of a row of the report's info exchange or a "
+                "[from_whom, status, content, due_date] row")
+    if key == "planning":
+        return f"{path} must be the index of a report planning item or the item text"
+    field = re.match(r"^ missing '(\w+)'$", rest)
+    if field and field.group(1) == "section":
+        return f"{path} 's' must be the 0-based index of a section of the report"
+    if field:
+        return f"{path} missing '{POINT_KEYS.get(field.group(1), field.group(1))}'"
+    field = re.match(r"^\.(\w+)(.*)$", rest)
+    if field:
+        return f"{path}.{POINT_KEYS.get(field.group(1), field.group(1))}{field.group(2)}"
+    return path + rest
+
+
+def _existing(items, index):
+    if isinstance(index, int) and not isinstance(index, bool) and 0 <= index < len(items):
+        return items[index]
+    return None
+
+
+def _expand_point(point, section_names):
+    """Rename the keys of one compact point and resolve its section index.
+
+    Keys the model left out stay absent, so validate_updates() reports them.
+    """
+    if not isinstance(point, dict):
+        return point
+    expanded = {
+        full: point[short] for full, short in POINT_KEYS.items() if short in point
+    }
+    section = expanded.get("section")
+    if isinstance(section, int) and not isinstance(section, bool):
+        if 0 <= section < len(section_names):
+            expanded["section"] = section_names[section]
+        else:
+            del expanded["section"]
+    return expanded
+
+
+def expand_updates(compact, parsed_report):
+    """Expand record_compact_updates output into the standard updates structure.
+
+    Args:
+        compact: tool input following COMPACT_UPDATES_SCHEMA
+        parsed_report: the report sent with the request (indexes refer to it)
+
+    Returns:
+        dict: updates as returned by ai_analyzer.analyze_meeting(); lists the
+              model did not output (truncated response) are left out
+    """
+    section_names = [s["section_name"] for s in parsed_report.get("sections", [])]
+    info_exchange = parsed_report.get("info_exchange", [])
+    planning = parsed_report.get("planning", [])
+
+    updates = {full: compact[short] for full, short in META_KEYS.items() if short in compact}
+    for full in ("point_updates", "new_points"):
+        short = LIST_KEYS[full]
+        if short in compact:
+            updates[full] = [_expand_point(p, section_names) for p in compact[short]]
+
+    if "ie" in compact:
+        updates["info_exchange"] = []
+        for item in compact["ie"]:
+            existing = _existing(info_exchange, item)
+            if existing is not None:
+                item = [existing.get(f, "") for f in INFO_EXCHANGE_FIELDS]
+            if isinstance(item, list):
+                # An unknown index or a short row is left incomplete for validation
+                item = dict(zip(INFO_EXCHANGE_FIELDS, item))
+            updates["info_exchange"].append(item if isinstance(item, dict) else {})
+
+    if "pl" in compact:
+        updates["planning"] = []
+        for item in compact["pl"]:
+            existing = _existing(planning, item)
+            if existing is not None:
+                updates["planning"].append({"content": existing["content"], "is_new": False})
+            elif isinstance(item, str):
+                updates["planning"].append({"content": item, "is_new": True})
+            else:
+                updates["planning"].append({})
+    return updates
+
+
+def compact_output_savings(compact, updates):
+    """Estimate the output tokens saved by the compact schema for one response.
+
+    Returns:
+        dict: {"full_tokens", "compact_tokens", "saved_tokens"}
+    """
+    full_tokens = estimate_tokens(json.dumps(
+        {k: v for k, v in updates.items() if k != "usage"}, ensure_ascii=False
+    ))
+    compact_tokens = estimate_tokens(json.dumps(compact, ensure_ascii=False))
+    return {
+        "full_tokens": full_tokens,
+        "compact_tokens": compact_tokens,
+        "saved_tokens": full_tokens - compact_tokens,
+    }
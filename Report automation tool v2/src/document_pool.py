@@ -0,0 +1,110 @@
+"""
+Document Pool - Warm in-memory copies of the reports generation starts from.
+
+copy_report() copies the previous report, unzips it and parses every XML part on
+each generation. During review the same previous report is regenerated after
+every round of feedback, and batch runs generate many reports from the same
+template. The pool keeps each input package loaded, keyed by the SHA-256 of the
+file content, and hands out documents that own a deep copy of the main document
+part only: styles, numbering, headers, footers, images and the other parts are
+shared with the pooled package, since the generator only edits the body.
+
+Pooled packages are evicted least recently used first once their total
+footprint (approximated by the uncompressed size of their parts) exceeds
+max_bytes.
+
+Usage:
+    generate_report(previous_path, output_path, updates, pool=True)
+"""
+
+import copy
+import hashlib
+import io
+import threading
+import zipfile
+from collections import OrderedDict
+
+from docx import Document
+from docx.opc.constants import RELATIONSHIP_TYPE as RT
+from docx.package import Package
+
+
+DEFAULT_POOL_BYTES = 256 * 1024 * 1024
+
+
+class DocumentPool:
+    """LRU pool of parsed .docx packages, bounded by memory footprint.
+
+    Thread-safe: documents handed out are independent of each other, so
+    concurrent generations from the same input are fine.
+    """
+
+    def __init__(self, max_bytes=DEFAULT_POOL_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # content hash -> (Document, footprint)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def document(self, path):
+        """Return an editable Document with the content of the .docx at path."""
+        with open(path, 'rb') as f:
+            data = f.read()
+        key = hashlib.sha256(data).hexdigest()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+        if entry is None:
+            entry = (Document(io.BytesIO(data)), _footprint(data))
+            with self._lock:
+                self.stats["misses"] += 1
+                if key not in self._entries:
+                    self._entries[key] = entry
+                    self._bytes += entry[1]
+                    self._evict()
+        return _clone(entry[0])
+
+    @property
+    def size_bytes(self):
+        return self._bytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _evict(self):
+        # The most recent entry is kept even when it exceeds max_bytes on its own
+        while self._bytes > self.max_bytes and len(self._entries) > 1:
+            _, (_, footprint) = self._entries.popitem(last=False)
+            self._bytes -= footprint
+            self.stats["evictions"] += 1
+
+
+def _footprint(data):
+    """Uncompressed size of the package parts, a proxy for the memory they take."""
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        return sum(info.file_size for info in z.infolist())
+
+
+def _clone(template):
+    """New Document sharing every part of template except the main document part."""
+    source_package = template.part.package
+    source_part = template.part
+    package = Package()
+    part = type(source_part)(
+        source_part.partname, source_part.content_type,
+        copy.deepcopy(source_part.element), package,
+    )
+    for rel in source_part.rels.values():
+        part.load_rel(rel.reltype, rel._target, rel.rId, rel.is_external)
+    for rel in source_package.rels.values():
+        target = part if rel.reltype == RT.OFFICE_DOCUMENT else rel._target
+        package.load_rel(rel.reltype, target, rel.rId, rel.is_external)
+    return part.document
+
+
+DEFAULT_POOL = DocumentPool()
@@ -0,0 +1,161 @@
+"""
+Docx Package - Save a generated report by patching the source archive.
+
+Document.save() re-serializes and recompresses every part of the package, media
+included, although the generator only edits the main document part. save_patched()
+writes a new archive in the order of the source archive where:
+
+- the modified parts (by default only word/document.xml) and their .rels are
+  serialized and compressed fresh
+- every other entry is streamed byte-for-byte from the source archive, compressed
+  data included, without being decompressed
+
+When the package no longer matches the source archive (a part was added, e.g. an
+image), it falls back to Document.save().
+"""
+
+import io
+import struct
+import zipfile
+import zlib
+
+from docx.opc.packuri import PackURI
+
+
+COMPRESSION_LEVEL = 6   # zlib default, as used by zipfile / Document.save()
+
+LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+CENTRAL_HEADER = struct.Struct("<4sHHHHHHIIIHHHHHII")
+END_OF_CENTRAL_DIR = struct.Struct("<4sHHHHIIH")
+ZIP64_LIMIT = 0xFFFFFFFF
+DATA_DESCRIPTOR_FLAG = 0x08
+UTF8_FLAG = 0x800
+
+
+class _Entry:
+    """One archive member: header fields plus its (compressed) data."""
+
+    def __init__(self, name, method, flags, dos_time, dos_date, crc, file_size, data,
+                 external_attr=0, version=20):
+        self.name = name
+        self.method = method
+        self.flags = flags & ~DATA_DESCRIPTOR_FLAG  # sizes are always in the header
+        self.dos_time = dos_time
+        self.dos_date = dos_date
+        self.crc = crc
+        self.file_size = file_size
+        self.data = data
+        self.external_attr = external_attr
+        self.version = version
+
+    @classmethod
+    def copied(cls, info, source):
+        """Entry with the raw compressed data of a source archive member."""
+        source.seek(info.header_offset)
+        header = LOCAL_HEADER.unpack(source.read(LOCAL_HEADER.size))
+        source.seek(header[9] + header[10], io.SEEK_CUR)  # file name + extra field
+        data = source.read(info.compress_size)
+        dos_date, dos_time = _dos_datetime(info.date_time)
+        return cls(info.filename, info.compress_type, info.flag_bits, dos_time, dos_date,
+                   info.CRC, info.file_size, data, info.external_attr,
+                   max(info.extract_version, 20))
+
+    @classmethod
+    def compressed(cls, name, blob, info=None):
+        """Entry for freshly serialized content, deflated."""
+        compressor = zlib.compressobj(COMPRESSION_LEVEL, zlib.DEFLATED, -15)
+        data = compressor.compress(blob) + compressor.flush()
+        date_time = info.date_time if info else (1980, 1, 1, 0, 0, 0)
+        dos_date, dos_time = _dos_datetime(date_time)
+        return cls(name, zipfile.ZIP_DEFLATED, 0, dos_time, dos_date,
+                   zlib.crc32(blob), len(blob), data,
+                   info.external_attr if info else 0)
+
+    def encoded_name(self):
+        try:
+            return self.name.encode("ascii"), self.flags & ~UTF8_FLAG
+        except UnicodeEncodeError:
+            return self.name.encode("utf-8"), self.flags | UTF8_FLAG
+
+
+def _dos_datetime(date_time):
+    year, month, day, hour, minute, second = date_time
+    return ((max(year, 1980) - 1980) << 9 | month << 5 | day,
+            hour << 11 | minute << 5 | second // 2)
+
+
+def _write_archive(entries, out):
+    """Write entries as a zip archive (no zip64: docx parts are far below 4 GB)."""
+    central = []
+    for entry in entries:
+        name, flags = entry.encoded_name()
+        offset = out.tell()
+        out.write(LOCAL_HEADER.pack(
+            b"PK\x03\x04", entry.version, flags, entry.method, entry.dos_time,
+            entry.dos_date, entry.crc, len(entry.data), entry.file_size, len(name), 0,
+        ))
+        out.write(name)
+        out.write(entry.data)
+        central.append(CENTRAL_HEADER.pack(
+            b"PK\x01\x02", entry.version, entry.version, flags, entry.method,
+            entry.dos_time, entry.dos_date, entry.crc, len(entry.data), entry.file_size,
+            len(name), 0, 0, 0, 0, entry.external_attr, offset,
+        ) + name)
+
+    directory_offset = out.tell()
+    for record in central:
+        out.write(record)
+    out.write(END_OF_CENTRAL_DIR.pack(
+        b"PK\x05\x06", 0, 0, len(central), len(central),
+        out.tell() - directory_offset, directory_offset, 0,
+    ))
+
+
+def _rels_name(partname):
+    return PackURI(partname).rels_uri[1:]
+
+
+def save_patched(doc, source_path, output_path, modified=None):
+    """Save doc, copying every unmodified entry of the source archive as is.
+
+    Args:
+        doc: Document loaded from source_path (or from a pool copy of it)
+        source_path: the .docx the document was loaded from
+        output_path: where to write the result (may be source_path)
+        modified: parts to serialize fresh (default: the main document part)
+
+    Returns:
+        bool: True if the archive was patched, False if it fell back to
+              Document.save() because the package structure changed
+    """
+    package = doc.part.package
+    modified = modified or [doc.part]
+    fresh = {}
+    for part in modified:
+        name = part.partname[1:]
+        fresh[name] = part.blob
+        if part.rels:
+            fresh[_rels_name(part.partname)] = part.rels.xml
+
+    with open(source_path, 'rb') as source:
+        with zipfile.ZipFile(source) as archive:
+            infos = archive.infolist()
+            names = {info.filename for info in infos}
+            partnames = {part.partname[1:] for part in package.iter_parts()}
+            if (not partnames <= names or not set(fresh) <= names
+                    or any(info.file_size > ZIP64_LIMIT or info.compress_size > ZIP64_LIMIT
+                           for info in infos)):
+                doc.save(output_path)
+                return False
+
+            entries = [
+                _Entry.compressed(info.filename, fresh[info.filename], info)
+                if info.filename in fresh else _Entry.copied(info, source)
+                for info in infos
+            ]
+
+    buffer = io.BytesIO()
+    _write_archive(entries, buffer)
+    with open(output_path, 'wb') as f:
+        f.write(buffer.getvalue())
+    return True
@@ -0,0 +1,93 @@
+"""
+Hedging - Percentile-based deadlines for hedged model requests.
+
+A hedged call sends a second, identical request when the first one has not
+completed (or, when streaming, not produced its first event) by a deadline taken
+from recent latencies: by default the 95th percentile of the last 200 successful
+calls of the same kind. Whichever request succeeds first wins and the other is
+cancelled. The share of hedged calls is capped, so a general slowdown of the API
+does not double the spend.
+
+One HedgePolicy is shared by every AnalyzerService and streaming call of the
+process (DEFAULT_POLICY) unless a dedicated one is passed. Until a kind of call
+has HEDGE_MIN_SAMPLES latencies, DEFAULT_POLICY hedges at the caller's expected
+duration of that kind of call plus HEDGE_WARM_UP_MARGIN: a few seconds for the
+first event of a stream, the time to write max_tokens for a full completion. So
+only calls that are clearly stuck are hedged during warm-up.
+"""
+
+import math
+import threading
+from collections import deque
+
+
+HEDGE_PERCENTILE = 95
+HEDGE_MAX_RATE = 0.1      # at most 10% of calls get a second request
+HEDGE_MIN_SAMPLES = 20    # latencies needed before a percentile is trusted
+HEDGE_HISTORY = 200       # latencies kept per kind of call
+HEDGE_WARM_UP_MARGIN = 10.0     # seconds over the expected duration, during warm-up
+
+
+class HedgePolicy:
+    """Latency history and hedge budget for hedged requests.
+
+    The policy is shared by the service event loop and the streaming threads,
+    so its history and counters are only touched under a lock.
+
+    Args:
+        warm_up_margin: seconds added to the expected duration of a call while
+                        fewer than min_samples latencies were recorded for its
+                        kind (None = no hedging until enough history exists)
+    """
+
+    def __init__(self, percentile=HEDGE_PERCENTILE, max_rate=HEDGE_MAX_RATE,
+                 min_samples=HEDGE_MIN_SAMPLES, history=HEDGE_HISTORY,
+                 warm_up_margin=None):
+        self.percentile = percentile
+        self.max_rate = max_rate
+        self.min_samples = min_samples
+        self.history = history
+        self.warm_up_margin = warm_up_margin
+        self.latencies = {}
+        self.calls = 0
+        self.hedges = 0
+        self._lock = threading.Lock()
+
+    def deadline(self, key, expected=None):
+        """Seconds to wait before hedging a call of this kind, or None to not hedge.
+
+        Counts the call towards the hedge rate.
+
+        Args:
+            expected: seconds a normal call of this kind takes, used during warm-up
+        """
+        with self._lock:
+            self.calls += 1
+            if self.hedges >= self.max_rate * self.calls:
+                return None
+            samples = self.latencies.get(key)
+            if not samples or len(samples) < self.min_samples:
+                if self.warm_up_margin is None or expected is None:
+                    return None
+                return expected + self.warm_up_margin
+            ordered = sorted(samples)
+        index = max(0, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return ordered[index]
+
+    def record(self, key, seconds):
+        """Record the latency of a successful call."""
+        with self._lock:
+            self.latencies.setdefault(key, deque(maxlen=self.history)).append(seconds)
+
+    def record_hedge(self):
+        with self._lock:
+            self.hedges += 1
+
+
+DEFAULT_POLICY = HedgePolicy(warm_up_margin=HEDGE_WARM_UP_MARGIN)
+
+
+def request_kind(request):
+    """Key grouping comparable calls: model and forced tool (analysis, repair, patch)."""
+    tool = request.get("tool_choice", {}).get("name")
+    return request.get("model"), tool
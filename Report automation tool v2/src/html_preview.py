@@ -0,0 +1,329 @@
+"""
+HTML Preview - Render the next report from the parsed report plus the updates.
+
+The review step shows what generate_report() will produce after every edit or
+accept/reject toggle. Generating the .docx for that is far too slow to run on
+each change; this module renders the same content as HTML instead, following
+the generator's rules:
+
+- all previous content in normal weight (it is demoted by the generator)
+- point updates appended below the existing text, in bold, after a
+  "Meeting <date>" line; for whom / due aligned with the last subject line
+- new points added as bold rows at the end of their section
+- info exchange and planning replaced when the updates provide them
+
+PreviewRenderer keeps the rendered HTML of each block (header, each section,
+info exchange, planning) with a key of the updates it depends on, and
+re-renders only the blocks whose key changed.
+
+Usage:
+    renderer = PreviewRenderer(parsed_report)
+    html = renderer.render(updates)        # first render: every block
+    html = renderer.render(edited_updates) # only the changed blocks
+    renderer.changed                       # ids of the re-rendered blocks
+"""
+
+import json
+from html import escape
+
+try:
+    from .report_generator import next_meeting_line
+except ImportError:  # imported as a flat module from src/
+    from report_generator import next_meeting_line
+
+
+LABELS = {
+    "EN": {
+        "minutes": "Minutes of meeting n°", "date": "Date",
+        "distribution": "Distribution date", "next_meeting": "Next meeting",
+        "number": "N°", "title": "Title", "subject": "Subject",
+        "for_whom": "For whom", "due": "Due",
+        "info_exchange": "Information exchange", "from_whom": "From whom",
+        "status": "Status", "content": "Content", "due_date": "Due date",
+        "planning": "Planning",
+    },
+    "FR": {
+        "minutes": "Procès-verbal de réunion n°", "date": "Date",
+        "distribution": "Date de diffusion", "next_meeting": "Prochaine réunion",
+        "number": "N°", "title": "Titre", "subject": "Sujet",
+        "for_whom": "Pour qui", "due": "Pour quand",
+        "info_exchange": "Échange d'informations", "from_whom": "De qui",
+        "status": "Statut", "content": "Contenu", "due_date": "Pour quand",
+        "planning": "Planning",
+    },
+}
+
+INFO_EXCHANGE_FIELDS = ("from_whom", "status", "content", "due_date")
+
+PREVIEW_CSS = """
+.report-preview { font-family: Calibri, Arial, sans-serif; font-size: 10pt; max-width: 800px; }
+.report-preview table { border-collapse: collapse; width: 100%; margin: 12px 0; }
+.report-preview th, .report-preview td { border: 1px solid #999; padding: 2px 4px; vertical-align: top; }
+.report-preview th { background: #d9e2f3; text-align: left; }
+.report-preview td p { margin: 0; min-height: 1em; }
+.report-preview .new { background: #fff7d6; }
+.report-preview tr.new-point td { border-left: 3px solid #e0a800; }
+"""
+
+
+def _p(text, new=False):
+    """One paragraph; new content is bold and marked with the "new" class."""
+    if new:
+        return f'<p class="new"><b>{escape(text or "")}</b></p>'
+    return f'<p>{escape(text or "")}</p>'
+
+
+def _cell(paragraphs):
+    return '<td>' + ''.join(paragraphs) + '</td>'
+
+
+def _key(*parts):
+    return json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str)
+
+
+class PreviewRenderer:
+    """HTML preview of the next report for one parsed report.
+
+    Blocks are rendered independently and cached by the part of the updates
+    they depend on, so a new render() after an edit only re-renders the
+    blocks the edit touched. The rows of points without updates are rendered
+    once and reused.
+
+    Args:
+        parsed_report: dict from report_parser.parse_report()
+    """
+
+    def __init__(self, parsed_report):
+        self.report = parsed_report
+        self.labels = LABELS.get(parsed_report.get("language"), LABELS["EN"])
+        self.sections = parsed_report.get("sections", [])
+        self._blocks = {}       # block id -> (key, html)
+        self._rows = {}         # (section index, point index) -> html of the unchanged row
+        self.changed = []
+        self.stats = {"rendered": 0, "reused": 0}
+
+    def render(self, updates, standalone=False):
+        """Render the preview of the report after updates.
+
+        Args:
+            updates: dict from ai_analyzer.analyze_meeting() (as edited in review)
+            standalone: return a complete HTML page with PREVIEW_CSS
+
+        Returns:
+            str: HTML of the report (a <div class="report-preview">)
+        """
+        body = ''.join(html for _, html in self.render_blocks(updates))
+        html = f'<div class="report-preview">{body}</div>'
+        if standalone:
+            return (
+                '<!DOCTYPE html><html><head><meta charset="utf-8">'
+                f'<style>{PREVIEW_CSS}</style></head><body>{html}</body></html>'
+            )
+        return html
+
+    def render_blocks(self, updates):
+        """Render the preview as a list of (block id, html), in document order.
+
+        Block ids are "header", "section-<i>", "info-exchange" and "planning";
+        each block's HTML is one element with that id, so a UI can replace
+        only the blocks listed in self.changed.
+        """
+        self.changed = []
+        meeting_number = updates.get("meeting_number")
+        routed = self._route(updates)
+
+        blocks = [self._block(
+            "header",
+            _key([updates.get(f) for f in (
+                "meeting_number", "date", "distribution_date",
+                "next_meeting", "next_meeting_time",
+            )]),
+            lambda: self._render_header(updates),
+        )]
+        for i in range(len(self.sections)):
+            point_updates, new_points = routed[i]
+            blocks.append(self._block(
+                f"section-{i}",
+                _key(meeting_number, point_updates, new_points),
+                lambda i=i: self._render_section(i, routed[i], meeting_number),
+            ))
+        blocks.append(self._block(
+            "info-exchange", _key(updates.get("info_exchange")),
+            lambda: self._render_info_exchange(updates.get("info_exchange")),
+        ))
+        blocks.append(self._block(
+            "planning", _key(updates.get("planning")),
+            lambda: self._render_planning(updates.get("planning")),
+        ))
+        return blocks
+
+    def _block(self, block_id, key, render):
+        cached = self._blocks.get(block_id)
+        if cached is not None and cached[0] == key:
+            self.stats["reused"] += 1
+            return block_id, cached[1]
+        html = render()
+        self._blocks[block_id] = (key, html)
+        self.changed.append(block_id)
+        self.stats["rendered"] += 1
+        return block_id, html
+
+    def _section_index(self, section_name, filled=()):
+        """Section an update goes to, matched like DocumentIndex.section_table().
+
+        The first section whose name contains section_name, among the sections
+        with rows: a section without points (a header-only table) is only
+        matched once a new point was added to it (filled). Anything else falls
+        back to the first section, as the generator falls back to the first
+        subject table.
+        """
+        key = (section_name or '').lower()
+        for i, section in enumerate(self.sections):
+            if ((section.get("points") or i in filled)
+                    and key in section["section_name"].lower()):
+                return i
+        return 0
+
+    def _route(self, updates):
+        """Point updates and new points of each section, in updates order.
+
+        Point updates are routed before new points, as the generator applies them.
+        """
+        routed = [([], []) for _ in self.sections]
+        if not self.sections:
+            return routed
+        for pu in updates.get("point_updates", []):
+            if isinstance(pu, dict):
+                routed[self._section_index(pu.get("section"))][0].append(pu)
+        filled = set()
+        for np_data in updates.get("new_points", []):
+            if isinstance(np_data, dict):
+                i = self._section_index(np_data.get("section"), filled)
+                routed[i][1].append(np_data)
+                filled.add(i)
+        return routed
+
+    def _render_header(self, updates):
+        labels = self.labels
+        metadata = self.report.get("metadata", {})
+        number = updates.get("meeting_number", metadata.get("meeting_number"))
+        rows = [
+            (labels["minutes"], number),
+            (labels["date"], updates.get("date") or metadata.get("date")),
+            (labels["distribution"],
+             updates.get("distribution_date") or metadata.get("distribution_date")),
+        ]
+        current = (self.report.get("next_meeting") or {}).get("full_text") or ""
+        next_meeting = current
+        if updates.get("next_meeting"):
+            next_meeting = next_meeting_line(
+                current, updates["next_meeting"], updates.get("next_meeting_time")
+            )
+        rows.append((labels["next_meeting"], next_meeting))
+        body = ''.join(
+            f'<tr><th>{escape(label)}</th><td>{escape(str(value or ""))}</td></tr>'
+            for label, value in rows
+        )
+        return f'<table id="header">{body}</table>'
+
+    def _render_section(self, i, routed, meeting_number):
+        labels = self.labels
+        section = self.sections[i]
+        point_updates, new_points = routed
+
+        # The generator updates the first row with the number
+        updated = {}
+        for pu in point_updates:
+            updated.setdefault((pu.get("number") or '').strip(), []).append(pu)
+
+        rows = []
+        seen = set()
+        for j, point in enumerate(section.get("points", [])):
+            number = point["number"].strip()
+            if number in updated and number not in seen:
+                seen.add(number)
+                rows.append(self._render_point(point, updated[number], meeting_number))
+            else:
+                if (i, j) not in self._rows:
+                    self._rows[(i, j)] = self._render_point(point, [], meeting_number)
+                rows.append(self._rows[(i, j)])
+        rows.extend(self._render_new_point(np_data) for np_data in new_points)
+
+        head = ''.join(f'<th>{escape(labels[c])}</th>'
+                       for c in ("number", "title", "subject", "for_whom", "due"))
+        return (
+            f'<table id="section-{i}"><thead>'
+            f'<tr><th colspan="5">{escape(section["section_name"])}</th></tr>'
+            f'<tr>{head}</tr></thead><tbody>{"".join(rows)}</tbody></table>'
+        )
+
+    def _render_point(self, point, point_updates, meeting_number):
+        subject = [_p(p["text"]) for p in point.get("subject_paragraphs", [])]
+        for_whom = [_p(text) for text in point.get("for_whom_paragraphs", [])]
+        due = [_p(text) for text in point.get("due_paragraphs", [])]
+
+        for pu in point_updates:
+            # Header line as report_generator.update_existing_point() writes it
+            meeting_date = pu.get("meeting_date", '')
+            header = f"Meeting {meeting_date}" if meeting_date else f"Meeting N{meeting_number}"
+            subject.append(_p(header, new=True))
+            subject.extend(_p(line, new=True) for line in pu.get("subject_lines") or [])
+            # New for whom / due values are aligned with the last subject line
+            for field, column in (("for_whom", for_whom), ("due", due)):
+                if pu.get(field):
+                    column.extend(_p('') for _ in range(len(subject) - 1 - len(column)))
+                    column.append(_p(pu[field], new=True))
+
+        return (
+            f'<tr>{_cell([_p(point.get("number"))])}{_cell([_p(point.get("title"))])}'
+            f'{_cell(subject)}{_cell(for_whom)}{_cell(due)}</tr>'
+        )
+
+    def _render_new_point(self, np_data):
+        meeting_date = np_data.get("meeting_date", '')
+        header = f"Meeting {meeting_date}" if meeting_date else "New point"
+        lines = [header] + list(np_data.get("subject_lines") or [])
+        return (
+            '<tr class="new-point">'
+            f'{_cell([_p(np_data.get("number"), new=True)])}'
+            f'{_cell([_p(np_data.get("title"), new=True)])}'
+            f'{_cell([_p(line, new=True) for line in lines])}'
+            f'{_cell([_p(np_data.get("for_whom"), new=True)])}'
+            f'{_cell([_p(np_data.get("due"), new=True)])}</tr>'
+        )
+
+    def _render_info_exchange(self, items):
+        labels = self.labels
+        if not items:
+            items = self.report.get("info_exchange", [])
+        head = ''.join(f'<th>{escape(labels[f])}</th>' for f in INFO_EXCHANGE_FIELDS)
+        rows = ''.join(
+            '<tr>' + ''.join(_cell([_p(item.get(f))]) for f in INFO_EXCHANGE_FIELDS) + '</tr>'
+            for item in items if isinstance(item, dict)
+        )
+        return (
+            f'<table id="info-exchange"><thead>'
+            f'<tr><th colspan="4">{escape(labels["info_exchange"])}</th></tr>'
+            f'<tr>{head}</tr></thead><tbody>{rows}</tbody></table>'
+        )
+
+    def _render_planning(self, items):
+        if items:
+            items = [(item.get("content") or '', item.get("is_new", False))
+                     for item in items if isinstance(item, dict)]
+        else:
+            # Not replaced: the previous items, demoted like the other content
+            items = [(item["content"], False) for item in self.report.get("planning", [])]
+        rows = ''.join(
+            '<tr>' + _cell([_p(line, new) for line in content.split('\n')]) + '</tr>'
+            for content, new in items
+        )
+        return (
+            f'<table id="planning"><thead><tr><th>{escape(self.labels["planning"])}</th></tr>'
+            f'</thead><tbody>{rows}</tbody></table>'
+        )
+
+
+def render_preview(parsed_report, updates, standalone=False):
+    """One-off preview render (use a PreviewRenderer to reuse work across edits)."""
+    return PreviewRenderer(parsed_report).render(updates, standalone)
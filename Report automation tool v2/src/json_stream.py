@@ -0,0 +1,244 @@
+"""
+Incremental JSON Parser - Parses a JSON document as it streams in, chunk by chunk.
+
+Used by ai_analyzer to surface each proposal (point update, new point, info exchange
+item, planning item) as soon as its object closes, instead of waiting for the model
+to finish generating the whole updates JSON.
+
+The parser is a single-pass character scanner: it tracks the container stack and the
+key under which each container sits, and hands a completed element to json.loads only
+once its closing bracket has arrived. Text before the first '{' (markdown fences,
+stray prose) and after the root object closes is ignored.
+
+parse_tolerant() uses the same scanning approach to recover model output that was
+cut off at max_tokens or is slightly sloppy (trailing commas, surrounding prose).
+"""
+
+import json
+
+
+# Top-level arrays of the updates JSON whose elements are emitted as they complete
+STREAMED_ARRAYS = ("point_updates", "new_points", "info_exchange", "planning")
+
+
+class IncrementalJSONParser:
+    """Scan a streamed JSON object and emit completed elements of top-level arrays.
+
+    Usage:
+        parser = IncrementalJSONParser()
+        for chunk in text_stream:
+            for key, index, item in parser.feed(chunk):
+                ...
+        document = parser.result()
+    """
+
+    def __init__(self, streamed_arrays=STREAMED_ARRAYS):
+        self.streamed_arrays = set(streamed_arrays)
+        self.buffer = ''
+        self.pos = 0
+        self.root_start = None
+        self.root_end = None
+        # Each frame: {'type': '{' or '[', 'key': str|None, 'start': int,
+        #              'expect_key': bool, 'count': int}
+        self.stack = []
+        self.in_string = False
+        self.escape = False
+        self.string_start = None
+        self.pending_key = None
+
+    @property
+    def done(self):
+        """True once the root object has been closed."""
+        return self.root_end is not None
+
+    def feed(self, chunk):
+        """Consume a chunk of text.
+
+        Returns:
+            list of (array_key, index, element) tuples for every element of a
+            streamed top-level array that completed within this chunk.
+        """
+        self.buffer += chunk
+        completed = []
+        buf = self.buffer
+
+        while self.pos < len(buf) and not self.done:
+            ch = buf[self.pos]
+
+            if self.root_start is None:
+                # Skip anything before the root object (```json fences, prose)
+                if ch == '{':
+                    self.root_start = self.pos
+                    self._push('{')
+                self.pos += 1
+                continue
+
+            if self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    self._end_string()
+                self.pos += 1
+                continue
+
+            if ch == '"':
+                self.in_string = True
+                self.string_start = self.pos
+            elif ch in '{[':
+                self._push(ch)
+            elif ch in '}]':
+                item = self._pop()
+                if item is not None:
+                    completed.append(item)
+            elif ch == ':':
+                self.stack[-1]['expect_key'] = False
+            elif ch == ',':
+                frame = self.stack[-1]
+                frame['count'] += 1
+                if frame['type'] == '{':
+                    frame['expect_key'] = True
+            self.pos += 1
+
+        return completed
+
+    def result(self):
+        """Parse and return the complete root object.
+
+        Raises:
+            ValueError: if the root object has not been closed yet.
+        """
+        if not self.done:
+            raise ValueError("JSON document is incomplete")
+        return json.loads(self.buffer[self.root_start:self.root_end + 1])
+
+    def _push(self, bracket):
+        key = None
+        if self.stack and self.stack[-1]['type'] == '{':
+            key = self.pending_key
+        self.stack.append({
+            'type': bracket,
+            'key': key,
+            'start': self.pos,
+            'expect_key': bracket == '{',
+            'count': 0,
+        })
+
+    def _pop(self):
+        frame = self.stack.pop()
+        if not self.stack:
+            self.root_end = self.pos
+            return None
+
+        parent = self.stack[-1]
+        # Element of a streamed array directly under the root object
+        if (parent['type'] == '[' and len(self.stack) == 2
+                and parent['key'] in self.streamed_arrays):
+            element = json.loads(self.buffer[frame['start']:self.pos + 1])
+            return parent['key'], parent['count'], element
+        return None
+
+    def _end_string(self):
+        frame = self.stack[-1]
+        if frame['type'] == '{' and frame['expect_key']:
+            self.pending_key = json.loads(self.buffer[self.string_start:self.pos + 1])
+
+
+def parse_tolerant(text, salvage_depth=2):
+    """Parse a JSON object from sloppy or truncated model output in a single pass.
+
+    - Text before the first '{' and after the root object closes is ignored
+    - Trailing commas before '}' or ']' are dropped
+    - Raw control characters inside strings are accepted
+    - If the text ends before the root object closes, it is cut back to the last
+      complete value at container depth <= salvage_depth (root object = 1, its
+      arrays = 2) and the open containers are closed. With the default depth,
+      every complete element of the top-level arrays is kept and a half-written
+      element is dropped.
+
+    Returns:
+        tuple: (value, truncated: bool)
+
+    Raises:
+        ValueError: if no JSON object can be recovered.
+    """
+    start = text.find('{')
+    if start == -1:
+        raise ValueError("Could not extract valid JSON from API response")
+
+    out = []
+    stack = []
+    expect_key = []
+    in_string = False
+    escape = False
+    string_is_key = False
+    safe_len = 0
+    safe_stack = ''
+    closed = False
+
+    def mark_safe():
+        nonlocal safe_len, safe_stack
+        if len(stack) <= salvage_depth:
+            safe_len = len(out)
+            safe_stack = ''.join(stack)
+
+    for ch in text[start:]:
+        if in_string:
+            out.append(ch)
+            if escape:
+                escape = False
+            elif ch == '\\':
+                escape = True
+            elif ch == '"':
+                in_string = False
+                if not string_is_key:
+                    mark_safe()
+            continue
+
+        if ch == '"':
+            in_string = True
+            string_is_key = bool(stack) and stack[-1] == '{' and expect_key[-1]
+            out.append(ch)
+        elif ch in '{[':
+            stack.append(ch)
+            expect_key.append(ch == '{')
+            out.append(ch)
+            mark_safe()
+        elif ch in '}]':
+            # Drop a trailing comma (and the whitespace after it)
+            while out and out[-1] in ' \t\r\n':
+                out.pop()
+            if out and out[-1] == ',':
+                out.pop()
+            stack.pop()
+            expect_key.pop()
+            out.append(ch)
+            if not stack:
+                closed = True
+                break
+            mark_safe()
+        elif ch == ',':
+            mark_safe()
+            out.append(ch)
+            if stack[-1] == '{':
+                expect_key[-1] = True
+        elif ch == ':':
+            expect_key[-1] = False
+            out.append(ch)
+        else:
+            out.append(ch)
+
+    truncated = not closed
+    if truncated:
+        closers = {'{': '}', '[': ']'}
+        out = out[:safe_len]
+        while out and out[-1] in ' \t\r\n,':
+            out.pop()
+        out.extend(closers[b] for b in reversed(safe_stack))
+
+    try:
+        return json.loads(''.join(out), strict=False), truncated
+    except json.JSONDecodeError:
+        raise ValueError("Could not extract valid JSON from API response")
@@ -0,0 +1,230 @@
+"""
+Local Extractors - Deterministic extraction of report metadata before analysis.
+
+Meeting number, meeting date, next meeting and distribution date are mostly
+arithmetic or pattern matching: previous number + 1, the date in the Leexi export
+filename ("leexi-20260115-transcript-....txt"), the meeting announced as "next
+meeting" in the previous report, an explicit "prochaine réunion le 25/02/2026 à 11h"
+in the transcript. Extracting them locally removes those fields from the model output
+and rules out hallucinated values.
+
+Every extracted field carries a confidence score and its source; only fields at or
+above MIN_CONFIDENCE are filled locally (see accepted_fields), the others are left
+to the model.
+"""
+
+import re
+from datetime import date
+from pathlib import Path
+
+
+MIN_CONFIDENCE = 0.7
+YEARLESS_CONFIDENCE = 0.6   # "le 25/02": the year is inferred, left to the model
+
+# How far after a "next meeting" phrase a date is searched, in characters
+NEXT_MEETING_WINDOW = 160
+
+LEEXI_FILENAME_PATTERN = re.compile(r'leexi[-_](\d{4})(\d{2})(\d{2})', re.IGNORECASE)
+FILENAME_DATE_PATTERN = re.compile(r'(?<!\d)(20\d{2})[-_]?(\d{2})[-_]?(\d{2})(?!\d)')
+# A quantity right after a number ("12/5 m", "3/4 %") is not a date
+UNIT_PATTERN = (
+    r'\s*(?:%|€|\$|(?:m²|m³|m2|m3|mm|cm|km|kg|ml|m|g|t|l|mètres?|metres?|meters?'
+    r'|kilos?|tonnes?|litres?|euros?|eur)(?!\w))'
+)
+# DD/MM, DD/MM/YY(YY) or DD.MM.YY(YY): "." only with a year, so decimals such
+# as "12.5" are not read as dates; not preceded by a digit ("1.12.5", "112/05")
+NUMERIC_DATE_PATTERN = re.compile(
+    r'(?<!\d)(?<!\d[.,])(\d{1,2})(?:/(\d{1,2})(?:/(\d{2,4}))?|\.(\d{1,2})\.(\d{2,4}))'
+    r'(?![\d/]|[.,]\d)(?!' + UNIT_PATTERN + r')'
+)
+TIME_PATTERN = re.compile(r'(?<!\d)(\d{1,2})\s*(?:h|:|heures?)\s*(\d{2})?(?!\d)', re.IGNORECASE)
+NEXT_MEETING_PATTERN = re.compile(
+    r'prochaine\s+r[eé]union|next\s+meeting|on\s+se\s+revoit|we\s+meet\s+again',
+    re.IGNORECASE,
+)
+
+MONTHS = {
+    "janvier": 1, "january": 1, "février": 2, "fevrier": 2, "february": 2, "mars": 3,
+    "march": 3, "avril": 4, "april": 4, "mai": 5, "may": 5, "juin": 6, "june": 6,
+    "juillet": 7, "july": 7, "août": 8, "aout": 8, "august": 8, "septembre": 9,
+    "september": 9, "octobre": 10, "october": 10, "novembre": 11, "november": 11,
+    "décembre": 12, "decembre": 12, "december": 12,
+}
+NAMED_DATE_PATTERN = re.compile(
+    r'(?<!\d)(\d{1,2})(?:er)?\s+(' + '|'.join(MONTHS) + r')(?:\s+(\d{4}))?',
+    re.IGNORECASE,
+)
+
+
+def _field(value, confidence, source):
+    return {"value": value, "confidence": confidence, "source": source}
+
+
+def _format_date(d):
+    return d.strftime("%d/%m/%Y")
+
+
+def _parse_report_date(text):
+    """Parse a DD/MM/YYYY string from the parsed report, or None."""
+    match = re.match(r'^\s*(\d{2})/(\d{2})/(\d{4})', text or "")
+    if not match:
+        return None
+    try:
+        return date(int(match.group(3)), int(match.group(2)), int(match.group(1)))
+    except ValueError:
+        return None
+
+
+def _numeric_date(match):
+    """(day, month, year or None) of a NUMERIC_DATE_PATTERN match."""
+    day, month, year, dotted_month, dotted_year = match.groups()
+    if dotted_month:
+        return day, dotted_month, dotted_year
+    return day, month, year
+
+
+def _make_date(year, month, day, after=None):
+    """Build a date; a missing year is the first one that puts it after `after`."""
+    try:
+        if year:
+            year = int(year)
+            return date(year + 2000 if year < 100 else year, int(month), int(day))
+        if after is None:
+            return None
+        candidate = date(after.year, int(month), int(day))
+        if candidate <= after:
+            candidate = date(after.year + 1, int(month), int(day))
+        return candidate
+    except ValueError:
+        return None
+
+
+def extract_meeting_number(parsed_report):
+    """Previous meeting number + 1 (1 for a blank template)."""
+    previous = parsed_report.get("metadata", {}).get("meeting_number")
+    has_points = any(s.get("points") for s in parsed_report.get("sections", []))
+    if isinstance(previous, int) and (previous > 0 or not has_points):
+        return _field(previous + 1, 1.0, "previous report number + 1")
+    if not has_points:
+        return _field(1, 0.9, "blank template")
+    return _field(None, 0.0, "previous report has no meeting number")
+
+
+def extract_meeting_date(parsed_report, transcript_filename=None, transcript_text=None):
+    """Date of the meeting being reported, as DD/MM/YYYY.
+
+    Sources, most reliable first: the Leexi export filename, another date in
+    the filename, a date in the first lines of the transcript, the next meeting
+    announced in the previous report.
+    """
+    if transcript_filename:
+        name = Path(transcript_filename).name
+        match = LEEXI_FILENAME_PATTERN.search(name)
+        source = "Leexi filename"
+        confidence = 0.95
+        if not match:
+            match = FILENAME_DATE_PATTERN.search(name)
+            source = "transcript filename"
+            confidence = 0.8
+        if match:
+            d = _make_date(*match.groups())
+            if d:
+                return _field(_format_date(d), confidence, source)
+
+    if transcript_text:
+        head = "\n".join(transcript_text.strip().splitlines()[:5])
+        match = NUMERIC_DATE_PATTERN.search(head)
+        day, month, year = _numeric_date(match) if match else (None, None, None)
+        if year:
+            d = _make_date(year, month, day)
+            if d:
+                return _field(_format_date(d), 0.75, "transcript header")
+
+    announced = (parsed_report.get("next_meeting") or {}).get("date")
+    d = _parse_report_date(announced)
+    if d:
+        return _field(_format_date(d), 0.6, "next meeting of the previous report")
+    return _field(None, 0.0, "not found")
+
+
+def extract_next_meeting(transcript_text, meeting_date=None):
+    """Next meeting date (and time) announced in the transcript.
+
+    Looks for an explicit date shortly after a "prochaine réunion" / "next
+    meeting" phrase. Dates without a year are placed after the meeting date but
+    get YEARLESS_CONFIDENCE, below MIN_CONFIDENCE, so the model confirms them.
+
+    Returns:
+        dict: field with value "DD/MM/YYYY" and, if found, "time" ("11:00")
+    """
+    after = _parse_report_date(meeting_date)
+    for phrase in NEXT_MEETING_PATTERN.finditer(transcript_text or ""):
+        window = transcript_text[phrase.end():phrase.end() + NEXT_MEETING_WINDOW]
+        d = year = None
+        match = NUMERIC_DATE_PATTERN.search(window)
+        if match:
+            day, month, year = _numeric_date(match)
+            d = _make_date(year, month, day, after)
+        else:
+            match = NAMED_DATE_PATTERN.search(window)
+            if match:
+                year = match.group(3)
+                d = _make_date(year, MONTHS[match.group(2).lower()], match.group(1), after)
+        if not d or (after and d <= after):
+            continue
+
+        if not year:
+            confidence = YEARLESS_CONFIDENCE
+        else:
+            confidence = 0.8 if after else 0.7
+        field = _field(_format_date(d), confidence, "transcript")
+        time_match = TIME_PATTERN.search(window[match.end():])
+        if time_match and int(time_match.group(1)) < 24:
+            field["time"] = f"{int(time_match.group(1)):02d}:{time_match.group(2) or '00'}"
+        return field
+    return _field(None, 0.0, "not found")
+
+
+def extract_fields(parsed_report, cleaned_text, transcript_filename=None, raw_text=None):
+    """Run all extractors.
+
+    Args:
+        parsed_report: dict from report_parser.parse_report()
+        cleaned_text: formatted string from transcript_cleaner.format_clean_transcript()
+        transcript_filename: name of the uploaded transcript file, if known
+        raw_text: the transcript before cleaning (keeps the original header lines)
+
+    Returns:
+        dict: {field: {"value", "confidence", "source"}} for meeting_number,
+              date, distribution_date and next_meeting
+    """
+    meeting_date = extract_meeting_date(
+        parsed_report, transcript_filename, raw_text or cleaned_text
+    )
+    return {
+        "meeting_number": extract_meeting_number(parsed_report),
+        "date": meeting_date,
+        # Filled in manually when the report is sent out
+        "distribution_date": _field(None, 1.0, "always filled manually"),
+        "next_meeting": extract_next_meeting(cleaned_text, meeting_date["value"]),
+    }
+
+
+def accepted_fields(extracted, min_confidence=MIN_CONFIDENCE):
+    """Keep the fields confident enough to be filled without the model.
+
+    Returns:
+        dict: updates fields ({field: value}, plus next_meeting_time when a
+              time was extracted), ready to merge into the updates dict
+    """
+    fields = {}
+    for name, field in extracted.items():
+        if field["confidence"] < min_confidence:
+            continue
+        if field["value"] is None and name != "distribution_date":
+            continue
+        fields[name] = field["value"]
+        if name == "next_meeting" and field.get("time"):
+            fields["next_meeting_time"] = field["time"]
+    return fields
+
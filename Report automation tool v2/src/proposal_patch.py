@@ -0,0 +1,155 @@
+"""
+Proposal Patch - Validates and applies patch operations to an AI proposal.
+
+In the feedback flow (analyze-feedback) the model returns a short list of operations
+against the current proposal instead of re-emitting the complete updates JSON, so
+each feedback round costs roughly the size of the change.
+
+Operation format:
+    {"op": "add", "target": "new_points", "value": {...}}
+    {"op": "add", "target": "info_exchange", "index": 2, "value": {...}}   # insert before 2
+    {"op": "remove", "target": "new_points", "number": "13.03"}
+    {"op": "remove", "target": "planning", "index": 4}
+    {"op": "replace", "target": "point_updates", "number": "07.02", "value": {...}}
+    {"op": "replace", "target": "new_points", "number": "13.02", "field": "due", "value": "Done"}
+    {"op": "replace", "target": "meta", "field": "next_meeting", "value": "..."}
+
+Points (point_updates, new_points) are addressed by number, info_exchange and planning
+items by their 0-based index in the current proposal. All references are resolved
+against the proposal as it was before the patch, so operation order does not shift
+indices.
+"""
+
+import copy
+
+
+PATCH_OPS = ("add", "remove", "replace")
+LIST_TARGETS = ("point_updates", "new_points", "info_exchange", "planning")
+NUMBERED_TARGETS = ("point_updates", "new_points")
+META_FIELDS = ("meeting_number", "date", "distribution_date", "next_meeting")
+
+
+def _find_by_number(items, number):
+    for i, item in enumerate(items):
+        if isinstance(item, dict) and item.get("number") == number:
+            return i
+    return None
+
+
+def _resolve(proposals, op):
+    """Return the index of the element an operation refers to, or an error string."""
+    items = proposals.get(op["target"], [])
+    if op["target"] in NUMBERED_TARGETS and "number" in op:
+        index = _find_by_number(items, op["number"])
+        if index is None:
+            return f"unknown {op['target']} number '{op['number']}'"
+        return index
+    index = op.get("index")
+    if not isinstance(index, int) or not 0 <= index < len(items):
+        return f"{op['target']} index {index!r} out of range"
+    return index
+
+
+def validate_patch(proposals, operations):
+    """Check patch operations against the current proposal.
+
+    Returns:
+        tuple: (valid_operations: list, errors: list[str])
+    """
+    valid = []
+    errors = []
+    if not isinstance(operations, list):
+        return [], ["Patch operations must be a list"]
+
+    for i, op in enumerate(operations):
+        if not isinstance(op, dict):
+            errors.append(f"operations[{i}] must be a dict")
+            continue
+        kind = op.get("op")
+        target = op.get("target")
+        if kind not in PATCH_OPS:
+            errors.append(f"operations[{i}] unknown op {kind!r}")
+            continue
+
+        if target == "meta":
+            if kind != "replace" or op.get("field") not in META_FIELDS:
+                errors.append(f"operations[{i}] meta only supports replace of {', '.join(META_FIELDS)}")
+                continue
+            valid.append(op)
+            continue
+
+        if target not in LIST_TARGETS:
+            errors.append(f"operations[{i}] unknown target {target!r}")
+            continue
+
+        if kind == "add":
+            if not isinstance(op.get("value"), dict):
+                errors.append(f"operations[{i}] add needs a dict value")
+                continue
+            index = op.get("index")
+            if index is not None and (not isinstance(index, int)
+                                      or not 0 <= index <= len(proposals.get(target, []))):
+                errors.append(f"operations[{i}] {target} index {index!r} out of range")
+                continue
+            valid.append(op)
+            continue
+
+        resolved = _resolve(proposals, op)
+        if isinstance(resolved, str):
+            errors.append(f"operations[{i}] {resolved}")
+            continue
+        if kind == "replace" and "field" not in op and not isinstance(op.get("value"), dict):
+            errors.append(f"operations[{i}] replace without field needs a dict value")
+            continue
+        valid.append(op)
+
+    return valid, errors
+
+
+def apply_patch(proposals, operations):
+    """Apply validated patch operations and return a new proposal dict.
+
+    The input proposal is not modified.
+    """
+    result = copy.deepcopy(proposals)
+
+    # Resolve every reference against the original proposal first
+    resolved = []
+    for op in operations:
+        index = None
+        if op["target"] != "meta" and op["op"] != "add":
+            index = _resolve(proposals, op)
+        resolved.append((op, index))
+
+    removed = {target: set() for target in LIST_TARGETS}
+    inserts = {target: [] for target in LIST_TARGETS}
+
+    for op, index in resolved:
+        target = op["target"]
+        if target == "meta":
+            result[op["field"]] = op.get("value")
+        elif op["op"] == "remove":
+            removed[target].add(index)
+        elif op["op"] == "replace":
+            if "field" in op:
+                result[target][index][op["field"]] = op.get("value")
+            else:
+                result[target][index] = copy.deepcopy(op["value"])
+        else:
+            position = op.get("index")
+            if position is None:
+                position = len(proposals.get(target, []))
+            inserts[target].append((position, copy.deepcopy(op["value"])))
+
+    for target in LIST_TARGETS:
+        if not removed[target] and not inserts[target]:
+            continue
+        original = result.get(target, [])
+        rebuilt = []
+        for i in range(len(original) + 1):
+            rebuilt.extend(value for position, value in inserts[target] if position == i)
+            if i < len(original) and i not in removed[target]:
+                rebuilt.append(original[i])
+        result[target] = rebuilt
+
+    return result
@@ -23,7 +23,14 @@ from pathlib import Path
 from docx import Document
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
-from docx.shared import Pt
+from docx.table import _Row
+
+try:
+    from .document_pool import DEFAULT_POOL
+    from .docx_package import save_patched
+except ImportError:  # imported as a flat module from src/
+    from document_pool import DEFAULT_POOL
+    from docx_package import save_patched
 
 
 def copy_report(source_path, dest_path):
@@ -37,6 +44,104 @@ def _find_metadata_table(doc):
     return doc.tables[0] if doc.tables else None
 
 
+def _is_subject_header(header_text):
+    """True for the (lowercased) header row text of a subject table."""
+    return bool(
+        'subject' in header_text or 'sujet' in header_text
+        or 'n°' in header_text or re.search(r'd\d+\s*[-–]', header_text)
+    )
+
+
+def _row_count(table):
+    return len(table._tbl.tr_lst)
+
+
+class DocumentIndex:
+    """Table lookups for one document, built in a single pass over its tables.
+
+    Every table is classified once from its header row (subject, planning, info
+    exchange). Section tables are looked up by name through a cache, and the rows
+    of a section table are mapped by point number the first time the table is
+    used. add_new_point() registers the rows it adds, so the index stays
+    consistent while the document is edited.
+
+    Usage:
+        index = DocumentIndex(doc)
+        table = index.section_table("Sprinklers")
+        row = index.point_row(table, "06.01")
+    """
+
+    def __init__(self, doc):
+        self.headers = []           # (table, lowercased header row text)
+        self.subject_tables = []
+        self.info_exchange_table = None
+        self.planning_table = None
+        self._sections = {}         # lowercased section name -> table
+        self._points = {}           # table element -> {point number: row}
+        self._prototypes = {}       # table element -> TablePrototypes
+
+        for table in doc.tables:
+            rows = table.rows
+            if not rows:
+                continue
+            header = ' '.join(c.text for c in rows[0].cells).lower()
+            self.headers.append((table, header))
+            if _is_subject_header(header):
+                self.subject_tables.append(table)
+            if len(rows) < 2:
+                continue
+            if self.info_exchange_table is None and ('from whom' in header or 'de qui' in header):
+                self.info_exchange_table = table
+            if (self.planning_table is None and 'planning' in header
+                    and 'planning' in rows[0].cells[0].text.lower()
+                    and len(table.columns) == 1):
+                self.planning_table = table
+
+    def content_tables(self):
+        """Subject and planning tables whose content is demoted at each meeting."""
+        return [
+            table for table, header in self.headers
+            if _row_count(table) >= 2 and (_is_subject_header(header) or 'planning' in header)
+        ]
+
+    def section_table(self, section_name):
+        """Find the table of a section (see find_section_table)."""
+        key = section_name.lower()
+        if key not in self._sections:
+            self._sections[key] = self._find_section_table(key)
+        return self._sections[key]
+
+    def _find_section_table(self, key):
+        # First pass: section name in header text
+        for table, header in self.headers:
+            if _row_count(table) >= 2 and key in header:
+                return table
+        # Second pass: any subject-type table (for single-table formats like CORUM)
+        return self.subject_tables[0] if self.subject_tables else None
+
+    def point_row(self, table, point_number):
+        """Return the row of a point in a section table, or None."""
+        rows = self._points.get(table._tbl)
+        if rows is None:
+            rows = self._points[table._tbl] = _index_point_rows(table)
+        return rows.get(point_number)
+
+    def add_point_row(self, table, point_number, tr):
+        """Register a row appended to a section table."""
+        rows = self._points.get(table._tbl)
+        if rows is not None:
+            rows.setdefault(point_number, _Row(tr, table))
+        if _row_count(table) == 2:
+            # A header-only table just became eligible for section name matching
+            self._sections.clear()
+
+    def prototypes(self, table):
+        """Cell formatting prototypes of a section table (see TablePrototypes)."""
+        if table._tbl not in self._prototypes:
+            self._prototypes[table._tbl] = TablePrototypes(table)
+        return self._prototypes[table._tbl]
+
+
 def _update_cell_text_preserve_format(cell, old_text_pattern, new_text):
     """Update text in a cell while preserving formatting.
 
@@ -141,16 +246,35 @@ def update_metadata(doc, new_meeting_number, new_date, new_distribution_date=Non
         )
 
 
-def update_next_meeting(doc, next_meeting_text, next_meeting_time=None):
-    """Update the next meeting paragraph in the document.
+def next_meeting_line(current_text, next_meeting_text, next_meeting_time=None):
+    """Text of the next meeting paragraph after the update.
 
     If next_meeting_text looks like a date (DD/MM/YYYY), only the date portion
-    of the existing paragraph is replaced, preserving the original syntax.
-    If next_meeting_time is provided (e.g. "11:00"), the time is also replaced.
-    Otherwise the full paragraph text is replaced.
+    of current_text is replaced, preserving the original syntax. If
+    next_meeting_time is provided (e.g. "11:00"), the time is also replaced.
+    Otherwise next_meeting_text replaces the whole paragraph.
     """
-    date_only = bool(re.match(r'^\d{2}/\d{2}/\d{4}$', next_meeting_text.strip()))
+    if not re.match(r'^\d{2}/\d{2}/\d{4}$', next_meeting_text.strip()):
+        return next_meeting_text
+    # Replace only the date in the existing text, keep everything else
+    new_full = re.sub(r'\d{2}/\d{2}/\d{4}', next_meeting_text.strip(), current_text)
+    # Also replace time if provided (matches "11:00", "11 :00", "11\xa0:00")
+    if next_meeting_time:
+        new_full = re.sub(
+            r'(\d{1,2})[\s\xa0]*[:\.][\s\xa0]*(\d{2})',
+            next_meeting_time.strip(),
+            new_full,
+            count=1,
+        )
+    return new_full
+
+
+def update_next_meeting(doc, next_meeting_text, next_meeting_time=None):
+    """Update the next meeting paragraph in the document.
 
+    The paragraph following the "Next meeting" label gets the text computed
+    by next_meeting_line().
+    """
     found_label = False
     for p in doc.paragraphs:
         text = p.text.strip()
@@ -158,90 +282,270 @@ def update_next_meeting(doc, next_meeting_text, next_meeting_time=None):
             found_label = True
             continue
         if found_label and text:
-            if date_only:
-                # Replace only the date in the existing text, keep everything else
-                full_text = ''.join(r.text or '' for r in p.runs)
-                new_full = re.sub(r'\d{2}/\d{2}/\d{4}', next_meeting_text.strip(), full_text)
-                # Also replace time if provided (matches "11:00", "11 :00", "11\xa0:00")
-                if next_meeting_time:
-                    new_full = re.sub(
-                        r'(\d{1,2})[\s\xa0]*[:\.][\s\xa0]*(\d{2})',
-                        next_meeting_time.strip(),
-                        new_full,
-                        count=1,
-                    )
-                if p.runs:
-                    p.runs[0].text = new_full
-                    for r in p.runs[1:]:
-                        r.text = ''
-            else:
-                # Full replacement
-                if p.runs:
-                    p.runs[0].text = next_meeting_text
-                    for r in p.runs[1:]:
-                        r.text = ''
+            full_text = ''.join(r.text or '' for r in p.runs)
+            if p.runs:
+                p.runs[0].text = next_meeting_line(
+                    full_text, next_meeting_text, next_meeting_time
+                )
+                for r in p.runs[1:]:
+                    r.text = ''
             return True
     return False
 
 
-def unbold_all_content(doc):
-    """Remove bold from all text in subject tables.
+# Content rows of a content table: every row but the header
+_CONTENT_ROWS = './w:tr[position() > 1]'
+_BOLD_XPATH = ' | '.join(
+    f'{_CONTENT_ROWS}//w:r/w:rPr/w:{tag}' for tag in ('b', 'bCs')
+)
+_RUN_STYLE_XPATH = f'{_CONTENT_ROWS}//w:r/w:rPr/w:rStyle'
+_OFF_VALUES = ('0', 'false', 'off')
+
+
+def unbold_all_content(doc, index=None):
+    """Remove bold from all text in subject tables (and the planning table).
 
     This "demotes" the latest meeting content to normal weight,
     making room for the new meeting's content to be bold.
+
+    Direct bold (w:b, and w:bCs for complex scripts) is switched off in place,
+    selected with one XPath query per table. Runs that get their bold from a
+    character style are given an explicit "not bold" override.
     """
-    for table in doc.tables:
-        # Only process subject tables (detected by header content)
-        if len(table.rows) < 2:
+    index = index or DocumentIndex(doc)
+    bold_styles = _bold_character_styles(doc)
+    for table in index.content_tables():
+        tbl = table._tbl
+        for b in tbl.xpath(_BOLD_XPATH):
+            if b.get(qn('w:val')) not in _OFF_VALUES:
+                b.set(qn('w:val'), '0')
+        if not bold_styles:
             continue
-        header_text = ' '.join(c.text.lower() for c in table.rows[0].cells)
-        is_subject = ('subject' in header_text or 'sujet' in header_text
-                      or 'n°' in header_text or re.search(r'd\d+\s*[-–]', header_text))
-        if not is_subject:
-            # Also unbold in planning table
-            is_planning = 'planning' in header_text
-            if not is_planning:
-                continue
+        for rStyle in tbl.xpath(_RUN_STYLE_XPATH):
+            if rStyle.get(qn('w:val')) in bold_styles:
+                rPr = rStyle.getparent()
+                for b in (rPr.get_or_add_b(), rPr.get_or_add_bCs()):
+                    if b.get(qn('w:val')) is None:
+                        b.set(qn('w:val'), '0')
+
+
+def _bold_character_styles(doc):
+    """Ids of the character styles that make text bold (following basedOn)."""
+    styles = {}
+    for style in doc.styles.element.xpath('./w:style[@w:type="character"]'):
+        b = style.find(qn('w:rPr') + '/' + qn('w:b'))
+        based_on = style.find(qn('w:basedOn'))
+        styles[style.get(qn('w:styleId'))] = (
+            None if b is None else b.get(qn('w:val')) not in _OFF_VALUES,
+            None if based_on is None else based_on.get(qn('w:val')),
+        )
 
-        for row in table.rows[1:]:
-            for cell in row.cells:
-                _unbold_cell(cell)
+    def is_bold(style_id, seen=()):
+        bold, based_on = styles.get(style_id, (None, None))
+        if bold is None and based_on and based_on not in seen:
+            return is_bold(based_on, seen + (style_id,))
+        return bool(bold)
 
+    return {style_id for style_id in styles if is_bold(style_id)}
+
+
+def _has_text(element):
+    return any(t.text for t in element.iter(qn('w:t')))
 
-def _unbold_cell(cell):
-    """Remove bold formatting from all runs in a cell."""
-    for para in cell.paragraphs:
-        for run in para.runs:
-            if run.bold:
-                run.bold = False
 
+def _text_run(p):
+    return next((r for r in p.iter(qn('w:r')) if _has_text(r)), None)
 
-def add_paragraphs_to_cell(cell, paragraphs, bold=True):
+
+# Run properties of greyed-out (closed) content that new lines must not inherit
+_MUTED_TAGS = ('w:color', 'w:i', 'w:iCs')
+
+
+def _is_muted(rPr):
+    """True for text in a color other than black: greyed-out (closed) content."""
+    color = rPr.find(qn('w:color')) if rPr is not None else None
+    return color is not None and color.get(qn('w:val')) not in ('auto', '000000')
+
+
+def _without(element, tags):
+    """Copy of element without the children of the given tags."""
+    element = copy.deepcopy(element)
+    for tag in tags:
+        for child in element.findall(qn(tag)):
+            element.remove(child)
+    return element
+
+
+def _make_run(rPr, bold):
+    """w:r with a copy of rPr, bold set explicitly, and an empty w:t as last child."""
+    run = OxmlElement('w:r')
+    rPr = copy.deepcopy(rPr) if rPr is not None else OxmlElement('w:rPr')
+    rPr._remove_b()
+    rPr._remove_bCs()
+    b = rPr.get_or_add_b()
+    if not bold:
+        b.set(qn('w:val'), '0')
+    run.append(rPr)
+    t = OxmlElement('w:t')
+    t.set(qn('xml:space'), 'preserve')
+    run.append(t)
+    return run
+
+
+MEETING_HEADER_PATTERN = re.compile(r'^\s*(meeting|réunion|new point)\b', re.IGNORECASE)
+
+
+class CellPrototype:
+    """Paragraph and run formatting for new lines of a cell.
+
+    The paragraph properties (style, numbering, spacing, indentation) and run
+    properties (font, size, underline) are prepared once as ready-made bold
+    and normal paragraphs. Each new line is a deep copy of one of them with
+    its text set. Grey and italics of closed content are not carried over.
+
+    Args:
+        pPr: w:pPr to copy, or None
+        rPr: w:rPr of a run to copy, or None
+    """
+
+    def __init__(self, pPr=None, rPr=None):
+        self.pPr = pPr
+        self.rPr = rPr
+        self.has_text = rPr is not None
+        self.muted = _is_muted(rPr)
+        if self.muted:
+            rPr = _without(rPr, _MUTED_TAGS)
+        # The paragraph mark's run properties color the numbering and the
+        # empty lines: they are cleaned the same way
+        mark = pPr.find(qn('w:rPr')) if pPr is not None else None
+        if mark is not None and (self.muted or _is_muted(mark)):
+            pPr = copy.deepcopy(pPr)
+            pPr.replace(pPr.find(qn('w:rPr')), _without(mark, _MUTED_TAGS))
+
+        self._empty = OxmlElement('w:p')
+        if pPr is not None:
+            self._empty.append(copy.deepcopy(pPr))
+        self._paragraphs = {}
+        for bold in (True, False):
+            p = copy.deepcopy(self._empty)
+            p.append(_make_run(rPr, bold))
+            self._paragraphs[bold] = p
+
+    @classmethod
+    def from_tc(cls, tc, header=False):
+        """Capture the formatting of the last paragraph with text in a cell.
+
+        Args:
+            tc: w:tc element
+            header: capture from the last "Meeting ..." header line instead
+                    of the last content line
+
+        Returns:
+            CellPrototype, with has_text False when no such paragraph exists
+            (the last paragraph's pPr is used then)
+        """
+        paras = tc.findall(qn('w:p'))
+        ref = run = None
+        for p in reversed(paras):
+            r = _text_run(p)
+            text = ''.join(t.text or '' for t in p.iter(qn('w:t')))
+            if r is not None and bool(MEETING_HEADER_PATTERN.match(text)) == header:
+                ref, run = p, r
+                break
+        if ref is None and paras:
+            ref = paras[-1]
+        prototype = cls(
+            ref.find(qn('w:pPr')) if ref is not None else None,
+            run.find(qn('w:rPr')) if run is not None else None,
+        )
+        prototype.has_text = run is not None
+        return prototype
+
+    def unnumbered(self):
+        """Same formatting without list numbering (for meeting header lines)."""
+        if self.pPr is None or self.pPr.find(qn('w:numPr')) is None:
+            return self
+        return CellPrototype(_without(self.pPr, ('w:numPr',)), self.rPr)
+
+    def paragraph(self, text, bold=True):
+        """New w:p with the prototype formatting and the given text."""
+        p = copy.deepcopy(self._paragraphs[bool(bold)])
+        p[-1][-1].text = text
+        return p
+
+    def empty_paragraph(self):
+        """New w:p without text, spaced like the prototype paragraph."""
+        return copy.deepcopy(self._empty)
+
+
+class TablePrototypes:
+    """Per-column CellPrototypes of a section table, captured on first use.
+
+    A column's prototype comes from the last point row with text in that
+    column, so new lines look like the most recent content of the table.
+    Greyed-out rows (closed points) are only used when no other row has text.
+    """
+
+    # column -> (cell index in the row, capture a meeting header line)
+    COLUMNS = {
+        'number': (0, False),
+        'title': (1, False),
+        'header': (2, True),
+        'subject': (2, False),
+        'for_whom': (-2, False),
+        'due': (-1, False),
+    }
+
+    def __init__(self, table):
+        self._table = table
+        self._cells = {}
+
+    def cell(self, column):
+        """CellPrototype of a column, or None if no point row has text in it.
+
+        Without a meeting header line in the table, the 'header' prototype is
+        the 'subject' one without list numbering.
+        """
+        if column not in self._cells:
+            prototype = self._capture(*self.COLUMNS[column])
+            if prototype is None and column == 'header' and self.cell('subject'):
+                prototype = self.cell('subject').unnumbered()
+            self._cells[column] = prototype
+        return self._cells[column]
+
+    def _capture(self, idx, header):
+        muted = None
+        for tr in reversed(self._table._tbl.tr_lst[1:]):
+            tcs = tr.findall(qn('w:tc'))
+            # Point rows only: the header row (and FR title row) has no number
+            if len(tcs) < 3 or not _get_tc_text_simple(tcs[0]).strip()[:1].isdigit():
+                continue
+            prototype = CellPrototype.from_tc(tcs[idx], header)
+            if not prototype.has_text:
+                continue
+            if not prototype.muted:
+                return prototype
+            muted = muted or prototype
+        return muted
+
+
+def add_paragraphs_to_cell(cell, paragraphs, bold=True, prototype=None):
     """Add new paragraphs to a cell.
 
     Args:
         cell: docx cell object
         paragraphs: list of text strings to add
         bold: whether new text should be bold
+        prototype: CellPrototype to format the new paragraphs with (default:
+                   captured from the cell itself)
     """
+    tc = cell._tc
+    prototype = prototype or CellPrototype.from_tc(tc)
     for text in paragraphs:
-        new_para = cell.add_paragraph()
-        run = new_para.add_run(text)
-        run.bold = bold
-
-        # Copy font properties from last existing paragraph
-        existing_paras = cell.paragraphs
-        if len(existing_paras) > 1:
-            ref_para = existing_paras[-2]  # the one before our new one
-            if ref_para.runs:
-                ref_run = ref_para.runs[0]
-                if ref_run.font.size:
-                    run.font.size = ref_run.font.size
-                if ref_run.font.name:
-                    run.font.name = ref_run.font.name
-
-
-def update_existing_point(table, point_number, updates, new_meeting_number):
+        tc.append(prototype.paragraph(text, bold))
+
+
+def update_existing_point(table, point_number, updates, new_meeting_number, index=None):
     """Update an existing point in a subject table.
 
     Args:
@@ -252,53 +556,57 @@ def update_existing_point(table, point_number, updates, new_meeting_number):
             - for_whom: str, who is responsible
             - due: str, due date or status
         new_meeting_number: int, for the meeting header line
+        index: DocumentIndex of the document, to find the row without a scan
     """
-    for row in table.rows[1:]:
-        # Check actual XML cells for point number
-        tr = row._tr
-        tcs = tr.findall(qn('w:tc'))
-        if not tcs:
+    if index:
+        row = index.point_row(table, point_number)
+    else:
+        row = _index_point_rows(table).get(point_number)
+    if row is None:
+        return False
+
+    prototypes = index.prototypes(table) if index else TablePrototypes(table)
+
+    # Update subject cell
+    # Detect subject cell index (usually 2, but may vary with merged cells)
+    subject_cell = row.cells[2]
+
+    # Add meeting header + new content
+    meeting_date = updates.get('meeting_date', '')
+    header_text = f"Meeting {meeting_date}" if meeting_date else f"Meeting N{new_meeting_number}"
+
+    subject_prototype = prototypes.cell('subject') or CellPrototype.from_tc(subject_cell._tc)
+    add_paragraphs_to_cell(subject_cell, [header_text], bold=True,
+                           prototype=prototypes.cell('header') or subject_prototype.unnumbered())
+    add_paragraphs_to_cell(subject_cell, updates['subject_lines'], bold=True,
+                           prototype=subject_prototype)
+
+    # Update for_whom if provided (row.cells[3]), then due (last cell): pad
+    # with empty paragraphs to align the new value with the last subject line
+    for column, cell in (('for_whom', row.cells[3]), ('due', row.cells[-1])):
+        if not updates.get(column):
             continue
+        # Counted per column: with merged cells, row.cells[3] can be the
+        # subject cell itself, which then grows with the for whom value
+        subject_para_count = len(subject_cell._tc.p_lst)
+        tc = cell._tc
+        prototype = prototypes.cell(column) or CellPrototype.from_tc(tc)
+        for _ in range(subject_para_count - 1 - len(tc.p_lst)):
+            tc.append(prototype.empty_paragraph())
+        add_paragraphs_to_cell(cell, [updates[column]], bold=True, prototype=prototype)
 
-        first_cell_text = _get_tc_text_simple(tcs[0]).strip()
-        if first_cell_text != point_number:
-            continue
+    return True
 
-        # Found the row - update subject cell
-        # Detect subject cell index (usually 2, but may vary with merged cells)
-        subject_cell = row.cells[2]
-
-        # Add meeting header + new content
-        meeting_date = updates.get('meeting_date', '')
-        header_text = f"Meeting {meeting_date}" if meeting_date else f"Meeting N{new_meeting_number}"
-
-        add_paragraphs_to_cell(subject_cell, [header_text] + updates['subject_lines'], bold=True)
-
-        # Update for_whom if provided
-        if updates.get('for_whom'):
-            forwho_cell = row.cells[3]
-            # Add empty paragraphs to align, then the new value
-            subject_para_count = len(subject_cell.paragraphs)
-            forwho_para_count = len(forwho_cell.paragraphs)
-            # Pad with empty paragraphs to align
-            while forwho_para_count < subject_para_count - 1:
-                forwho_cell.add_paragraph('')
-                forwho_para_count += 1
-            add_paragraphs_to_cell(forwho_cell, [updates['for_whom']], bold=True)
-
-        # Update due if provided
-        if updates.get('due'):
-            due_cell = row.cells[-1]
-            subject_para_count = len(subject_cell.paragraphs)
-            due_para_count = len(due_cell.paragraphs)
-            while due_para_count < subject_para_count - 1:
-                due_cell.add_paragraph('')
-                due_para_count += 1
-            add_paragraphs_to_cell(due_cell, [updates['due']], bold=True)
-
-        return True
 
-    return False
+def _index_point_rows(table):
+    """Map the point numbers of a section table to their rows (first one wins)."""
+    rows = {}
+    for row in table.rows[1:]:
+        # Check actual XML cells for point number
+        tcs = row._tr.findall(qn('w:tc'))
+        if tcs:
+            rows.setdefault(_get_tc_text_simple(tcs[0]).strip(), row)
+    return rows
 
 
 def _get_tc_text_simple(tc):
@@ -317,7 +625,7 @@ def clone_table_row(table, source_row_idx=-1):
     Copies the full XML structure including cell formatting.
     Returns the new row element.
     """
-    source_tr = table.rows[source_row_idx]._tr
+    source_tr = table._tbl.tr_lst[source_row_idx]
     new_tr = copy.deepcopy(source_tr)
 
     # Clear all text content in the cloned row
@@ -333,11 +641,14 @@ def clone_table_row(table, source_row_idx=-1):
 
 
 def add_new_point(table, point_number, title, subject_lines, for_whom, due,
-                  meeting_date='', bold=True):
+                  meeting_date='', bold=True, index=None):
     """Add a new point row to a section table.
 
-    Clones the last data row for formatting, then fills in content.
+    Clones the last data row for formatting, then fills in content. The row is
+    registered in index, if given, so later updates of the point find it.
     """
+    prototypes = index.prototypes(table) if index else TablePrototypes(table)
+
     # Clone last row
     new_tr = clone_table_row(table)
 
@@ -346,51 +657,82 @@ def add_new_point(table, point_number, title, subject_lines, for_whom, due,
     if len(tcs) < 3:
         return
 
-    # Fill in N° cell
-    _set_tc_text(tcs[0], point_number, bold=bold)
-
-    # Fill in Title cell
-    _set_tc_text(tcs[1], title, bold=bold)
-
-    # Fill in Subject cell with meeting header + lines
     header = f"Meeting {meeting_date}" if meeting_date else "New point"
-    all_lines = [header] + subject_lines
-    _set_tc_paragraphs(tcs[2], all_lines, bold=bold)
-
-    # Fill in For whom cell (may be at index 3 or adjusted for gridSpan)
-    forwho_idx = len(tcs) - 2
-    _set_tc_text(tcs[forwho_idx], for_whom, bold=bold)
-
-    # Fill in Due cell
-    due_idx = len(tcs) - 1
-    _set_tc_text(tcs[due_idx], due, bold=bold)
-
-
-def _set_tc_text(tc, text, bold=False):
-    """Set text in a table cell XML element, preserving paragraph structure."""
-    paras = tc.findall(qn('w:p'))
-    if not paras:
-        p = OxmlElement('w:p')
+    # N°, Title, Subject (meeting header + lines), For whom and Due (the last
+    # two cells: the for whom cell may not be at index 3 because of gridSpan)
+    cells = (
+        (tcs[0], [('number', point_number)]),
+        (tcs[1], [('title', title)]),
+        (tcs[2], [('header', header)] + [('subject', line) for line in subject_lines]),
+        (tcs[-2], [('for_whom', for_whom)]),
+        (tcs[-1], [('due', due)]),
+    )
+    for tc, lines in cells:
+        fallback = None
+        paragraphs = []
+        for column, text in lines:
+            prototype = prototypes.cell(column)
+            if prototype is None:
+                # No point row to copy from (blank template): keep the
+                # paragraph formatting of the cloned row
+                fallback = fallback or CellPrototype.from_tc(tc)
+                prototype = fallback
+            paragraphs.append(prototype.paragraph(text, bold))
+        _replace_tc_paragraphs(tc, paragraphs)
+
+    if index:
+        index.add_point_row(table, point_number.strip(), new_tr)
+
+
+def _replace_tc_paragraphs(tc, paragraphs):
+    """Replace the paragraphs of a table cell XML element."""
+    for p in tc.findall(qn('w:p')):
+        tc.remove(p)
+    for p in paragraphs:
         tc.append(p)
-        paras = [p]
 
-    # Use first paragraph, add a run
-    p = paras[0]
+
+def _plain_run(bold):
     run = OxmlElement('w:r')
     if bold:
         rPr = OxmlElement('w:rPr')
-        b = OxmlElement('w:b')
-        rPr.append(b)
+        rPr.append(OxmlElement('w:b'))
         run.append(rPr)
-    t = OxmlElement('w:t')
-    t.text = text
-    t.set(qn('xml:space'), 'preserve')
-    run.append(t)
-    p.append(run)
+    run.append(OxmlElement('w:t', {qn('xml:space'): 'preserve'}))
+    return run
+
+
+# Runs for tables without any text run to take the formatting from
+_PLAIN_RUNS = {bold: _plain_run(bold) for bold in (True, False)}
+
+
+def _table_runs(trs):
+    """Bold and normal empty runs formatted like the first text run of the rows.
+
+    Falls back to _PLAIN_RUNS when the rows have no text. Grey and italics of
+    closed content are not carried over.
+    """
+    source = next((r for tr in trs for r in tr.iter(qn('w:r')) if _has_text(r)), None)
+    if source is None:
+        return _PLAIN_RUNS
+    rPr = source.find(qn('w:rPr'))
+    if _is_muted(rPr):
+        rPr = _without(rPr, _MUTED_TAGS)
+    return {bold: _make_run(rPr, bold) for bold in (True, False)}
+
+
+def _new_run(text, bold, runs=_PLAIN_RUNS):
+    run = copy.deepcopy(runs[bool(bold)])
+    run[-1].text = text
+    return run
 
 
-def _set_tc_paragraphs(tc, lines, bold=False):
-    """Set multiple paragraphs in a table cell."""
+def _set_tc_paragraphs(tc, lines, bold=False, runs=_PLAIN_RUNS):
+    """Set multiple paragraphs in a table cell.
+
+    Args:
+        runs: {bold: empty w:r} the runs are copied from (see _table_runs)
+    """
     paras = tc.findall(qn('w:p'))
 
     for i, text in enumerate(lines):
@@ -399,49 +741,19 @@ def _set_tc_paragraphs(tc, lines, bold=False):
         else:
             p = OxmlElement('w:p')
             tc.append(p)
-
-        run = OxmlElement('w:r')
-        if bold:
-            rPr = OxmlElement('w:rPr')
-            b = OxmlElement('w:b')
-            rPr.append(b)
-            run.append(rPr)
-        t = OxmlElement('w:t')
-        t.text = text
-        t.set(qn('xml:space'), 'preserve')
-        run.append(t)
-        p.append(run)
+        p.append(_new_run(text, bold, runs))
 
 
-def find_section_table(doc, section_name):
+def find_section_table(doc, section_name, index=None):
     """Find the table corresponding to a section name.
 
     Matching strategy:
     1. Exact section name match in header text
     2. Fallback: any table with subject-type headers (N°, Sujet, Subject)
-    """
-    # First pass: exact match
-    for table in doc.tables:
-        if len(table.rows) < 2:
-            continue
-        header_text = ' '.join(c.text for c in table.rows[0].cells)
-        if section_name.lower() in header_text.lower():
-            return table
-
-    # Second pass: find any subject-type table (for single-table formats like CORUM)
-    for table in doc.tables:
-        if len(table.rows) < 1:
-            continue
-        header_text = ' '.join(c.text.lower() for c in table.rows[0].cells)
-        is_subject = (
-            'subject' in header_text or 'sujet' in header_text
-            or 'n°' in header_text or 'n\u00b0' in header_text
-            or re.search(r'd\d+\s*[-–]', header_text)
-        )
-        if is_subject:
-            return table
 
-    return None
+    Pass the document's DocumentIndex to reuse its classification and cache.
+    """
+    return (index or DocumentIndex(doc)).section_table(section_name)
 
 
 def _strip_cell_shading(tr):
@@ -457,76 +769,92 @@ def _strip_cell_shading(tr):
                 tcPr.remove(shd)
 
 
-def update_info_exchange(doc, items):
+def replace_table_rows(table, rows, bold=False, source_row=0, header_rows=1):
+    """Replace all data rows of a table in one splice.
+
+    Every new row is a copy of one cleaned prototype: the source row with its
+    shading and runs removed, prepared once. The text runs copy the formatting
+    (font, size, color) of the first text run of the replaced rows. The rows
+    are built in a batch and inserted after the header rows in place of the
+    old ones, so rebuilding a table is linear in its number of rows.
+
+    Args:
+        table: docx table
+        rows: list of rows, each a list of cell values; a value is a str (one
+              paragraph) or a list of str (one paragraph per line). Cells
+              without a value are left empty.
+        bold: bool for all rows, or a list with one bool per row
+        source_row: index of the row whose structure the new rows copy (the
+                    header row by default)
+        header_rows: number of leading rows kept (0 replaces every row)
+    """
+    tbl = table._tbl
+    trs = tbl.tr_lst
+    prototype = copy.deepcopy(trs[source_row])
+    _strip_cell_shading(prototype)
+    for r in prototype.xpath('./w:tc/w:p/w:r'):
+        r.getparent().remove(r)
+    runs = _table_runs(trs[header_rows:])
+
+    if not isinstance(bold, (list, tuple)):
+        bold = [bold] * len(rows)
+
+    new_trs = []
+    for values, row_bold in zip(rows, bold):
+        tr = copy.deepcopy(prototype)
+        for tc, value in zip(tr.findall(qn('w:tc')), values):
+            lines = value if isinstance(value, (list, tuple)) else [value]
+            _set_tc_paragraphs(tc, lines, bold=row_bold, runs=runs)
+        new_trs.append(tr)
+
+    # The new rows go where the first replaced row was: after the kept header
+    # rows, or right after tblPr / tblGrid when no row is kept
+    if header_rows:
+        position = tbl.index(trs[header_rows - 1]) + 1
+    else:
+        position = tbl.index(trs[0])
+    for tr in trs[header_rows:]:
+        tbl.remove(tr)
+    tbl[position:position] = new_trs
+
+
+def update_info_exchange(doc, items, index=None):
     """Update the information exchange table.
 
     Args:
         items: list of dicts with {from_whom, status, content, due_date}
+        index: DocumentIndex of the document (built if not given)
     """
-    # Find info exchange table
-    for table in doc.tables:
-        if len(table.rows) < 2:
-            continue
-        header = ' '.join(c.text.lower() for c in table.rows[0].cells)
-        if 'from whom' in header or 'de qui' in header:
-            # Clear existing data rows
-            while len(table.rows) > 1:
-                tr = table.rows[-1]._tr
-                table._tbl.remove(tr)
-
-            # Add new rows
-            for item in items:
-                new_tr = clone_table_row(table, 0)  # Clone from header for structure
-                _strip_cell_shading(new_tr)
-                tcs = new_tr.findall(qn('w:tc'))
-                # Clear header text
-                for tc in tcs:
-                    for p in tc.findall(qn('w:p')):
-                        for r in p.findall(qn('w:r')):
-                            p.remove(r)
-
-                if len(tcs) >= 4:
-                    _set_tc_text(tcs[0], item['from_whom'])
-                    _set_tc_text(tcs[1], item['status'])
-                    _set_tc_text(tcs[2], item['content'])
-                    _set_tc_text(tcs[3], item['due_date'])
-            return
-
-
-def update_planning(doc, items):
+    table = (index or DocumentIndex(doc)).info_exchange_table
+    if table is None:
+        return
+
+    # New rows take the structure of the header row
+    replace_table_rows(table, [
+        [item['from_whom'], item['status'], item['content'], item['due_date']]
+        for item in items
+    ])
+
+
+def update_planning(doc, items, index=None):
     """Update the planning table.
 
     Args:
         items: list of dicts with {content, is_new}
+        index: DocumentIndex of the document (built if not given)
     """
-    for table in doc.tables:
-        if len(table.rows) < 2:
-            continue
-        header = table.rows[0].cells[0].text.lower()
-        if 'planning' in header and len(table.columns) == 1:
-            # Clear existing data rows
-            while len(table.rows) > 1:
-                tr = table.rows[-1]._tr
-                table._tbl.remove(tr)
-
-            # Add new rows
-            for item in items:
-                new_tr = clone_table_row(table, 0)
-                _strip_cell_shading(new_tr)
-                tcs = new_tr.findall(qn('w:tc'))
-                for tc in tcs:
-                    for p in tc.findall(qn('w:p')):
-                        for r in p.findall(qn('w:r')):
-                            p.remove(r)
-
-                if tcs:
-                    bold = item.get('is_new', False)
-                    lines = item['content'].split('\n')
-                    _set_tc_paragraphs(tcs[0], lines, bold=bold)
-            return
-
-
-def generate_report(previous_path, output_path, updates):
+    table = (index or DocumentIndex(doc)).planning_table
+    if table is None:
+        return
+
+    replace_table_rows(
+        table,
+        [[item['content'].split('\n')] for item in items],
+        bold=[item.get('is_new', False) for item in items],
+    )
+
+
+def generate_report(previous_path, output_path, updates, pool=None, patched_save=False):
     """Generate a new meeting report from the previous one + updates.
 
     Args:
@@ -557,14 +885,30 @@ def generate_report(previous_path, output_path, updates):
                 due: str,
                 meeting_date: str
               }
+        pool: True (process-wide document_pool.DEFAULT_POOL) or a DocumentPool
+              to start from a warm in-memory copy of the previous report
+              instead of copying and re-parsing the file
+        patched_save: opt-in; write only word/document.xml fresh and copy
+                      every other entry of the previous report's archive as is
+                      (see docx_package.save_patched). Edits to any other part
+                      (headers, styles, ...) would be lost, so the default
+                      re-serializes the whole package with Document.save()
     """
     # Step 1: Copy previous report
-    doc = copy_report(previous_path, output_path)
+    if pool is True:
+        pool = DEFAULT_POOL
+    if pool:
+        doc = pool.document(previous_path)
+    else:
+        doc = copy_report(previous_path, output_path)
 
     new_num = updates['meeting_number']
 
+    # Classify the tables once; every step below looks up through the index
+    index = DocumentIndex(doc)
+
     # Step 2: Un-bold all previous "latest" content
-    unbold_all_content(doc)
+    unbold_all_content(doc, index)
 
     # Step 3: Update metadata
     update_metadata(
@@ -582,18 +926,19 @@ def generate_report(previous_path, output_path, updates):
 
     # Step 5: Update existing points
     for pu in updates.get('point_updates', []):
-        section_table = find_section_table(doc, pu['section'])
+        section_table = index.section_table(pu['section'])
         if section_table:
             update_existing_point(
                 section_table,
                 pu['number'],
                 pu,
                 new_num,
+                index=index,
             )
 
     # Step 6: Add new points
     for np_data in updates.get('new_points', []):
-        section_table = find_section_table(doc, np_data['section'])
+        section_table = index.section_table(np_data['section'])
         if section_table:
             add_new_point(
                 section_table,
@@ -603,18 +948,22 @@ def generate_report(previous_path, output_path, updates):
                 np_data['for_whom'],
                 np_data['due'],
                 np_data.get('meeting_date', ''),
+                index=index,
             )
 
     # Step 7: Update info exchange if provided
     if updates.get('info_exchange'):
-        update_info_exchange(doc, updates['info_exchange'])
+        update_info_exchange(doc, updates['info_exchange'], index)
 
     # Step 8: Update planning if provided
     if updates.get('planning'):
-        update_planning(doc, updates['planning'])
+        update_planning(doc, updates['planning'], index)
 
     # Step 9: Save
-    doc.save(output_path)
+    if patched_save:
+        save_patched(doc, previous_path, output_path)
+    else:
+        doc.save(output_path)
     return output_path
 
 
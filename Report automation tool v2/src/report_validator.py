@@ -0,0 +1,198 @@
+"""
+Report Validator - Check the references of an updates dict against the parsed report.
+
+validate_updates() only checks the shape of the model output. The generator then
+looks sections up by name and points by number: a section name that does not match
+falls back to the first subject table, and an unknown point number is silently
+skipped. This module resolves every reference before generation, using hash
+indexes built once from the parsed report:
+
+- section names are normalized (case, accents, punctuation, "D3 -" prefixes) and
+  matched exactly, then by containment, then fuzzily (difflib ratio)
+- point numbers are normalized ("4.1", "04.01" and "04.01." are the same point)
+  and mapped to the sections that contain them
+
+References that resolve unambiguously are corrected in place (canonical section
+name, point number exactly as written in the report); the others are reported.
+"""
+
+import difflib
+import re
+import unicodedata
+
+
+SECTION_MATCH_CUTOFF = 0.75   # minimum difflib ratio for a fuzzy section match
+
+SECTION_PREFIX_PATTERN = re.compile(r'^d\d+\s+')
+
+
+def normalize_section(name):
+    """Lowercase, strip accents, punctuation and a leading "D3 -" section prefix."""
+    text = unicodedata.normalize("NFKD", name or "")
+    text = "".join(c for c in text if not unicodedata.combining(c)).lower()
+    text = " ".join(re.sub(r'[^a-z0-9]+', ' ', text).split())
+    return SECTION_PREFIX_PATTERN.sub('', text)
+
+
+def normalize_number(number):
+    """Canonical point number: "4.1", "04.01" and "04.01." all become "04.01"."""
+    parts = [p for p in re.split(r'[.\s]+', str(number or "").strip()) if p]
+    return ".".join(p.zfill(2) if p.isdigit() else p.upper() for p in parts)
+
+
+class ReportIndex:
+    """Section and point lookups for one parsed report.
+
+    Args:
+        parsed_report: dict from report_parser.parse_report()
+    """
+
+    def __init__(self, parsed_report):
+        self.sections = {}      # normalized name -> section name as in the report
+        self.points = {}        # normalized number -> {section name: number as written}
+        self.shared_names = set()
+        self.duplicates = []
+
+        for section in parsed_report.get("sections", []):
+            name = section["section_name"]
+            key = normalize_section(name)
+            if key in self.sections:
+                # The generator matches tables by name: only the first one is reachable
+                self.shared_names.add(self.sections[key])
+            else:
+                self.sections[key] = name
+            canonical = self.sections[key]
+            for point in section.get("points", []):
+                number = normalize_number(point.get("number"))
+                if not number:
+                    continue
+                in_sections = self.points.setdefault(number, {})
+                if canonical in in_sections:
+                    self.duplicates.append(f"point {point['number']} appears twice in '{canonical}'")
+                else:
+                    in_sections[canonical] = point["number"]
+
+    def resolve_section(self, name):
+        """Return the report's name for a section name, or None if nothing matches."""
+        key = normalize_section(name)
+        if not key:
+            return None
+        if key in self.sections:
+            return self.sections[key]
+        containing = {s for k, s in self.sections.items() if key in k or k in key}
+        if len(containing) == 1:
+            return containing.pop()
+        close = difflib.get_close_matches(key, list(self.sections), n=2,
+                                          cutoff=SECTION_MATCH_CUTOFF)
+        if len(close) == 1 or (close and _ratio(key, close[0]) > _ratio(key, close[1])):
+            return self.sections[close[0]]
+        return None
+
+    def find_point(self, number):
+        """Return {section name: number as written} for a point number ({} if unknown)."""
+        return self.points.get(normalize_number(number), {})
+
+
+def _ratio(a, b):
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+def check_references(updates, parsed_report, index=None):
+    """Resolve and correct the section and point references of an updates dict.
+
+    Existing points must exist in the report (their section is corrected if the
+    number is only found in another section) and be updated once; new points
+    must not reuse a number of the report or of another new point. Points whose
+    number appears twice in one section of the report are reported as well (the
+    generator only reaches the first). Corrections are applied in place.
+
+    Args:
+        updates: dict from ai_analyzer.analyze_meeting()
+        parsed_report: the report the updates were generated against
+        index: a ReportIndex of parsed_report, to reuse across calls
+
+    Returns:
+        tuple: (fixes: list[str], errors: list[str])
+    """
+    index = index or ReportIndex(parsed_report)
+    fixes = []
+    errors = list(index.duplicates)
+
+    updated = {}
+    for i, pu in enumerate(updates.get("point_updates", [])):
+        if not isinstance(pu, dict) or "number" not in pu:
+            continue
+        label = f"point_updates[{i}]"
+        section = index.resolve_section(pu.get("section"))
+        found = index.find_point(pu["number"])
+        if not found:
+            errors.append(f"{label}: point {pu['number']} does not exist in the report")
+            continue
+        if section not in found:
+            if len(found) > 1:
+                errors.append(
+                    f"{label}: point {pu['number']} exists in several sections "
+                    f"({', '.join(found)}), none matching '{pu.get('section')}'"
+                )
+                continue
+            section = next(iter(found))
+        _correct(pu, "section", section, label, fixes)
+        _correct(pu, "number", found[section], label, fixes)
+        if section in index.shared_names:
+            errors.append(
+                f"{label}: several tables are named '{section}', only the first can be updated"
+            )
+        key = (section, normalize_number(pu["number"]))
+        if key in updated:
+            errors.append(
+                f"{label}: point {pu['number']} duplicates point_updates[{updated[key]}]"
+            )
+        else:
+            updated[key] = i
+
+    new_numbers = {}
+    for i, np_data in enumerate(updates.get("new_points", [])):
+        if not isinstance(np_data, dict) or "number" not in np_data:
+            continue
+        label = f"new_points[{i}]"
+        section = index.resolve_section(np_data.get("section"))
+        if section is None:
+            errors.append(f"{label}: unknown section '{np_data.get('section')}'")
+        else:
+            _correct(np_data, "section", section, label, fixes)
+
+        number = normalize_number(np_data["number"])
+        existing = index.find_point(number)
+        if section in existing or (section is None and existing):
+            errors.append(f"{label}: point {np_data['number']} already exists in the report")
+        if number in new_numbers:
+            errors.append(
+                f"{label}: point {np_data['number']} duplicates new_points[{new_numbers[number]}]"
+            )
+        else:
+            new_numbers[number] = i
+
+    return fixes, errors
+
+
+def _correct(item, field, value, label, fixes):
+    if item.get(field) != value:
+        fixes.append(f"{label}.{field}: '{item.get(field)}' -> '{value}'")
+        item[field] = value
+
+
+def apply_reference_check(updates, parsed_report, index=None):
+    """Run check_references() and record its outcome in the updates dict.
+
+    Fixes are listed in updates["reference_fixes"]; remaining errors are added
+    to updates["validation_warnings"]. Error results are returned unchanged.
+    """
+    if "error" in updates:
+        return updates
+    fixes, errors = check_references(updates, parsed_report, index)
+    if fixes:
+        updates["reference_fixes"] = fixes
+    if errors:
+        warnings = updates.setdefault("validation_warnings", [])
+        warnings.extend(e for e in errors if e not in warnings)
+    return updates
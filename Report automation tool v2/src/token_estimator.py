@@ -0,0 +1,107 @@
+"""
+Token Estimator - Offline approximation of Claude token counts.
+
+Used to budget prompt pieces (transcript chunks, report context) before anything is
+sent to the API. The estimate is deliberately simple and slightly pessimistic: French
+and English meeting text averages close to 3.5 characters per token.
+
+The ratio can be calibrated against real usage: calibrate_from_fixtures() fits it
+to the request/response pairs saved by transport.RecordTransport, and
+set_chars_per_token() makes every later estimate use the fitted value.
+"""
+
+import json
+import math
+from pathlib import Path
+
+
+CHARS_PER_TOKEN = 3.5
+
+# Ratio used by estimate_tokens(); CHARS_PER_TOKEN until calibrated
+_chars_per_token = CHARS_PER_TOKEN
+
+
+def estimate_tokens(text):
+    """Estimate the number of tokens in a string."""
+    if not text:
+        return 0
+    return math.ceil(len(text) / _chars_per_token)
+
+
+def chars_to_tokens(chars):
+    """Estimate the number of tokens in a string of the given length."""
+    return math.ceil(chars / _chars_per_token)
+
+
+def set_chars_per_token(chars_per_token):
+    """Use a calibrated characters-per-token ratio for all later estimates.
+
+    None restores the default CHARS_PER_TOKEN.
+    """
+    global _chars_per_token
+    _chars_per_token = chars_per_token or CHARS_PER_TOKEN
+
+
+def request_text(request):
+    """Concatenate the prompt text of Messages API request kwargs.
+
+    System prompt, message contents (strings or text blocks) and the tool
+    definitions are included, in the form they are sent.
+    """
+    parts = []
+    system = request.get("system")
+    if isinstance(system, str):
+        parts.append(system)
+    for message in request.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            parts.append(content)
+            continue
+        for block in content or []:
+            if isinstance(block, dict) and block.get("type") == "text":
+                parts.append(block.get("text", ""))
+    if request.get("tools"):
+        parts.append(json.dumps(request["tools"], ensure_ascii=False))
+    return "\n".join(parts)
+
+
+def calibrate(samples):
+    """Fit the characters-per-token ratio to measured token counts.
+
+    Args:
+        samples: iterable of (text, actual_tokens) pairs
+
+    Returns:
+        float: total characters / total tokens, or None without usable samples
+    """
+    chars = 0
+    tokens = 0
+    for text, actual_tokens in samples:
+        if actual_tokens > 0:
+            chars += len(text)
+            tokens += actual_tokens
+    return chars / tokens if tokens else None
+
+
+def calibrate_from_fixtures(fixtures_dir, fixed_tokens=0):
+    """Fit the ratio to recorded request/response fixtures.
+
+    Args:
+        fixtures_dir: directory written by transport.RecordTransport
+        fixed_tokens: tokens of every request that are not in its text (e.g. the
+                      system prompt the API adds for tool use); subtracted from
+                      the recorded input_tokens
+
+    Returns:
+        float or None: see calibrate()
+    """
+    samples = []
+    for path in sorted(Path(fixtures_dir).glob("*.json")):
+        with open(path, 'r', encoding='utf-8') as f:
+            fixture = json.load(f)
+        request = fixture["request"]
+        input_tokens = fixture["response"]["usage"]["input_tokens"]
+        if request.get("tools"):
+            input_tokens -= fixed_tokens
+        samples.append((request_text(request), input_tokens))
+    return calibrate(samples)
@@ -471,6 +471,69 @@ def format_clean_transcript(result):
     return '\n'.join(lines)
 
 
+# Turn header line produced by format_clean_transcript: "[00:06 - 01:03] Speaker:"
+FORMATTED_TURN_PATTERN = re.compile(r'^\[\d+h?\d{1,2}:\d{2} - \d+h?\d{1,2}:\d{2}\] .+:$')
+
+
+def split_formatted_transcript(text):
+    """Split a formatted cleaned transcript into its header and turn blocks.
+
+    Works on the output of format_clean_transcript(). Leexi transcripts are split
+    at each "[start - end] Speaker:" line; plain text transcripts are split at blank
+    lines, with the trailing meeting notes / agenda kept as a single block.
+
+    Returns:
+        tuple: (header: str, blocks: list[str])
+    """
+    lines = text.split('\n')
+
+    if any(FORMATTED_TURN_PATTERN.match(line) for line in lines):
+        header_lines = []
+        blocks = []
+        current = None
+        for line in lines:
+            if FORMATTED_TURN_PATTERN.match(line):
+                if current is not None:
+                    blocks.append('\n'.join(current).strip())
+                current = [line]
+            elif current is None:
+                header_lines.append(line)
+            else:
+                current.append(line)
+        if current is not None:
+            blocks.append('\n'.join(current).strip())
+        return '\n'.join(header_lines).strip(), blocks
+
+    # Plain text: header runs until the first blank line
+    header_lines = []
+    body_start = len(lines)
+    for i, line in enumerate(lines):
+        if not line.strip():
+            body_start = i + 1
+            break
+        header_lines.append(line)
+
+    blocks = []
+    current = []
+    body = lines[body_start:]
+    for i, line in enumerate(body):
+        if line.startswith('=== MEETING NOTES'):
+            if current:
+                blocks.append('\n'.join(current))
+            blocks.append('\n'.join(body[i:]).strip())
+            current = []
+            break
+        if line.strip():
+            current.append(line)
+        elif current:
+            blocks.append('\n'.join(current))
+            current = []
+    if current:
+        blocks.append('\n'.join(current))
+
+    return '\n'.join(header_lines).strip(), blocks
+
+
 def main():
     """CLI entry point."""
     if len(sys.argv) < 2:
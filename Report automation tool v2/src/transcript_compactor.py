@@ -0,0 +1,204 @@
+"""
+Transcript Compactor - Relevance-ranked selection of transcript turns to a token budget.
+
+Instead of keeping the first N characters of a long transcript, each cleaned turn is
+scored against the report's point titles, subjects and section names with BM25, and
+the highest-value turns (plus their neighbours, for context) are packed into a token
+budget. Selected turns keep their chronological order; off-topic chatter such as the
+connection checks at the start of a call is dropped before it costs tokens.
+
+Everything runs locally: no network, and scoring a 90-minute meeting takes a few
+milliseconds.
+"""
+
+import math
+import re
+import unicodedata
+from collections import Counter
+
+try:
+    from .token_estimator import estimate_tokens
+    from .transcript_cleaner import split_formatted_transcript
+except ImportError:  # imported as a flat module from src/
+    from token_estimator import estimate_tokens
+    from transcript_cleaner import split_formatted_transcript
+
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Turns kept on each side of a selected turn
+NEIGHBOUR_TURNS = 1
+
+# Marks dropped turns in the compacted transcript; parts are joined by blank lines
+GAP_MARKER = "[...]"
+GAP_SEPARATOR = "\n\n"
+
+# Crude stemming: terms are cut to this many characters ("sprinklage" -> "sprinkl")
+STEM_LENGTH = 7
+
+STOPWORDS = {
+    # French
+    "alors", "aussi", "avec", "avoir", "bien", "cela", "cest", "comme", "dans", "donc",
+    "elle", "elles", "encore", "enfin", "est", "etait", "etre", "fait", "faire", "faut",
+    "ils", "leur", "leurs", "mais", "meme", "nous", "parce", "pas", "peu", "peut", "plus",
+    "pour", "quand", "que", "quel", "quelle", "qui", "quoi", "sans", "ses", "sont", "sur",
+    "tout", "tous", "tres", "une", "vais", "voila", "vous", "des", "les", "aux", "par",
+    "ont", "deja", "oui", "non", "ici", "cette", "ces", "son", "sera", "avant", "apres",
+    # English
+    "about", "also", "and", "are", "been", "but", "can", "for", "from", "has", "have",
+    "here", "its", "just", "not", "now", "our", "that", "the", "then", "there", "they",
+    "this", "was", "were", "what", "when", "which", "will", "with", "would", "you",
+    "your", "yes", "okay", "meeting",
+}
+
+
+def tokenize(text):
+    """Split text into normalized terms (lowercase, accents folded, stemmed)."""
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return [
+        word[:STEM_LENGTH]
+        for word in re.findall(r"[a-z0-9]+", folded)
+        if len(word) > 2 and word not in STOPWORDS
+    ]
+
+
+def build_report_query(parsed_report):
+    """Build the weighted query terms from the parse_report() output.
+
+    Point titles and section names weigh double compared to subject text.
+
+    Returns:
+        dict: {term: weight}
+    """
+    counts = Counter()
+    for section in parsed_report.get("sections", []):
+        for term in tokenize(section.get("section_name", "")):
+            counts[term] += 2
+        for point in section.get("points", []):
+            for term in tokenize(point.get("title", "")):
+                counts[term] += 2
+            for para in point.get("subject_paragraphs", []):
+                counts.update(tokenize(para.get("text", "")))
+    for item in parsed_report.get("info_exchange", []):
+        counts.update(tokenize(item.get("content", "")))
+    for item in parsed_report.get("planning", []):
+        counts.update(tokenize(item.get("content", "")))
+
+    return {term: 1 + math.log(count) for term, count in counts.items()}
+
+
+def score_turns(turns, query):
+    """Score each turn against the query with BM25.
+
+    An inverted index (term -> {turn index: frequency}) is built over the turns,
+    so scoring only touches terms that occur in both the query and the turn.
+
+    Returns:
+        list[float]: one score per turn
+    """
+    index = {}
+    lengths = []
+    for ti, turn in enumerate(turns):
+        terms = tokenize(turn)
+        lengths.append(len(terms))
+        for term, tf in Counter(terms).items():
+            if term in query:
+                index.setdefault(term, {})[ti] = tf
+
+    n = len(turns)
+    avg_length = (sum(lengths) / n) if n else 0
+    scores = [0.0] * n
+    for term, postings in index.items():
+        idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+        weight = query[term] * idf
+        for ti, tf in postings.items():
+            norm = 1 - BM25_B + BM25_B * lengths[ti] / avg_length if avg_length else 1
+            scores[ti] += weight * tf * (BM25_K1 + 1) / (tf + BM25_K1 * norm)
+    return scores
+
+
+def _gap_count(selected, n_turns):
+    """Number of "[...]" markers written for the selected turn indices."""
+    gaps = 0
+    previous = -1
+    for ti in sorted(selected):
+        if ti != previous + 1:
+            gaps += 1
+        previous = ti
+    if previous != n_turns - 1:
+        gaps += 1
+    return gaps
+
+
+def compact_transcript(cleaned_text, parsed_report, token_budget,
+                       neighbours=NEIGHBOUR_TURNS):
+    """Keep the most report-relevant turns of a transcript within a token budget.
+
+    Turns are taken in decreasing score order, each together with its
+    neighbours, until the budget is full. Turns that match nothing in the report
+    are never selected for their own sake. Gaps are marked with "[...]".
+
+    Args:
+        cleaned_text: formatted string from transcript_cleaner.format_clean_transcript()
+        parsed_report: dict from report_parser.parse_report()
+        token_budget: maximum estimated tokens of the returned transcript,
+                      gap markers and separators included
+        neighbours: turns kept on each side of a selected turn
+
+    Returns:
+        tuple: (compacted_text: str, stats: dict)
+    """
+    tokens_before = estimate_tokens(cleaned_text)
+    header, turns = split_formatted_transcript(cleaned_text)
+    stats = {
+        "tokens_before": tokens_before,
+        "tokens_after": tokens_before,
+        "total_turns": len(turns),
+        "kept_turns": len(turns),
+    }
+    if tokens_before <= token_budget or not turns:
+        return cleaned_text, stats
+
+    scores = score_turns(turns, build_report_query(parsed_report))
+    turn_tokens = [estimate_tokens(t) for t in turns]
+    # Every kept turn and "[...]" marker is joined with a blank line. Each piece
+    # is estimated on its own, which never undercounts the joined text.
+    separator_tokens = estimate_tokens(GAP_SEPARATOR)
+    marker_tokens = estimate_tokens(GAP_SEPARATOR + GAP_MARKER)
+
+    fixed = estimate_tokens(header) + estimate_tokens("\n")
+    kept_tokens = 0
+    selected = set()
+    for ti in sorted(range(len(turns)), key=lambda i: scores[i], reverse=True):
+        if scores[ti] <= 0:
+            break
+        group = [
+            i for i in range(max(0, ti - neighbours), min(len(turns), ti + neighbours + 1))
+            if i not in selected
+        ]
+        candidate = selected.union(group)
+        cost = kept_tokens + sum(turn_tokens[i] for i in group)
+        total = (fixed + cost + len(candidate) * separator_tokens
+                 + _gap_count(candidate, len(turns)) * marker_tokens)
+        if total > token_budget:
+            continue
+        selected = candidate
+        kept_tokens = cost
+
+    parts = [header]
+    previous = -1
+    for ti in sorted(selected):
+        if ti != previous + 1:
+            parts.append(GAP_MARKER)
+        parts.append(turns[ti])
+        previous = ti
+    if previous != len(turns) - 1:
+        parts.append(GAP_MARKER)
+
+    compacted = GAP_SEPARATOR.join(parts) + "\n"
+    stats["tokens_after"] = estimate_tokens(compacted)
+    stats["kept_turns"] = len(selected)
+    return compacted, stats
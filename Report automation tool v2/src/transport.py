@@ -0,0 +1,419 @@
+"""
+Transport - Pluggable backends for the Anthropic calls made by ai_analyzer.
+
+By default every analysis goes to the live API. A transport replaces the client so
+the whole pipeline (service, chunking, repair, feedback, streaming) can run offline:
+
+- RecordTransport: calls the live API and saves each request/response pair as a
+  fixture file named after the request hash
+- ReplayTransport: serves saved fixtures by request hash, no network
+- SyntheticTransport: generates responses with a configurable latency
+  distribution and injected failures (429/529, truncation at max_tokens,
+  malformed JSON, schema-invalid output), reproducible from a seed
+
+Usage:
+    ai_analyzer.set_transport(SyntheticTransport(seed=1, rate_limit_rate=0.1))
+    updates = ai_analyzer.analyze_meeting(parsed_report, cleaned_text, api_key=None)
+
+A transport provides client() (sync, used for streaming) and async_client() (used
+by AnalyzerService); both expose messages.create() and the sync one messages.stream().
+"""
+
+import asyncio
+import copy
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import anthropic
+from anthropic.types import (
+    InputJSONDelta, Message, RawContentBlockDeltaEvent, TextDelta,
+)
+
+try:
+    from .token_estimator import estimate_tokens
+except ImportError:  # imported as a flat module from src/
+    from token_estimator import estimate_tokens
+
+
+STREAM_CHUNK_CHARS = 40     # characters per synthetic streaming delta
+TIME_TO_FIRST_TOKEN = 0.2   # share of the latency spent before the first delta
+
+# Default structured output of the synthetic backend, per forced tool
+SYNTHETIC_PAYLOADS = {
+    "record_updates": {
+        "meeting_number": 1,
+        "date": None,
+        "distribution_date": None,
+        "next_meeting": None,
+        "point_updates": [],
+        "new_points": [],
+        "info_exchange": [],
+        "planning": [],
+    },
+    "record_compact_updates": {
+        "n": 1, "d": None, "dd": None, "nm": None,
+        "pu": [], "np": [], "ie": [], "pl": [],
+    },
+    "record_repairs": {"fragments": []},
+    "record_patch": {"operations": []},
+}
+
+
+def request_hash(request):
+    """Stable hash of the request kwargs, used as the fixture key."""
+    canonical = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _message_events(message):
+    """Yield content_block_delta events that rebuild a message's content."""
+    for index, block in enumerate(message.content):
+        if block.type == "tool_use":
+            text = json.dumps(block.input, ensure_ascii=False)
+            make_delta = lambda chunk: InputJSONDelta(type="input_json_delta", partial_json=chunk)
+        elif block.type == "text":
+            text = block.text
+            make_delta = lambda chunk: TextDelta(type="text_delta", text=chunk)
+        else:
+            continue
+        for i in range(0, len(text), STREAM_CHUNK_CHARS):
+            yield RawContentBlockDeltaEvent(
+                type="content_block_delta", index=index,
+                delta=make_delta(text[i:i + STREAM_CHUNK_CHARS]),
+            )
+
+
+class _Response:
+    """Minimal HTTP response carried by injected APIStatusError instances."""
+
+    def __init__(self, status_code, headers):
+        self.status_code = status_code
+        self.headers = headers
+        self.request = None
+
+
+class _FakeStream:
+    """Stands in for the SDK MessageStream: iterates delta events, then the final message."""
+
+    def __init__(self, message, latency):
+        self._message = message
+        self._latency = latency
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __iter__(self):
+        events = list(_message_events(self._message))
+        time.sleep(self._latency * TIME_TO_FIRST_TOKEN)
+        pause = self._latency * (1 - TIME_TO_FIRST_TOKEN) / max(1, len(events))
+        for event in events:
+            yield event
+            time.sleep(pause)
+
+    def get_final_message(self):
+        return self._message
+
+
+class _Messages:
+    def __init__(self, transport):
+        self._transport = transport
+
+    def create(self, **request):
+        message, latency = self._transport.respond(request)
+        time.sleep(latency)
+        return message
+
+    def stream(self, **request):
+        message, latency = self._transport.respond(request)
+        return _FakeStream(message, latency)
+
+
+class _AsyncMessages:
+    def __init__(self, transport):
+        self._transport = transport
+
+    async def create(self, **request):
+        message, latency = self._transport.respond(request)
+        await asyncio.sleep(latency)
+        return message
+
+
+class _Client:
+    def __init__(self, messages):
+        self.messages = messages
+
+    def close(self):
+        pass
+
+
+class _AsyncClient:
+    def __init__(self, messages):
+        self.messages = messages
+
+    async def close(self):
+        pass
+
+
+class FakeTransport(ABC):
+    """Base class of the transports.
+
+    Subclasses implement respond(request) -> (Message, latency_seconds) and may
+    raise anthropic.APIStatusError; errors are raised before any latency.
+    """
+
+    def client(self):
+        return _Client(_Messages(self))
+
+    def async_client(self):
+        return _AsyncClient(_AsyncMessages(self))
+
+    @abstractmethod
+    def respond(self, request):
+        """Answer one messages.create() request."""
+
+
+class ReplayTransport(FakeTransport):
+    """Serve recorded fixtures by request hash.
+
+    Raises:
+        LookupError: from respond() when no fixture matches the request.
+    """
+
+    def __init__(self, fixtures_dir, latency=0.0):
+        self.fixtures_dir = Path(fixtures_dir)
+        self.latency = latency
+
+    def respond(self, request):
+        path = self.fixtures_dir / f"{request_hash(request)}.json"
+        if not path.exists():
+            raise LookupError(f"No recorded fixture for request {path.stem[:12]}")
+        with open(path, 'r', encoding='utf-8') as f:
+            fixture = json.load(f)
+        return Message.model_validate(fixture["response"]), self.latency
+
+
+class RecordTransport(FakeTransport):
+    """Call the live API and save every request/response pair to fixtures_dir.
+
+    client() and async_client() wrap the SDK clients so streaming and the async
+    service keep their live behaviour; respond() is the plain synchronous call.
+    """
+
+    def __init__(self, api_key, fixtures_dir):
+        self.api_key = api_key
+        self.fixtures_dir = Path(fixtures_dir)
+
+    def respond(self, request):
+        start = time.monotonic()
+        message = anthropic.Anthropic(api_key=self.api_key).messages.create(**request)
+        self.save(request, message)
+        return message, time.monotonic() - start
+
+    def client(self):
+        client = anthropic.Anthropic(api_key=self.api_key)
+        return _Client(_RecordingMessages(client.messages, self))
+
+    def async_client(self):
+        # Same SDK settings as AnalyzerService: backoff is coordinated by the service
+        client = anthropic.AsyncAnthropic(api_key=self.api_key, max_retries=0)
+        return _RecordingAsyncClient(client, self)
+
+    def save(self, request, message):
+        self.fixtures_dir.mkdir(parents=True, exist_ok=True)
+        path = self.fixtures_dir / f"{request_hash(request)}.json"
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({"request": request, "response": message.model_dump(mode="json")},
+                      f, indent=2, ensure_ascii=False)
+
+
+class _RecordingMessages:
+    def __init__(self, messages, recorder):
+        self._messages = messages
+        self._recorder = recorder
+
+    def create(self, **request):
+        message = self._messages.create(**request)
+        self._recorder.save(request, message)
+        return message
+
+    def stream(self, **request):
+        return _RecordingStream(self._messages.stream(**request), request, self._recorder)
+
+
+class _RecordingStream:
+    def __init__(self, manager, request, recorder):
+        self._manager = manager
+        self._request = request
+        self._recorder = recorder
+        self._stream = None
+
+    def __enter__(self):
+        self._stream = self._manager.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._manager.__exit__(*exc_info)
+
+    def __iter__(self):
+        return iter(self._stream)
+
+    def get_final_message(self):
+        message = self._stream.get_final_message()
+        self._recorder.save(self._request, message)
+        return message
+
+
+class _RecordingAsyncMessages:
+    def __init__(self, messages, recorder):
+        self._messages = messages
+        self._recorder = recorder
+
+    async def create(self, **request):
+        message = await self._messages.create(**request)
+        self._recorder.save(request, message)
+        return message
+
+
+class _RecordingAsyncClient:
+    def __init__(self, client, recorder):
+        self._client = client
+        self.messages = _RecordingAsyncMessages(client.messages, recorder)
+
+    async def close(self):
+        await self._client.close()
+
+
+class SyntheticTransport(FakeTransport):
+    """Generate responses locally with latency and failure injection.
+
+    Latency is log-normal around latency_median (spread latency_sigma) plus
+    seconds_per_output_token. Each failure rate is the probability of that
+    outcome per call, checked in order: 429, 529, malformed JSON (text answer
+    instead of a tool call), truncation at max_tokens, schema-invalid output.
+
+    Args:
+        payloads: {tool name: dict or callable(request) -> dict}, merged over
+                  SYNTHETIC_PAYLOADS
+        seed: makes latencies and injected failures reproducible; each instance
+              draws from its own generator, one call at a time
+    """
+
+    def __init__(self, payloads=None, seed=None, latency_median=1.0, latency_sigma=0.5,
+                 seconds_per_output_token=0.0, rate_limit_rate=0.0, overload_rate=0.0,
+                 retry_after=None, malformed_rate=0.0, truncation_rate=0.0,
+                 invalid_rate=0.0):
+        self.payloads = {**SYNTHETIC_PAYLOADS, **(payloads or {})}
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.seconds_per_output_token = seconds_per_output_token
+        self.rate_limit_rate = rate_limit_rate
+        self.overload_rate = overload_rate
+        self.retry_after = retry_after
+        self.malformed_rate = malformed_rate
+        self.truncation_rate = truncation_rate
+        self.invalid_rate = invalid_rate
+        self.stats = {
+            "calls": 0, "rate_limited": 0, "overloaded": 0,
+            "malformed": 0, "truncated": 0, "invalid": 0,
+        }
+
+    def respond(self, request):
+        # Both draws of a call are taken together so concurrent callers (hedged
+        # streams run in threads) cannot interleave the seeded sequence
+        with self._lock:
+            self.stats["calls"] += 1
+            call = self.stats["calls"]
+            roll = self.random.random()
+            latency = (self.random.lognormvariate(math.log(self.latency_median),
+                                                  self.latency_sigma)
+                       if self.latency_median > 0 else 0.0)
+        if roll < self.rate_limit_rate:
+            self._count("rate_limited")
+            raise self._status_error(429, anthropic.RateLimitError, "rate_limit_error")
+        roll -= self.rate_limit_rate
+        if roll < self.overload_rate:
+            self._count("overloaded")
+            raise self._status_error(529, anthropic.APIStatusError, "overloaded_error")
+        roll -= self.overload_rate
+
+        tool = request.get("tool_choice", {}).get("name", "record_updates")
+        payload = self.payloads.get(tool, {})
+        payload = copy.deepcopy(payload(request) if callable(payload) else payload)
+        stop_reason = "tool_use"
+        content = None
+
+        if roll < self.malformed_rate:
+            self._count("malformed")
+            text = json.dumps(payload, ensure_ascii=False)
+            content = [{"type": "text", "text": "```json\n" + text[:max(1, len(text) // 2)] + "\n```"}]
+            stop_reason = "end_turn"
+        elif roll < self.malformed_rate + self.truncation_rate:
+            self._count("truncated")
+            payload = _truncate_payload(payload)
+            stop_reason = "max_tokens"
+        elif roll < self.malformed_rate + self.truncation_rate + self.invalid_rate:
+            self._count("invalid")
+            payload = _invalidate_payload(payload)
+
+        if content is None:
+            content = [{"type": "tool_use", "id": "toolu_synthetic", "name": tool,
+                        "input": payload}]
+
+        output_text = json.dumps(payload, ensure_ascii=False)
+        output_tokens = min(request.get("max_tokens", 4096), estimate_tokens(output_text))
+        input_text = json.dumps([request.get("system"), request.get("messages")],
+                                ensure_ascii=False)
+        message = Message.model_validate({
+            "id": f"msg_synthetic_{call}",
+            "type": "message",
+            "role": "assistant",
+            "model": request.get("model", "synthetic"),
+            "content": content,
+            "stop_reason": stop_reason,
+            "stop_sequence": None,
+            "usage": {"input_tokens": estimate_tokens(input_text),
+                      "output_tokens": output_tokens},
+        })
+        return message, latency + output_tokens * self.seconds_per_output_token
+
+    def _count(self, outcome):
+        with self._lock:
+            self.stats[outcome] += 1
+
+    def _status_error(self, status_code, error_class, error_type):
+        headers = {"retry-after": str(self.retry_after)} if self.retry_after else {}
+        body = {"type": "error", "error": {"type": error_type, "message": "Synthetic failure"}}
+        return error_class(f"Error code: {status_code} - {body}",
+                           response=_Response(status_code, headers), body=body)
+
+
+def _truncate_payload(payload):
+    """Drop the second half of every list, and the last list entirely (cut-off output)."""
+    lists = [key for key, value in payload.items() if isinstance(value, list)]
+    for key in lists:
+        payload[key] = payload[key][:len(payload[key]) // 2]
+    if lists:
+        del payload[lists[-1]]
+    return payload
+
+
+def _invalidate_payload(payload):
+    """Remove one required field, from the first list element if there is one."""
+    for value in payload.values():
+        if isinstance(value, list) and value and isinstance(value[0], dict) and value[0]:
+            del value[0][next(iter(value[0]))]
+            return payload
+    if payload:
+        del payload[next(iter(payload))]
+    return payload
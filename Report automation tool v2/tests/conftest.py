@@ -0,0 +1,32 @@
+"""Shared test setup: src/ modules are imported as flat modules, as in src/ itself."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "src"))
+
+EXAMPLES = ROOT / "Examples"
+
+
+@pytest.fixture
+def example_report():
+    """Path of an example report .docx (the most recent Penta report)."""
+    return EXAMPLES / "Penta_MoM-PV N12 20260204.docx"
+
+
+@pytest.fixture(scope="session")
+def parsed_report():
+    """parse_report() output of the example report."""
+    from report_parser import parse_report
+    return parse_report(str(EXAMPLES / "Penta_MoM-PV N12 20260204.docx"))
+
+
+@pytest.fixture(scope="session")
+def cleaned_transcript():
+    """Formatted cleaned transcript of an example Leexi export."""
+    from transcript_cleaner import clean_transcript, format_clean_transcript
+    path = EXAMPLES / "leexi-20260121-transcript-penta_phase_2_sprinklage.txt"
+    return format_clean_transcript(clean_transcript(path.read_text(encoding="utf-8")))
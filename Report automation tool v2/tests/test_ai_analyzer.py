@@ -0,0 +1,304 @@
+import asyncio
+import json
+
+import pytest
+from anthropic.types import Message
+
+import ai_analyzer
+from token_estimator import estimate_tokens
+from transcript_cleaner import split_formatted_transcript
+from transport import FakeTransport, ReplayTransport, SyntheticTransport
+
+
+REPORT = {
+    "metadata": {"meeting_number": 3, "date": "01/02/2026"},
+    "sections": [{"section_name": "1. General", "points": [
+        {"number": "01.01", "title": "Planning", "subject_paragraphs": [
+            {"text": "Works start in March", "has_bold": False}],
+         "for_whom_paragraphs": [], "due_paragraphs": []},
+    ]}],
+    "info_exchange": [],
+    "planning": [],
+    "language": "EN",
+}
+TRANSCRIPT = "Duration: 10 min\n\n[00:00] Alice: The works start in April now.\n"
+
+
+@pytest.fixture
+def synthetic():
+    transport = SyntheticTransport(seed=1, latency_median=0)
+    ai_analyzer.set_transport(transport)
+    yield transport
+    ai_analyzer.set_transport(None)
+
+
+def test_sync_wrappers_share_one_service(synthetic):
+    first = ai_analyzer.analyze_meeting(REPORT, TRANSCRIPT, api_key="key")
+    service = ai_analyzer._services[("key", None)]
+    second = ai_analyzer.analyze_meeting(REPORT, TRANSCRIPT, api_key="key")
+    assert "error" not in first and "error" not in second
+    assert ai_analyzer._services[("key", None)] is service
+    assert service.stats["requests"] == 2
+    assert synthetic.stats["calls"] == 2
+
+
+def test_sync_wrapper_inside_running_loop(synthetic):
+    async def handler():
+        return ai_analyzer.analyze_meeting(REPORT, TRANSCRIPT, api_key="key")
+
+    updates = asyncio.run(handler())
+    assert "error" not in updates
+    assert updates["meeting_number"] == 1
+
+
+def test_set_transport_resets_services(synthetic):
+    ai_analyzer.analyze_meeting(REPORT, TRANSCRIPT, api_key="key")
+    assert ai_analyzer._services
+    ai_analyzer.set_transport(synthetic)
+    assert not ai_analyzer._services
+
+
+class _TextTransport(FakeTransport):
+    """Answers every call with the given text instead of a tool call."""
+
+    def __init__(self, text):
+        self.text = text
+
+    def respond(self, request):
+        message = Message.model_validate({
+            "id": "msg_text", "type": "message", "role": "assistant",
+            "model": request.get("model", "synthetic"),
+            "content": [{"type": "text", "text": self.text}],
+            "stop_reason": "end_turn", "stop_sequence": None,
+            "usage": {"input_tokens": 10, "output_tokens": 10},
+        })
+        return message, 0.0
+
+
+def test_stream_yields_complete(synthetic):
+    events = list(ai_analyzer.analyze_meeting_stream(REPORT, TRANSCRIPT, api_key="key"))
+    assert events[-1]["event"] == "complete"
+    assert "usage" in events[-1]["updates"]
+
+
+def test_stream_malformed_json_yields_error():
+    ai_analyzer.set_transport(_TextTransport('{"point_updates": [{"number": tru}]}'))
+    try:
+        events = list(ai_analyzer.analyze_meeting_stream(REPORT, TRANSCRIPT, api_key="key"))
+    finally:
+        ai_analyzer.set_transport(None)
+    assert [e["event"] for e in events] == ["error"]
+    assert events[0]["raw_response"].startswith('{"point_updates"')
+
+
+def test_stream_missing_fixture_yields_error(tmp_path):
+    ai_analyzer.set_transport(ReplayTransport(tmp_path))
+    try:
+        events = list(ai_analyzer.analyze_meeting_stream(REPORT, TRANSCRIPT, api_key="key"))
+    finally:
+        ai_analyzer.set_transport(None)
+    assert [e["event"] for e in events] == ["error"]
+    assert events[0]["error"].startswith("Unexpected error")
+
+
+def test_stream_long_transcript_is_chunked(synthetic, cleaned_transcript):
+    header, turns = split_formatted_transcript(cleaned_transcript)
+    while len(cleaned_transcript) <= ai_analyzer.MAX_TRANSCRIPT_CHARS:
+        cleaned_transcript += "\n\n" + "\n\n".join(turns)
+    events = list(ai_analyzer.analyze_meeting_stream(REPORT, cleaned_transcript, api_key="key"))
+    assert events[-1]["event"] == "complete"
+    assert events[-1]["updates"]["usage"]["chunks"] > 1
+    assert synthetic.stats["calls"] == events[-1]["updates"]["usage"]["chunks"]
+
+
+@pytest.mark.parametrize("compact_output", [False, True])
+def test_compact_report_legend_matches_output_schema(compact_output):
+    request = ai_analyzer._prepare_request(REPORT, TRANSCRIPT, compact_report=True,
+                                           compact_output=compact_output)
+    message = request["messages"][0]["content"]
+    assert ai_analyzer.COMPACT_REPORT_LEGEND in message
+    assert (ai_analyzer.COMPACT_REPORT_COMPACT_OUTPUT in message) == compact_output
+    assert (ai_analyzer.COMPACT_REPORT_FULL_OUTPUT in message) != compact_output
+
+
+def test_merge_chunk_updates():
+    first = {
+        "meeting_number": 13, "date": None, "next_meeting": "11/02",
+        "point_updates": [{"section": "General", "number": "07.01",
+                           "subject_lines": ["a", "b"], "for_whom": "ARCH", "due": "ASAP"}],
+        "new_points": [{"section": "General", "number": "13.01", "title": "Keys",
+                        "subject_lines": ["x"], "for_whom": "MO", "due": None}],
+        "info_exchange": [{"from_whom": "ARCH", "status": "To send", "content": "Plans",
+                           "due_date": ""}],
+        "planning": [{"content": "Level +1", "is_new": False}],
+        "usage": {"input_tokens": 10, "output_tokens": 5},
+    }
+    second = {
+        "meeting_number": 14, "date": "11/02/2026", "next_meeting": "18/02",
+        "point_updates": [{"section": "General", "number": "07.01",
+                           "subject_lines": ["b", "c"], "for_whom": None, "due": "Done"}],
+        "new_points": [{"section": "general", "number": "13.01", "title": "keys",
+                        "subject_lines": ["y"], "for_whom": None, "due": "ASAP"},
+                       {"section": "General", "number": "13.01", "title": "Lift",
+                        "subject_lines": [], "for_whom": "EL", "due": "ASAP"}],
+        "info_exchange": [{"from_whom": "ARCH", "status": "Sent", "content": "plans",
+                           "due_date": ""}],
+        "planning": [{"content": "Level +1", "is_new": True}],
+        "usage": {"input_tokens": 20, "output_tokens": 7, "hedges": 1},
+    }
+    merged = ai_analyzer.merge_chunk_updates([first, second])
+
+    assert (merged["meeting_number"], merged["date"]) == (13, "11/02/2026")
+    assert merged["next_meeting"] == "18/02"
+    assert merged["point_updates"] == [{
+        "section": "General", "number": "07.01", "subject_lines": ["a", "b", "c"],
+        "for_whom": "ARCH", "due": "Done",
+    }]
+    keys, lift = merged["new_points"]
+    assert keys["subject_lines"] == ["x", "y"] and keys["due"] == "ASAP"
+    assert (lift["title"], lift["number"]) == ("Lift", "13.02")
+    assert merged["info_exchange"] == [{"from_whom": "ARCH", "status": "Sent",
+                                        "content": "plans", "due_date": ""}]
+    assert merged["planning"] == [{"content": "Level +1", "is_new": True}]
+    assert merged["usage"]["input_tokens"] == 30
+    assert merged["usage"]["chunks"] == 2
+    assert merged["usage"]["hedges"] == 1
+    # The chunk results are not modified
+    assert first["point_updates"][0]["subject_lines"] == ["a", "b"]
+
+
+def test_split_transcript_chunks(cleaned_transcript):
+    header, turns = split_formatted_transcript(cleaned_transcript)
+    chunks = ai_analyzer.split_transcript_chunks(cleaned_transcript, max_tokens=2000)
+
+    assert len(chunks) > 1
+    assert all(chunk.startswith(header) for chunk in chunks)
+    # Every turn lands in exactly one chunk, in order
+    assert [t for c in chunks for t in split_formatted_transcript(c)[1]] == turns
+    assert all(estimate_tokens(c) <= 2000 for c in chunks)
+
+
+def test_repair_request_fragments():
+    updates = {"meeting_number": "13", "point_updates": [{"number": "01.01"}],
+               "new_points": [], "info_exchange": [], "planning": []}
+    _, errors = ai_analyzer.validate_updates(updates)
+    request, paths = ai_analyzer._prepare_repair_request(updates, errors)
+
+    assert paths == ["meeting_number", "point_updates[0]"]
+    assert request["tool_choice"]["name"] == "record_repairs"
+    assert "point_updates[0] missing 'section'" in request["messages"][0]["content"]
+
+    repaired = {"fragments": [
+        {"path": "point_updates[0]", "value": {"section": "General", "number": "01.01",
+                                               "subject_lines": []}},
+        {"path": "planning[5]", "value": {}},
+    ]}
+    ai_analyzer.apply_repairs(updates, repaired, paths)
+    assert updates["point_updates"][0]["section"] == "General"
+    assert updates["planning"] == []
+
+
+def test_repair_request_uses_compact_schema():
+    compact = {"n": 13, "pu": [{"s": 99, "no": "01.01", "l": "x"}], "np": [], "ie": [], "pl": []}
+    updates = {"meeting_number": 13, "point_updates": [{"number": "01.01", "subject_lines": "x"}],
+               "new_points": [], "info_exchange": [], "planning": []}
+    _, errors = ai_analyzer.validate_updates(updates)
+    request, paths = ai_analyzer._prepare_repair_request(updates, errors, compact)
+
+    assert paths == ["pu[0]"]
+    content = request["messages"][0]["content"]
+    assert '"s": 99' in content
+    assert "pu[0].l must be a list" in content
+    assert "subject_lines" not in content
+
+
+def _point(number, subject, due=()):
+    return {"number": number, "title": f"Point {number}",
+            "subject_paragraphs": [{"text": t, "has_bold": b} for t, b in subject],
+            "for_whom_paragraphs": ["ARCH"], "due_paragraphs": list(due)}
+
+
+def test_compact_report_prunes_history():
+    history = [("Opening", False), ("Meeting 07/01", False), ("a", False),
+               ("Meeting 14/01", False), ("b", False), ("c", False),
+               ("Meeting 21/01", True), ("d", True)]
+    report = dict(REPORT, sections=[{"section_name": "1. General", "points": [
+        _point("01.01", history, ["", "ASAP"]),
+        _point("01.02", [("Finished", False)], ["Done"]),
+    ]}])
+    encoded = json.loads(ai_analyzer.encode_report(report, compact=True))
+
+    open_point, closed_point = encoded["s"][0]["p"]
+    assert open_point["s"] == ["Meeting 14/01", "b", "c", "Meeting 21/01", "d"]
+    assert open_point["h"] == 3
+    assert (open_point["w"], open_point["d"]) == ("ARCH", "ASAP")
+    assert closed_point == {"#": "01.02", "t": "Point 01.02", "x": 1}
+
+    full = json.loads(ai_analyzer.encode_report(report, compact=True, history_blocks=0))
+    assert "h" not in full["s"][0]["p"][0]
+    assert len(full["s"][0]["p"][0]["s"]) == len(history)
+
+
+def test_compact_report_savings(parsed_report):
+    savings = ai_analyzer.compact_report_savings(parsed_report)
+    assert savings["compact_tokens"] < savings["full_tokens"]
+    assert savings["saved_tokens"] == savings["full_tokens"] - savings["compact_tokens"]
+    assert savings["compact_tokens"] == estimate_tokens(
+        ai_analyzer.encode_report(parsed_report, compact=True)
+    )
+
+
+def test_plan_route_picks_first_fitting_rule():
+    route = ai_analyzer.plan_route(REPORT, TRANSCRIPT)
+    assert route["name"] == "small"
+    assert route["model"] == ai_analyzer.MODEL_FAST
+    assert route["max_tokens"] == ai_analyzer.MIN_MAX_TOKENS
+
+    request = ai_analyzer._prepare_request(REPORT, TRANSCRIPT, route=route)
+    assert (request["model"], request["max_tokens"]) == (route["model"], route["max_tokens"])
+
+
+def test_plan_route_falls_back_to_last_rule(parsed_report, cleaned_transcript):
+    rules = [
+        {"name": "tiny", "model": ai_analyzer.MODEL_FAST, "max_input_tokens": 100},
+        {"name": "capped", "model": ai_analyzer.MODEL, "max_tokens_cap": 2000},
+    ]
+    route = ai_analyzer.plan_route(parsed_report, cleaned_transcript, rules)
+    assert route["name"] == "capped"
+    assert route["input_tokens"] > 100
+    assert route["max_tokens"] == min(
+        2000, round(route["expected_output_tokens"] * ai_analyzer.OUTPUT_HEADROOM)
+    )
+
+
+def test_analyze_records_route(synthetic):
+    updates = ai_analyzer.analyze_meeting(
+        REPORT, TRANSCRIPT, api_key="key", routing_rules=ai_analyzer.ROUTING_RULES
+    )
+    assert updates["usage"]["route"]["name"] == "small"
+
+
+def test_preflight_single_request(parsed_report, cleaned_transcript):
+    estimate = ai_analyzer.preflight(parsed_report, cleaned_transcript)
+    assert estimate["mode"] == "single"
+    assert estimate["requests"] == 1
+    assert estimate["input_tokens"] > estimate_tokens(cleaned_transcript)
+    assert estimate["output_tokens"] <= estimate["max_output_tokens"]
+    assert estimate["cost_usd"] <= estimate["max_cost_usd"]
+    assert "suggested_transcript_budget" not in estimate
+
+
+def test_preflight_long_transcript_is_chunked(parsed_report, cleaned_transcript):
+    header, turns = split_formatted_transcript(cleaned_transcript)
+    while len(cleaned_transcript) <= ai_analyzer.MAX_TRANSCRIPT_CHARS:
+        cleaned_transcript += "\n\n" + "\n\n".join(turns)
+    estimate = ai_analyzer.preflight(parsed_report, cleaned_transcript)
+    assert estimate["mode"] == "chunked"
+    assert estimate["requests"] > 1
+    assert estimate["suggested_transcript_budget"] == 28_572
+
+    compacted = ai_analyzer.preflight(
+        parsed_report, cleaned_transcript,
+        transcript_budget=estimate["suggested_transcript_budget"],
+    )
+    assert compacted["mode"] == "single"
@@ -0,0 +1,212 @@
+import asyncio
+import json
+
+import pytest
+
+import analyzer_service
+from ai_analyzer import TRUNCATION_WARNING
+from analyzer_service import AnalyzerService
+from transport import ReplayTransport, SyntheticTransport
+
+
+UPDATES = {
+    "meeting_number": 13,
+    "date": "11/02/2026",
+    "distribution_date": None,
+    "next_meeting": None,
+    "point_updates": [
+        {"section": "fire detection", "number": "8.4", "subject_lines": ["Tested"],
+         "for_whom": "EL", "due": "Done"},
+    ],
+    "new_points": [],
+    "info_exchange": [],
+    "planning": [],
+}
+
+
+class _FlakyTransport(SyntheticTransport):
+    """Synthetic backend whose first calls fail with the given status codes."""
+
+    def __init__(self, statuses, **kwargs):
+        super().__init__(**kwargs)
+        self.statuses = list(statuses)
+
+    def respond(self, request):
+        if self.statuses:
+            status = self.statuses.pop(0)
+            self.stats["calls"] += 1
+            raise self._status_error(status, analyzer_service.anthropic.APIStatusError,
+                                     "overloaded_error")
+        return super().respond(request)
+
+
+@pytest.fixture(autouse=True)
+def fast_backoff(monkeypatch):
+    monkeypatch.setattr(analyzer_service, "BACKOFF_INITIAL", 0.01)
+    monkeypatch.setattr(analyzer_service, "BACKOFF_MAX", 0.01)
+
+
+def _run(transport, method, *args, **kwargs):
+    async def main():
+        async with AnalyzerService(None, client=transport.async_client()) as service:
+            return await getattr(service, method)(*args, **kwargs), service
+    return asyncio.run(main())
+
+
+def _synthetic(latency_median=0, **kwargs):
+    return SyntheticTransport(payloads={"record_updates": UPDATES}, seed=1,
+                              latency_median=latency_median, **kwargs)
+
+
+def test_analyze_checks_references(parsed_report, cleaned_transcript):
+    updates, service = _run(_synthetic(), "analyze", parsed_report, cleaned_transcript)
+    assert "error" not in updates
+    assert updates["point_updates"][0]["section"] == "Fire detection"
+    assert updates["point_updates"][0]["number"] == "08.04"
+    assert updates["reference_fixes"]
+    assert service.stats["requests"] == 1
+
+
+def test_analyze_chunked(parsed_report, cleaned_transcript):
+    transport = _synthetic()
+    updates, _ = _run(transport, "analyze_chunked", parsed_report, cleaned_transcript,
+                      max_chunk_tokens=2000)
+    assert updates["usage"]["chunks"] > 1
+    assert transport.stats["calls"] == updates["usage"]["chunks"]
+    # The same point reported by every chunk is merged into one update
+    assert len(updates["point_updates"]) == 1
+    assert "chunk_errors" not in updates
+
+
+@pytest.mark.parametrize("statuses", [[429], [529], [429, 529, 429]])
+def test_analyze_backs_off_on_rate_limits(parsed_report, cleaned_transcript, statuses):
+    transport = _FlakyTransport(statuses, payloads={"record_updates": UPDATES},
+                                latency_median=0)
+    updates, service = _run(transport, "analyze", parsed_report, cleaned_transcript)
+    assert "error" not in updates
+    assert service.stats["requests"] == len(statuses) + 1
+    assert service.stats["rate_limited"] == statuses.count(429)
+    assert service.stats["overloaded"] == statuses.count(529)
+
+
+def test_analyze_gives_up_after_retries(parsed_report, cleaned_transcript):
+    transport = _FlakyTransport([529] * 20, latency_median=0)
+    updates, service = _run(transport, "analyze", parsed_report, cleaned_transcript)
+    assert updates["error"].startswith("API error")
+    # One retry of the whole analysis, each with the rate-limit retries
+    assert service.stats["requests"] == 2 * (analyzer_service.MAX_RATE_LIMIT_RETRIES + 1)
+
+
+def test_concurrency_limit(parsed_report, cleaned_transcript):
+    transport = _synthetic(latency_median=0.05, latency_sigma=0.01)
+    peak = 0
+
+    async def main():
+        nonlocal peak
+        async with AnalyzerService(None, max_concurrency=2,
+                                   client=transport.async_client()) as service:
+            async def watch():
+                nonlocal peak
+                while True:
+                    peak = max(peak, service.stats["in_flight"])
+                    await asyncio.sleep(0.005)
+
+            watcher = asyncio.create_task(watch())
+            results = await asyncio.gather(*(
+                service.analyze(parsed_report, cleaned_transcript) for _ in range(6)
+            ))
+            watcher.cancel()
+            return results
+
+    results = asyncio.run(main())
+    assert all("error" not in r for r in results)
+    assert peak == 2
+
+
+def test_analyze_sharded(parsed_report, cleaned_transcript):
+    transport = _synthetic()
+    updates, _ = _run(transport, "analyze_sharded", parsed_report, cleaned_transcript,
+                      max_shard_tokens=500)
+    # One global request plus one per group of sections
+    assert updates["usage"]["shards"] > 2
+    assert transport.stats["calls"] == updates["usage"]["shards"]
+    assert "error" not in updates and "shard_errors" not in updates
+    assert len(updates["point_updates"]) == 1
+
+
+def test_analyze_truncated_output(parsed_report, cleaned_transcript):
+    updates, _ = _run(_synthetic(truncation_rate=1.0), "analyze",
+                      parsed_report, cleaned_transcript)
+    assert updates["truncated"]
+    assert TRUNCATION_WARNING in updates["validation_warnings"]
+    assert updates["usage"]["max_tokens_escalations"] >= 1
+    # Lists cut off entirely are left empty (= unchanged)
+    assert updates["planning"] == []
+
+
+def test_analyze_invalid_output_is_repaired(parsed_report, cleaned_transcript):
+    updates, _ = _run(_synthetic(invalid_rate=1.0), "analyze",
+                      parsed_report, cleaned_transcript)
+    assert updates["usage"]["repair_calls"] == 1
+    # The synthetic repair answer is invalid too: the errors are kept
+    assert updates["validation_warnings"]
+
+
+def test_analyze_compact_output(parsed_report, cleaned_transcript):
+    compact = {"n": 13, "d": None, "dd": None, "nm": None,
+               "pu": [{"s": 3, "no": "08.04", "l": ["Tested"]}], "np": [], "ie": [0], "pl": []}
+    transport = SyntheticTransport(payloads={"record_compact_updates": compact},
+                                   latency_median=0)
+    updates, _ = _run(transport, "analyze", parsed_report, cleaned_transcript,
+                      compact_output=True)
+    assert updates["point_updates"][0]["section"] == parsed_report["sections"][3]["section_name"]
+    assert updates["info_exchange"] == [parsed_report["info_exchange"][0]]
+    assert "output_encoding" in updates["usage"]
+
+
+def test_analyze_repairs_compact_output(parsed_report, cleaned_transcript):
+    compact = {"n": 13, "d": None, "dd": None, "nm": None,
+               "pu": [{"s": 99, "no": "08.04", "l": ["Tested"]}], "np": [], "ie": [], "pl": []}
+    repair_requests = []
+
+    def repairs(request):
+        repair_requests.append(request)
+        fragment = json.loads(request["messages"][0]["content"].split("```json\n")[1]
+                              .split("\n```")[0])[0]
+        return {"fragments": [{"path": fragment["path"],
+                               "value": dict(fragment["value"], s=3)}]}
+
+    transport = SyntheticTransport(
+        payloads={"record_compact_updates": compact, "record_repairs": repairs},
+        latency_median=0,
+    )
+    updates, _ = _run(transport, "analyze", parsed_report, cleaned_transcript,
+                      compact_output=True)
+
+    assert len(repair_requests) == 1
+    content = repair_requests[0]["messages"][0]["content"]
+    assert '"path": "pu[0]"' in content
+    assert "'s' must be the 0-based index" in content
+    assert updates["point_updates"][0]["section"] == parsed_report["sections"][3]["section_name"]
+    assert "validation_warnings" not in updates
+    assert updates["usage"]["repair_calls"] == 1
+
+
+def test_analyze_feedback(parsed_report, cleaned_transcript):
+    patch = {"operations": [
+        {"op": "replace", "target": "meta", "field": "next_meeting", "value": "18/02/2026"},
+        {"op": "remove", "target": "new_points", "number": "99.99"},
+    ]}
+    transport = SyntheticTransport(payloads={"record_patch": patch}, latency_median=0)
+    current = dict(UPDATES, point_updates=[])
+    updates, _ = _run(transport, "analyze_feedback", parsed_report, cleaned_transcript,
+                      current, "Next meeting is on the 18th")
+    assert updates["next_meeting"] == "18/02/2026"
+    assert updates["patch"] == patch["operations"][:1]
+    assert len(updates["patch_warnings"]) == 1
+
+
+def test_analyze_feedback_unexpected_error(parsed_report, cleaned_transcript, tmp_path):
+    updates, _ = _run(ReplayTransport(tmp_path), "analyze_feedback", parsed_report,
+                      cleaned_transcript, UPDATES, "Next meeting is on the 18th")
+    assert updates["error"].startswith("Unexpected error: No recorded fixture")
@@ -0,0 +1,121 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ai_analyzer import TRUNCATION_WARNING
+from batch_analyzer import BatchAnalyzer
+
+
+UPDATES = {
+    "meeting_number": 13,
+    "date": "11/02/2026",
+    "distribution_date": None,
+    "next_meeting": None,
+    "point_updates": [{"section": "fire detection", "number": "8.4",
+                       "subject_lines": ["Tested"], "for_whom": "EL", "due": "Done"}],
+    "new_points": [],
+    "info_exchange": [],
+    "planning": [],
+}
+
+
+class _StubBatches(BaseHTTPRequestHandler):
+    """Message Batches endpoints: one batch that has ended as soon as it is created."""
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body, content_type="application/json"):
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _batch(self):
+        base = f"http://127.0.0.1:{self.server.server_port}"
+        return {
+            "id": "msgbatch_stub", "type": "message_batch",
+            "processing_status": "ended",
+            "request_counts": {"processing": 0, "succeeded": len(self.server.requests),
+                               "errored": 0, "canceled": 0, "expired": 0},
+            "created_at": "2026-02-11T00:00:00Z", "expires_at": "2026-02-12T00:00:00Z",
+            "ended_at": "2026-02-11T00:01:00Z", "archived_at": None,
+            "cancel_initiated_at": None,
+            "results_url": f"{base}/v1/messages/batches/msgbatch_stub/results",
+        }
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests = body["requests"]
+        self._send(json.dumps(self._batch()))
+
+    def do_GET(self):
+        if not self.path.startswith("/v1/messages/batches/msgbatch_stub/results"):
+            self._send(json.dumps(self._batch()))
+            return
+        lines = [json.dumps(self.server.respond(request)) for request in self.server.requests]
+        self._send("\n".join(lines), "application/binary")
+
+
+def _message(request, payload, stop_reason="tool_use"):
+    tool = request["params"]["tool_choice"]["name"]
+    return {"custom_id": request["custom_id"], "result": {"type": "succeeded", "message": {
+        "id": "msg_stub", "type": "message", "role": "assistant", "model": "stub",
+        "content": [{"type": "tool_use", "id": "toolu_stub", "name": tool, "input": payload}],
+        "stop_reason": stop_reason, "stop_sequence": None,
+        "usage": {"input_tokens": 100, "output_tokens": 10},
+    }}}
+
+
+def _respond(request):
+    job_id = request["custom_id"].rsplit("-p", 1)[0]
+    if job_id == "failed":
+        return {"custom_id": request["custom_id"], "result": {"type": "errored", "error": {
+            "type": "error", "error": {"type": "overloaded_error", "message": "Overloaded"}}}}
+    if job_id == "cut":
+        return _message(request, {"meeting_number": 13, "point_updates": []}, "max_tokens")
+    return _message(request, UPDATES)
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubBatches)
+    server.requests = []
+    server.respond = _respond
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", server
+    server.shutdown()
+
+
+def test_submit_and_collect(stub_server, tmp_path, parsed_report, cleaned_transcript):
+    base_url, server = stub_server
+    batches = BatchAnalyzer("key", tmp_path, base_url=base_url)
+    jobs = [{"job_id": job_id, "parsed_report": parsed_report,
+             "cleaned_text": cleaned_transcript} for job_id in ("penta-13", "failed", "cut")]
+
+    batch_id = batches.submit(jobs, compact_report=True)
+    assert batch_id == "msgbatch_stub"
+    assert [r["custom_id"] for r in server.requests] == ["penta-13-p0", "failed-p0", "cut-p0"]
+    assert batches.pending() == [batch_id]
+
+    paths = batches.collect(batch_id)
+    assert batches.pending() == []
+    results = {job_id: json.loads(path.read_text(encoding="utf-8"))
+               for job_id, path in paths.items()}
+
+    updates = results["penta-13"]
+    # References are checked against the report, like in AnalyzerService
+    assert updates["point_updates"][0]["section"] == "Fire detection"
+    assert updates["point_updates"][0]["number"] == "08.04"
+    assert updates["reference_fixes"]
+    assert updates["usage"]["input_tokens"] == 100
+    assert "report_encoding" in updates["usage"]
+
+    assert results["failed"]["error"] == "Batch request errored: Overloaded"
+    assert results["cut"]["truncated"]
+    assert TRUNCATION_WARNING in results["cut"]["validation_warnings"]
@@ -0,0 +1,57 @@
+from compact_output import compact_error, compact_output_savings, compact_path, expand_updates
+
+
+def test_expand_updates(parsed_report):
+    sections = [s["section_name"] for s in parsed_report["sections"]]
+    compact = {
+        "n": 13, "d": "11/02/2026", "nm": None,
+        "pu": [{"s": 1, "no": "06.01", "l": ["Tested"], "w": "SPK", "du": None}],
+        "np": [{"s": 99, "no": "13.01", "t": "New", "l": [], "w": "ARCH", "du": "ASAP"}],
+        "ie": [1, ["MO", "To send", "Keys", "15/02/26"], 42],
+        "pl": [0, "Level +1", 42],
+    }
+    updates = expand_updates(compact, parsed_report)
+
+    assert updates["meeting_number"] == 13
+    assert updates["date"] == "11/02/2026"
+    assert "distribution_date" not in updates
+    assert updates["point_updates"] == [{
+        "section": sections[1], "number": "06.01", "subject_lines": ["Tested"],
+        "for_whom": "SPK", "due": None,
+    }]
+    # An out-of-range section index is left out for validation to report
+    assert "section" not in updates["new_points"][0]
+    assert updates["new_points"][0]["title"] == "New"
+
+    assert updates["info_exchange"][0] == parsed_report["info_exchange"][1]
+    assert updates["info_exchange"][1] == {
+        "from_whom": "MO", "status": "To send", "content": "Keys", "due_date": "15/02/26",
+    }
+    assert updates["info_exchange"][2] == {}
+    assert updates["planning"] == [
+        {"content": parsed_report["planning"][0]["content"], "is_new": False},
+        {"content": "Level +1", "is_new": True},
+        {},
+    ]
+
+
+def test_expand_updates_truncated(parsed_report):
+    updates = expand_updates({"n": 13, "pu": []}, parsed_report)
+    assert updates == {"meeting_number": 13, "point_updates": []}
+
+
+def test_compact_output_savings(parsed_report):
+    compact = {"n": 13, "ie": [0, 1, 2], "pl": [0, 1]}
+    updates = expand_updates(compact, parsed_report)
+    savings = compact_output_savings(compact, dict(updates, usage={"input_tokens": 1}))
+    assert savings["saved_tokens"] == savings["full_tokens"] - savings["compact_tokens"]
+    assert savings["saved_tokens"] > 0
+
+
+def test_compact_path_and_error():
+    assert compact_path("point_updates[2]") == "pu[2]"
+    assert compact_path("next_meeting") == "nm"
+    assert compact_error("new_points[0] missing 'title'") == "np[0] missing 't'"
+    assert compact_error("point_updates[1].subject_lines must be a list") == "pu[1].l must be a list"
+    assert compact_error("point_updates[0] missing 'section'").startswith("pu[0] 's' must be")
+    assert compact_error("planning[3] must be a dict").startswith("pl[3] must be the index")
@@ -0,0 +1,55 @@
+import json
+
+from docx import Document
+
+from document_pool import DocumentPool, _footprint
+from report_generator import generate_report
+from test_docx_package import UPDATES, _entries
+
+
+def _body_text(doc):
+    return [p.text for p in doc.paragraphs]
+
+
+def test_pool_hands_out_independent_copies(example_report):
+    pool = DocumentPool()
+    first = pool.document(example_report)
+    second = pool.document(example_report)
+    assert pool.stats == {"hits": 1, "misses": 1, "evictions": 0}
+
+    original = _body_text(second)
+    assert _body_text(first) == original == _body_text(Document(example_report))
+    first.paragraphs[0].text = "Edited"
+    assert _body_text(second) == original
+    assert _body_text(pool.document(example_report)) == original
+    # Only the main document part is copied
+    assert first.part.element is not second.part.element
+    assert first.styles.element is second.styles.element
+
+
+def test_pool_evicts_least_recently_used(example_report, tmp_path):
+    other = tmp_path / "other.docx"
+    Document(example_report).save(other)
+    with open(example_report, 'rb') as f:
+        footprint = _footprint(f.read())
+
+    pool = DocumentPool(max_bytes=footprint + 1)
+    pool.document(example_report)
+    pool.document(other)
+    assert pool.stats["evictions"] == 1
+    assert pool.size_bytes < 2 * footprint
+    pool.document(example_report)
+    assert pool.stats == {"hits": 0, "misses": 3, "evictions": 2}
+
+    pool.clear()
+    assert pool.size_bytes == 0
+
+
+def test_pooled_generation_matches_file_copy(example_report, tmp_path):
+    pool = DocumentPool()
+    copied = generate_report(example_report, tmp_path / "copied.docx", UPDATES)
+    for name in ("pooled.docx", "pooled_again.docx"):
+        pooled = generate_report(example_report, tmp_path / name,
+                                 json.loads(json.dumps(UPDATES)), pool=pool)
+        assert _entries(pooled) == _entries(copied)
+    assert pool.stats["hits"] == 1
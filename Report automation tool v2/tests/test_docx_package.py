@@ -0,0 +1,49 @@
+import json
+import zipfile
+
+from lxml import etree
+
+from report_generator import generate_report
+
+
+UPDATES = {
+    "meeting_number": 13,
+    "date": "11/02/2026",
+    "distribution_date": "12/02/2026",
+    "next_meeting": "18/02/2026",
+    "point_updates": [{"section": "Fire detection", "number": "08.04",
+                       "subject_lines": ["Detectors tested"], "for_whom": "EL", "due": "Done"}],
+    "new_points": [{"section": "General", "number": "13.01", "title": "Keys",
+                    "subject_lines": ["Keys to hand over"], "for_whom": "MO", "due": "ASAP"}],
+    "info_exchange": [{"from_whom": "ARCH", "status": "Sent", "content": "Plans",
+                       "due_date": "11/02/26"}],
+    "planning": [{"content": "Level +2\n16/02/2026: Floor out of service", "is_new": True}],
+}
+
+# Parts whose children are an unordered list (Document.save() may reorder them)
+UNORDERED = ("[Content_Types].xml", ".rels")
+
+
+def _entries(path):
+    """{entry name: content} with XML parsed, so serialization details don't count."""
+    entries = {}
+    with zipfile.ZipFile(path) as archive:
+        for name in archive.namelist():
+            data = archive.read(name)
+            if name.endswith(UNORDERED):
+                data = {(c.tag, tuple(sorted(c.attrib.items())))
+                        for c in etree.fromstring(data)}
+            elif name.endswith(".xml"):
+                data = etree.tostring(etree.fromstring(data))
+            entries[name] = data
+    return entries
+
+
+def test_patched_save_matches_document_save(example_report, tmp_path):
+    saved = generate_report(example_report, tmp_path / "saved.docx", UPDATES)
+    patched = generate_report(example_report, tmp_path / "patched.docx",
+                              json.loads(json.dumps(UPDATES)), patched_save=True)
+    saved, patched = _entries(saved), _entries(patched)
+    assert sorted(patched) == sorted(saved)
+    for name in saved:
+        assert patched[name] == saved[name], name
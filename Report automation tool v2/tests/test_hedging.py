@@ -0,0 +1,54 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import ai_analyzer
+from hedging import DEFAULT_POLICY, HEDGE_WARM_UP_MARGIN, HedgePolicy, request_kind
+
+
+def test_default_policy_hedges_during_warm_up():
+    assert DEFAULT_POLICY.warm_up_margin == HEDGE_WARM_UP_MARGIN
+    policy = HedgePolicy(warm_up_margin=HEDGE_WARM_UP_MARGIN)
+    assert policy.deadline(("model", "record_updates"), 30.0) == 30.0 + HEDGE_WARM_UP_MARGIN
+    assert policy.deadline(("model", "record_updates")) is None
+    assert HedgePolicy().deadline(("model", "record_updates"), 30.0) is None
+
+
+def test_warm_up_deadline_per_kind():
+    request = {"model": ai_analyzer.MODEL, "max_tokens": 4096}
+    first_token, tokens_per_second = ai_analyzer.MODEL_SPEED[ai_analyzer.MODEL]
+    assert ai_analyzer.expected_latency(request, first_event=True) == first_token
+    # A normal completion that writes max_tokens is not hedged during warm-up
+    completion = ai_analyzer.expected_latency(request)
+    assert completion == first_token + 4096 / tokens_per_second
+    assert completion > 60
+    assert ai_analyzer.expected_latency(dict(request, max_tokens=1024)) < completion
+
+
+def test_deadline_is_latency_percentile():
+    policy = HedgePolicy(min_samples=20, max_rate=1.0, warm_up_margin=10.0)
+    kind = request_kind({"model": "m", "tool_choice": {"name": "record_updates"}})
+    for seconds in range(1, 21):
+        policy.record(kind, float(seconds))
+    assert policy.deadline(kind, 50.0) == 19.0
+    assert policy.deadline(("m", "record_patch"), 50.0) == 60.0
+
+
+def test_hedge_rate_is_capped():
+    policy = HedgePolicy(max_rate=0.1, warm_up_margin=0.0)
+    assert policy.deadline("kind", 5.0) == 5.0
+    policy.record_hedge()
+    assert all(policy.deadline("kind", 5.0) is None for _ in range(9))
+    assert policy.deadline("kind", 5.0) == 5.0
+
+
+def test_policy_counters_are_thread_safe():
+    policy = HedgePolicy(max_rate=1.0, warm_up_margin=1.0)
+
+    def call(i):
+        policy.deadline("kind", 1.0)
+        policy.record("kind", float(i))
+        policy.record_hedge()
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(call, range(400)))
+    assert policy.calls == policy.hedges == 400
+    assert len(policy.latencies["kind"]) == policy.history
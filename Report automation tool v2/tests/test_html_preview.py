@@ -0,0 +1,69 @@
+import copy
+
+from html_preview import PreviewRenderer, render_preview
+from report_generator import generate_report
+from report_parser import parse_report
+
+
+UPDATES = {
+    "meeting_number": 13,
+    "date": "11/02/2026",
+    "point_updates": [{"section": "Fire detection", "number": "08.04",
+                       "subject_lines": ["Detectors tested"], "for_whom": "EL",
+                       "due": "Done"}],
+    "new_points": [],
+    "info_exchange": [],
+    "planning": [],
+}
+
+
+def _new_point(section, number):
+    return {"section": section, "number": number, "title": "New",
+            "subject_lines": ["Line"], "for_whom": "MO", "due": "ASAP"}
+
+
+def test_unmatched_section_goes_where_the_generator_puts_it(example_report, parsed_report,
+                                                            tmp_path):
+    updates = dict(UPDATES, new_points=[_new_point("Lifts", "13.01")])
+    generated = parse_report(generate_report(example_report, tmp_path / "out.docx",
+                                             copy.deepcopy(updates)))
+    expected = [i for i, s in enumerate(generated["sections"])
+                if any(p["number"] == "13.01" for p in s["points"])]
+
+    routed = PreviewRenderer(parsed_report)._route(updates)
+    assert [i for i, (_, new_points) in enumerate(routed) if new_points] == expected
+
+
+def test_header_only_section_is_matched_once_filled():
+    report = {"sections": [
+        {"section_name": "Extras", "points": []},
+        {"section_name": "General", "points": [{"number": "01.01", "title": "A"}]},
+    ]}
+    renderer = PreviewRenderer(report)
+    updates = {
+        "point_updates": [{"section": "ra", "number": "01.01"}],
+        "new_points": [_new_point("ra", "02.01"), _new_point("Lifts", "02.02"),
+                       _new_point("ra", "02.03")],
+    }
+    routed = renderer._route(updates)
+    # "ra" is in both names: the header-only "Extras" is skipped until the
+    # fallback of "Lifts" adds a row to it
+    assert [pu["number"] for pu in routed[1][0]] == ["01.01"]
+    assert [np["number"] for np in routed[0][1]] == ["02.02", "02.03"]
+    assert [np["number"] for np in routed[1][1]] == ["02.01"]
+
+
+def test_rerender_only_changes_the_edited_block(parsed_report):
+    renderer = PreviewRenderer(parsed_report)
+    first = dict(renderer.render_blocks(UPDATES))
+    assert renderer.changed == list(first)
+
+    edited = copy.deepcopy(UPDATES)
+    edited["point_updates"][0]["subject_lines"] = ["Detectors tested and approved"]
+    second = dict(renderer.render_blocks(edited))
+    assert renderer.changed == ["section-3"]
+    assert "Detectors tested and approved" in second["section-3"]
+    assert all(second[block] == first[block] for block in first if block != "section-3")
+
+    assert renderer.render(edited) == render_preview(parsed_report, edited)
+    assert renderer.changed == []
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+
+from json_stream import IncrementalJSONParser, parse_tolerant
+
+
+DOCUMENT = {
+    "meeting_number": 13,
+    "point_updates": [
+        {"number": "07.01", "subject_lines": ["Done {braces} and \"quotes\""]},
+        {"number": "08.02", "subject_lines": ["a", "b"]},
+    ],
+    "new_points": [],
+    "planning": [{"content": "Level +2 [phase 2]", "is_new": True}],
+}
+
+
+@pytest.mark.parametrize("chunk_size", [1, 7, 1000])
+def test_incremental_parser_emits_completed_elements(chunk_size):
+    text = "```json\n" + json.dumps(DOCUMENT) + "\n```"
+    parser = IncrementalJSONParser()
+    items = []
+    for i in range(0, len(text), chunk_size):
+        items.extend(parser.feed(text[i:i + chunk_size]))
+
+    assert items == [
+        ("point_updates", 0, DOCUMENT["point_updates"][0]),
+        ("point_updates", 1, DOCUMENT["point_updates"][1]),
+        ("planning", 0, DOCUMENT["planning"][0]),
+    ]
+    assert parser.done
+    assert parser.result() == DOCUMENT
+
+
+def test_incremental_parser_incomplete_document():
+    text = json.dumps(DOCUMENT)
+    parser = IncrementalJSONParser()
+    items = parser.feed(text[:text.index('"new_points"')])
+    assert [index for _, index, _ in items] == [0, 1]
+    assert not parser.done
+    with pytest.raises(ValueError):
+        parser.result()
+
+
+def test_incremental_parser_malformed_element():
+    with pytest.raises(ValueError):
+        IncrementalJSONParser().feed('{"point_updates": [{"number": tru}]')
+
+
+def test_parse_tolerant_complete_with_prose():
+    value, truncated = parse_tolerant("Here you go:\n" + json.dumps(DOCUMENT) + "\nThanks")
+    assert value == DOCUMENT
+    assert not truncated
+
+
+def test_parse_tolerant_trailing_commas_and_control_characters():
+    value, truncated = parse_tolerant('{"a": [1, 2,], "b": "line\nbreak",}')
+    assert value == {"a": [1, 2], "b": "line\nbreak"}
+    assert not truncated
+
+
+def test_parse_tolerant_truncated_keeps_complete_elements():
+    text = json.dumps(DOCUMENT)
+    cut = text.index('"b"]')  # inside the second point update
+    value, truncated = parse_tolerant(text[:cut])
+    assert truncated
+    assert value == {"meeting_number": 13, "point_updates": [DOCUMENT["point_updates"][0]]}
+
+
+def test_parse_tolerant_no_object():
+    with pytest.raises(ValueError):
+        parse_tolerant("no JSON here")
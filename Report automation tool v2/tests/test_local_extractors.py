@@ -0,0 +1,62 @@
+import pytest
+
+from local_extractors import (
+    MIN_CONFIDENCE, YEARLESS_CONFIDENCE, accepted_fields, extract_fields,
+    extract_meeting_date, extract_meeting_number, extract_next_meeting,
+)
+
+
+@pytest.mark.parametrize("text, value, time", [
+    ("Prochaine réunion le 25/02/2026 à 11h.", "25/02/2026", "11:00"),
+    ("prochaine réunion le 25.02.26 à 9h30", "25/02/2026", "09:30"),
+    ("Next meeting: 4 March 2026, 10:00.", "04/03/2026", "10:00"),
+])
+def test_next_meeting_with_year(text, value, time):
+    field = extract_next_meeting(text, "11/02/2026")
+    assert (field["value"], field.get("time")) == (value, time)
+    assert field["confidence"] >= MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("text", [
+    "Prochaine réunion le 25/02 à 11h.",
+    "next meeting on the 25th, so 25 february",
+])
+def test_next_meeting_without_year_is_left_to_the_model(text):
+    field = extract_next_meeting(text, "11/02/2026")
+    assert field["value"] == "25/02/2026"
+    assert field["confidence"] == YEARLESS_CONFIDENCE < MIN_CONFIDENCE
+
+
+@pytest.mark.parametrize("text", [
+    "prochaine réunion dans 2 semaines, il y a 12.5 mètres",
+    "prochaine réunion dans 2 semaines, il reste 12/5 m de gaine",
+    "prochaine réunion : voir le plan 1.12.5",
+    "prochaine réunion : gaine 112/05",
+])
+def test_next_meeting_ignores_numbers_that_are_not_dates(text):
+    assert extract_next_meeting(text, "11/02/2026")["value"] is None
+
+
+def test_next_meeting_skips_past_dates():
+    text = "next meeting: see 04/02/2026. Prochaine réunion le 18/02/2026."
+    assert extract_next_meeting(text, "11/02/2026")["value"] == "18/02/2026"
+
+
+def test_meeting_date_sources(parsed_report):
+    field = extract_meeting_date(parsed_report, "leexi-20260121-transcript-penta.txt")
+    assert (field["value"], field["source"]) == ("21/01/2026", "Leexi filename")
+    field = extract_meeting_date(parsed_report, None, "Réunion du 11.02.2026\n\nBonjour")
+    assert (field["value"], field["source"]) == ("11/02/2026", "transcript header")
+    field = extract_meeting_date(parsed_report, None, "Réunion du 11/02\n\nBonjour")
+    assert field["source"] == "next meeting of the previous report"
+
+
+def test_extract_fields(parsed_report, cleaned_transcript):
+    extracted = extract_fields(
+        parsed_report, cleaned_transcript,
+        "leexi-20260121-transcript-penta_phase_2_sprinklage.txt",
+    )
+    assert extract_meeting_number(parsed_report)["value"] == 13
+    assert accepted_fields(extracted) == {
+        "meeting_number": 13, "date": "21/01/2026", "distribution_date": None,
+    }
@@ -0,0 +1,63 @@
+from proposal_patch import apply_patch, validate_patch
+
+
+PROPOSALS = {
+    "meeting_number": 13,
+    "next_meeting": "11/02/2026",
+    "point_updates": [{"section": "General", "number": "07.01", "subject_lines": ["a"]}],
+    "new_points": [
+        {"section": "General", "number": "13.01", "title": "One", "subject_lines": [],
+         "for_whom": "ARCH", "due": "ASAP"},
+        {"section": "General", "number": "13.02", "title": "Two", "subject_lines": [],
+         "for_whom": "ARCH", "due": "ASAP"},
+    ],
+    "info_exchange": [],
+    "planning": [{"content": "P0", "is_new": False}, {"content": "P1", "is_new": False}],
+}
+
+
+def test_validate_patch_reports_invalid_operations():
+    operations = [
+        {"op": "replace", "target": "new_points", "number": "13.02", "field": "due", "value": "Done"},
+        {"op": "move", "target": "planning", "index": 0},
+        {"op": "remove", "target": "new_points", "number": "99.99"},
+        {"op": "remove", "target": "planning", "index": 5},
+        {"op": "replace", "target": "meta", "field": "title", "value": "x"},
+        {"op": "add", "target": "planning", "value": "not a dict"},
+        "not a dict",
+    ]
+    valid, errors = validate_patch(PROPOSALS, operations)
+    assert valid == operations[:1]
+    assert len(errors) == 6
+    assert validate_patch(PROPOSALS, {"op": "add"}) == ([], ["Patch operations must be a list"])
+
+
+def test_apply_patch_resolves_against_original():
+    operations = [
+        {"op": "remove", "target": "planning", "index": 0},
+        {"op": "add", "target": "planning", "index": 1, "value": {"content": "new", "is_new": True}},
+        {"op": "replace", "target": "planning", "index": 1, "field": "is_new", "value": True},
+        {"op": "remove", "target": "new_points", "number": "13.01"},
+        {"op": "replace", "target": "new_points", "number": "13.02", "field": "due", "value": "Done"},
+        {"op": "replace", "target": "meta", "field": "next_meeting", "value": "18/02/2026"},
+    ]
+    valid, errors = validate_patch(PROPOSALS, operations)
+    assert errors == []
+
+    result = apply_patch(PROPOSALS, valid)
+    assert result["planning"] == [
+        {"content": "new", "is_new": True}, {"content": "P1", "is_new": True},
+    ]
+    assert [p["number"] for p in result["new_points"]] == ["13.02"]
+    assert result["new_points"][0]["due"] == "Done"
+    assert result["next_meeting"] == "18/02/2026"
+    # The input proposal is left untouched
+    assert PROPOSALS["planning"][1]["is_new"] is False
+    assert len(PROPOSALS["new_points"]) == 2
+
+
+def test_apply_patch_replace_whole_point():
+    value = {"section": "General", "number": "07.01", "subject_lines": ["b"]}
+    operations = [{"op": "replace", "target": "point_updates", "number": "07.01", "value": value}]
+    assert validate_patch(PROPOSALS, operations) == (operations, [])
+    assert apply_patch(PROPOSALS, operations)["point_updates"] == [value]
@@ -0,0 +1,186 @@
+from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+import report_generator as rg
+
+
+def _cell_texts(cell):
+    return [''.join(t.text or '' for t in p.iter(qn('w:t'))) for p in cell._tc.p_lst]
+
+
+def _section_table(rows):
+    """Document with one section table: header row + the given point rows."""
+    doc = Document()
+    table = doc.add_table(rows=1 + len(rows), cols=5)
+    for cell, text in zip(table.rows[0].cells, ("N°", "Title", "Subject", "For whom", "Due")):
+        cell.text = text
+    for row, values in zip(table.rows[1:], rows):
+        for cell, text in zip(row.cells, values):
+            cell.text = text
+    return doc, table
+
+
+def test_update_existing_point_aligns_due_in_merged_row():
+    # Subject merged with the for whom column: row.cells[3] is the subject cell
+    doc, table = _section_table([("01.01", "Point", "Old line", "", "")])
+    row = table.rows[1]
+    row.cells[2].merge(row.cells[3])
+    assert row.cells[3]._tc is row.cells[2]._tc
+
+    updates = {"subject_lines": ["New line"], "for_whom": "ARCH", "due": "Done"}
+    assert rg.update_existing_point(table, "01.01", updates, 2)
+
+    row = table.rows[1]
+    subject = _cell_texts(row.cells[2])
+    due = _cell_texts(row.cells[-1])
+    assert subject[-3:] == ["Meeting N2", "New line", "ARCH"]
+    # The due value is aligned with the last line of the (grown) subject cell
+    assert due[-1] == "Done"
+    assert len(due) == len(subject)
+    assert set(due[:-1]) == {""}
+
+
+def test_update_existing_point_aligns_for_whom_and_due():
+    doc, table = _section_table([("01.01", "Point", "Old line", "MOD", "ASAP")])
+    updates = {"subject_lines": ["A", "B"], "for_whom": "ARCH", "due": "Done"}
+    index = rg.DocumentIndex(doc)
+    assert rg.update_existing_point(table, "01.01", updates, 2, index=index)
+
+    row = table.rows[1]
+    assert _cell_texts(row.cells[2]) == ["Old line", "Meeting N2", "A", "B"]
+    assert _cell_texts(row.cells[3]) == ["MOD", "", "", "ARCH"]
+    assert _cell_texts(row.cells[4]) == ["ASAP", "", "", "Done"]
+
+
+def test_update_existing_point_unknown_number():
+    doc, table = _section_table([("01.01", "Point", "Old line", "", "")])
+    assert not rg.update_existing_point(table, "09.09", {"subject_lines": ["x"]}, 2)
+
+
+def test_replace_table_rows_keeps_header():
+    doc, table = _section_table([("01.01", "A", "", "", ""), ("01.02", "B", "", "", "")])
+    rg.replace_table_rows(table, [["x", "y"], ["z"], [None, ["l1", "l2"]]])
+
+    assert len(table.rows) == 4
+    assert _cell_texts(table.rows[0].cells[0]) == ["N°"]
+    assert [_cell_texts(row.cells[0]) for row in table.rows[1:]] == [["x"], ["z"], [""]]
+    assert _cell_texts(table.rows[3].cells[1]) == ["l1", "l2"]
+
+
+def test_replace_table_rows_without_header():
+    doc, table = _section_table([("01.01", "A", "", "", "")])
+    rg.replace_table_rows(table, [["x"], ["y"]], header_rows=0)
+
+    tbl = table._tbl
+    assert [_cell_texts(row.cells[0]) for row in table.rows] == [["x"], ["y"]]
+    # Rows follow the table properties and grid, as the schema requires
+    assert tbl.index(tbl.tr_lst[0]) == tbl.index(tbl.tblGrid) + 1
+
+
+def test_replace_table_rows_keeps_table_run_formatting():
+    doc, table = _section_table([("01.01", "A", "", "", "")])
+    run = table.rows[1].cells[0].paragraphs[0].runs[0]
+    run.font.name = "Arial"
+    run.font.italic = True
+    run._r.rPr.append(_color("808080"))
+    rg.replace_table_rows(table, [["x"], ["y"]], bold=[True, False])
+
+    for row, bold in zip(table.rows[1:], (True, False)):
+        new = row.cells[0].paragraphs[0].runs[0]
+        assert (new.text, new.font.name, new.bold) == (row.cells[0].text, "Arial", bold)
+        # Grey and italics of closed content are not carried over
+        assert new.font.italic is None
+        assert new._r.rPr.find(qn('w:color')) is None
+
+
+def test_replace_table_rows_plain_runs_without_content():
+    doc, table = _section_table([])
+    table.add_row()
+    rg.replace_table_rows(table, [["x"]], bold=True)
+    run = table.rows[1].cells[0].paragraphs[0].runs[0]
+    assert (run.text, run.bold, run.font.name) == ("x", True, None)
+
+
+def test_muted_prototype_drops_grey_and_italics():
+    doc, table = _section_table([("01.01", "Point", "Closed", "", "")])
+    p = table.rows[1].cells[2].paragraphs[0]
+    run = p.runs[0]
+    run.font.italic = True
+    run._r.get_or_add_rPr().append(_color("808080"))
+    mark = OxmlElement('w:rPr')
+    p._p.get_or_add_pPr().append(mark)
+    mark.append(OxmlElement('w:i'))
+    mark.append(_color("808080"))
+
+    prototype = rg.CellPrototype.from_tc(table.rows[1].cells[2]._tc)
+    assert prototype.muted
+    new = prototype.paragraph("New line")
+    for rPr in new.iter(qn('w:rPr')):
+        assert rPr.find(qn('w:color')) is None
+        assert rPr.find(qn('w:i')) is None
+    # The source cell keeps its formatting
+    assert mark.find(qn('w:color')) is not None
+
+
+def _color(value):
+    color = OxmlElement('w:color')
+    color.set(qn('w:val'), value)
+    return color
+
+
+def _bold_values(run):
+    rPr = run._r.rPr
+    return tuple(None if rPr is None or rPr.find(qn(tag)) is None
+                 else rPr.find(qn(tag)).get(qn('w:val')) for tag in ('w:b', 'w:bCs'))
+
+
+def test_unbold_all_content_demotes_direct_bold():
+    doc, table = _section_table([("01.01", "Point", "Latest", "ARCH", "ASAP")])
+    header = table.rows[0].cells[0].paragraphs[0].runs[0]
+    header.bold = True
+    latest = table.rows[1].cells[2].paragraphs[0].runs[0]
+    latest.bold = True
+    latest._r.rPr.append(OxmlElement('w:bCs'))
+    normal = table.rows[1].cells[3].paragraphs[0].runs[0]
+    normal.bold = False
+
+    rg.unbold_all_content(doc)
+    assert _bold_values(latest) == ('0', '0')
+    assert _bold_values(normal) == ('0', None)
+    # The header row keeps its formatting
+    assert header.bold
+
+
+def test_unbold_all_content_overrides_bold_character_styles():
+    doc, table = _section_table([("01.01", "Point", "Latest", "Regular", "")])
+    strong = doc.styles.add_style('Latest', WD_STYLE_TYPE.CHARACTER)
+    strong.font.bold = True
+    derived = doc.styles.add_style('Latest2', WD_STYLE_TYPE.CHARACTER)
+    derived.base_style = strong
+    plain = doc.styles.add_style('Plain', WD_STYLE_TYPE.CHARACTER)
+    assert rg._bold_character_styles(doc) >= {'Latest', 'Latest2'}
+    assert 'Plain' not in rg._bold_character_styles(doc)
+
+    latest = table.rows[1].cells[2].paragraphs[0].runs[0]
+    latest.style = derived
+    regular = table.rows[1].cells[3].paragraphs[0].runs[0]
+    regular.style = plain
+
+    rg.unbold_all_content(doc)
+    assert _bold_values(latest) == ('0', '0')
+    assert latest.bold is False
+    assert _bold_values(regular) == (None, None)
+
+
+def test_unbold_all_content_example(example_report):
+    doc = Document(example_report)
+    index = rg.DocumentIndex(doc)
+    tables = index.content_tables()
+    assert any(r.bold for t in tables for row in t.rows[1:] for c in row.cells
+               for p in c.paragraphs for r in p.runs)
+
+    rg.unbold_all_content(doc, index)
+    assert not any(r.bold for t in tables for row in t.rows[1:] for c in row.cells
+                   for p in c.paragraphs for r in p.runs)
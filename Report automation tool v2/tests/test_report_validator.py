@@ -0,0 +1,76 @@
+from report_validator import (
+    ReportIndex, apply_reference_check, check_references, normalize_number,
+    normalize_section,
+)
+
+
+def test_normalize():
+    assert normalize_number("4.1") == normalize_number("04.01.") == "04.01"
+    assert normalize_section("D3 - Fire Détection") == "fire detection"
+
+
+def test_resolve_section(parsed_report):
+    index = ReportIndex(parsed_report)
+    assert index.resolve_section("sprinklers") == "Sprinklers"
+    assert index.resolve_section("Fire") == "Fire detection"
+    assert index.resolve_section("Finishings / architecture") == "Finishings/Architecture"
+    assert index.resolve_section("Spinklers") == "Sprinklers"
+    assert index.resolve_section("Lifts") is None
+
+
+def test_check_references_corrects_and_reports(parsed_report):
+    updates = {
+        "point_updates": [
+            {"section": "fire detection", "number": "8.4", "subject_lines": ["x"]},
+            {"section": "General", "number": "06.01", "subject_lines": ["x"]},
+            {"section": "General", "number": "42.42", "subject_lines": ["x"]},
+            {"section": "Sprinklers", "number": "07.01", "subject_lines": ["x"]},
+            {"section": "Fire detection", "number": "08.04", "subject_lines": ["y"]},
+        ],
+        "new_points": [
+            {"section": "Sprinklers", "number": "06.01", "title": "Dup"},
+            {"section": "Lifts", "number": "13.01", "title": "New"},
+            {"section": "General", "number": "13.1", "title": "Again"},
+        ],
+    }
+    fixes, errors = check_references(updates, parsed_report)
+
+    assert updates["point_updates"][0] == {
+        "section": "Fire detection", "number": "08.04", "subject_lines": ["x"],
+    }
+    # Only found in another section: moved there
+    assert updates["point_updates"][1]["section"] == "Sprinklers"
+    assert len(fixes) == 3
+    assert any("42.42 does not exist" in e for e in errors)
+    assert any("07.01 exists in several sections" in e for e in errors)
+    assert any("06.01 already exists" in e for e in errors)
+    assert any("unknown section 'Lifts'" in e for e in errors)
+    assert any("duplicates new_points[1]" in e for e in errors)
+    assert "point_updates[4]: point 08.04 duplicates point_updates[0]" in errors
+    assert len(errors) == 6
+
+
+def test_duplicate_report_points_are_reported():
+    section = {"section_name": "General", "points": [
+        {"number": "01.01", "title": "A"}, {"number": "1.1", "title": "B"},
+    ]}
+    report = {"sections": [section, dict(section, section_name="general")]}
+    index = ReportIndex(report)
+    assert index.shared_names == {"General"}
+    assert len(index.duplicates) == 3
+
+    fixes, errors = check_references({"point_updates": [], "new_points": []}, report, index)
+    assert not fixes
+    assert errors == index.duplicates
+    assert "point 1.1 appears twice in 'General'" in errors
+
+
+def test_apply_reference_check(parsed_report):
+    updates = {"point_updates": [{"section": "general", "number": "7.1", "subject_lines": []}],
+               "validation_warnings": ["kept"]}
+    apply_reference_check(updates, parsed_report)
+    assert updates["reference_fixes"]
+    assert updates["validation_warnings"] == ["kept"]
+
+    error = {"error": "API error"}
+    assert apply_reference_check(error, parsed_report) == {"error": "API error"}
@@ -0,0 +1,63 @@
+import pytest
+from anthropic.types import Message
+
+import token_estimator
+from token_estimator import (
+    calibrate, calibrate_from_fixtures, chars_to_tokens, estimate_tokens, request_text,
+)
+from transport import RecordTransport
+
+
+@pytest.fixture
+def restore_ratio():
+    yield
+    token_estimator.set_chars_per_token(None)
+
+
+def test_estimate_tokens_rounds_up():
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("abcd") == 2
+    assert estimate_tokens("x" * 35) == 10
+    assert chars_to_tokens(35) == estimate_tokens("x" * 35)
+    assert chars_to_tokens(36) == 11
+
+
+def test_set_chars_per_token(restore_ratio):
+    token_estimator.set_chars_per_token(2.0)
+    assert estimate_tokens("abcd") == 2
+    assert chars_to_tokens(100_000) == 50_000
+    token_estimator.set_chars_per_token(None)
+    assert chars_to_tokens(100_000) == 28_572
+
+
+def test_request_text():
+    request = {
+        "system": "System",
+        "messages": [
+            {"role": "user", "content": "Report"},
+            {"role": "user", "content": [{"type": "text", "text": "Transcript"},
+                                         {"type": "image", "source": {}}]},
+        ],
+    }
+    assert request_text(request) == "System\nReport\nTranscript"
+
+
+def test_calibrate():
+    assert calibrate([("x" * 300, 100), ("y" * 100, 0)]) == 3.0
+    assert calibrate([]) is None
+
+
+def test_calibrate_from_fixtures(tmp_path):
+    recorder = RecordTransport(None, tmp_path)
+    for text, input_tokens in (("a" * 400, 110), ("b" * 200, 60)):
+        request = {"messages": [{"role": "user", "content": text}],
+                   "tools": [{"name": "t"}]}
+        recorder.save(request, Message.model_validate({
+            "id": "msg", "type": "message", "role": "assistant", "model": "m",
+            "content": [], "stop_reason": "end_turn", "stop_sequence": None,
+            "usage": {"input_tokens": input_tokens, "output_tokens": 1},
+        }))
+
+    tools_chars = len('[{"name": "t"}]') + 1
+    ratio = calibrate_from_fixtures(tmp_path, fixed_tokens=10)
+    assert ratio == pytest.approx((600 + 2 * tools_chars) / 150)
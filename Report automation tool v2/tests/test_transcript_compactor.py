@@ -0,0 +1,21 @@
+import pytest
+
+from token_estimator import estimate_tokens
+from transcript_compactor import GAP_MARKER, compact_transcript
+
+
+@pytest.mark.parametrize("budget", [500, 1000, 3000, 6000])
+def test_compacted_transcript_fits_budget(parsed_report, cleaned_transcript, budget):
+    assert estimate_tokens(cleaned_transcript) > budget
+    compacted, stats = compact_transcript(cleaned_transcript, parsed_report, budget)
+    assert stats["tokens_after"] == estimate_tokens(compacted)
+    assert stats["tokens_after"] <= budget
+    assert 0 < stats["kept_turns"] < stats["total_turns"]
+    assert GAP_MARKER in compacted
+
+
+def test_short_transcript_unchanged(parsed_report, cleaned_transcript):
+    budget = estimate_tokens(cleaned_transcript)
+    compacted, stats = compact_transcript(cleaned_transcript, parsed_report, budget)
+    assert compacted == cleaned_transcript
+    assert stats["kept_turns"] == stats["total_turns"]
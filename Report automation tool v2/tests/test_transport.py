@@ -0,0 +1,63 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import anthropic
+import pytest
+
+from transport import (
+    FakeTransport, RecordTransport, ReplayTransport, SyntheticTransport, request_hash,
+)
+
+
+REQUEST = {
+    "model": "claude-sonnet-4-20250514",
+    "max_tokens": 1024,
+    "messages": [{"role": "user", "content": "Meeting 13"}],
+    "tool_choice": {"type": "tool", "name": "record_updates"},
+}
+
+
+def _outcome(transport):
+    try:
+        message, latency = transport.respond(REQUEST)
+    except anthropic.APIStatusError as e:
+        return e.status_code, None
+    return message.stop_reason, latency
+
+
+def test_fake_transport_is_abstract():
+    with pytest.raises(TypeError):
+        FakeTransport()
+    assert issubclass(RecordTransport, FakeTransport)
+
+
+def test_record_then_replay(tmp_path):
+    message, _ = SyntheticTransport(seed=1, latency_median=0).respond(REQUEST)
+    RecordTransport(None, tmp_path).save(REQUEST, message)
+    assert (tmp_path / f"{request_hash(REQUEST)}.json").exists()
+
+    client = ReplayTransport(tmp_path).client()
+    assert client.messages.create(**REQUEST) == message
+    with pytest.raises(LookupError):
+        client.messages.create(**dict(REQUEST, max_tokens=2048))
+
+
+def test_synthetic_is_reproducible_from_seed():
+    kwargs = dict(seed=7, rate_limit_rate=0.2, overload_rate=0.1, truncation_rate=0.2)
+    first = SyntheticTransport(**kwargs)
+    second = SyntheticTransport(**kwargs)
+    outcomes = [_outcome(first) for _ in range(30)]
+    assert outcomes == [_outcome(second) for _ in range(30)]
+    assert first.stats == second.stats
+    assert first.stats["rate_limited"] and first.stats["truncated"]
+
+
+def test_synthetic_concurrent_calls_keep_the_sequence():
+    kwargs = dict(seed=3, truncation_rate=0.3)
+    transport = SyntheticTransport(**kwargs)
+    sequential = [_outcome(transport) for _ in range(40)]
+
+    transport = SyntheticTransport(**kwargs)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        concurrent = list(pool.map(lambda _: _outcome(transport), range(40)))
+    assert sorted(concurrent) == sorted(sequential)
+    assert transport.stats["calls"] == 40